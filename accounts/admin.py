@@ -1,3 +1,18 @@
 from django.contrib import admin
 
-# Register your models here.
+from accounts.models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        "subject",
+        "to",
+        "status",
+        "attempts",
+        "send_after",
+        "sent_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    list_per_page = 20
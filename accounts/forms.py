@@ -1,6 +1,9 @@
 from django import forms
 from django.contrib.auth import get_user_model
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import PasswordResetForm, UserCreationForm
+from django.template import loader
+
+from accounts.services.email_service import EmailService
 
 
 User = get_user_model()
@@ -11,3 +14,24 @@ class RegisterForm(UserCreationForm):
     class Meta:
         model = User
         fields = UserCreationForm.Meta.fields + ("email", "role")
+
+
+class OutboxPasswordResetForm(PasswordResetForm):
+    """Queues the reset email in the outbox instead of sending it inline."""
+
+    def send_mail(
+            self,
+            subject_template_name,
+            email_template_name,
+            context,
+            from_email,
+            to_email,
+            html_email_template_name=None,
+    ):
+        subject = "".join(loader.render_to_string(subject_template_name, context).splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        html_body = ""
+        if html_email_template_name is not None:
+            html_body = loader.render_to_string(html_email_template_name, context)
+
+        EmailService().queue(subject, body, [to_email], html_body=html_body, from_email=from_email)
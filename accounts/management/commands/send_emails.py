@@ -0,0 +1,55 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts.services.email_service import requeue_stale, send_queued
+
+
+class Command(BaseCommand):
+    help = "Deliver emails queued in the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when the outbox is empty",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=600,
+            help="Seconds after which an email being sent is considered abandoned",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale(timedelta(seconds=options["stale_after"]))
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} abandoned emails")
+
+        total_sent = total_failed = 0
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = send_queued(options["batch_size"])
+                total_sent += sent
+                total_failed += failed
+
+                if not sent and not failed:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Emails sent: {total_sent}, failed: {total_failed}")
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_outbox_email"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxemail",
+            name="locked_by",
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -13,3 +14,38 @@ class User(AbstractUser):
         choices=UserRole.choices,
         default=UserRole.CUSTOMER
     )
+
+
+class OutboxEmail(models.Model):
+    class StatusChoice(models.TextChoices):
+        QUEUED = "QU", _("Queued")
+        SENDING = "SE", _("Sending")
+        SENT = "SN", _("Sent")
+        FAILED = "FA", _("Failed")
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    status = models.CharField(
+        max_length=2,
+        choices=StatusChoice.choices,
+        default=StatusChoice.QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    send_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "send_after", "id"], name="outbox_email_send_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.subject} to {', '.join(self.to)} ({self.get_status_display()})"
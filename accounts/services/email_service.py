@@ -1,15 +1,54 @@
+import logging
+import random
+import uuid
+from datetime import timedelta
+from smtplib import SMTPException, SMTPServerDisconnected
+
 from django.contrib.auth import get_user_model
 from django.template.loader import render_to_string
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.conf import settings
-from smtplib import SMTPException
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import OutboxEmail
 
 
 User = get_user_model()
+logger = logging.getLogger("accounts.email")
+
+BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 3600
+STALE_AFTER = timedelta(minutes=10)
+
 
 class EmailService:
+    """
+    Emails are written to the outbox in the caller's transaction and
+    delivered later by ``manage.py send_emails``, so a request never
+    waits on the mail server and no email goes out for a rolled back
+    sign-up.
+    """
+
     from_email = settings.EMAIL_HOST_USER
 
+    def queue(
+            self,
+            subject: str,
+            body: str,
+            to: list[str],
+            html_body: str = "",
+            from_email: str | None = None,
+    ) -> OutboxEmail:
+        return OutboxEmail.objects.create(
+            subject=subject,
+            body=body,
+            html_body=html_body,
+            from_email=from_email or self.from_email,
+            to=to,
+        )
+
     def send_activation_email(
             self,
             username: str,
@@ -17,17 +56,138 @@ class EmailService:
             to_email: str,
             uid: str,
             token: str
-    ) -> None:
-        try:
-            mail_subject = "Activation link has been sent to your email id"
-            context = {
-                "username": username,
-                "domain": domain,
-                "uid": uid,
-                "token": token,
-            }
-
-            message = render_to_string("registration/acc_activate_email.html", context)
-            send_mail(mail_subject, message, self.from_email, [to_email])
-        except SMTPException as error:
-            raise RuntimeError(f"SMTP error occurred: {error}")
\ No newline at end of file
+    ) -> OutboxEmail:
+        mail_subject = "Activation link has been sent to your email id"
+        context = {
+            "username": username,
+            "domain": domain,
+            "uid": uid,
+            "token": token,
+        }
+
+        message = render_to_string("registration/acc_activate_email.html", context)
+        return self.queue(mail_subject, message, [to_email])
+
+
+def claim_emails(batch_size: int = 100) -> list[OutboxEmail]:
+    now = timezone.now()
+    due = OutboxEmail.objects.filter(
+        status=OutboxEmail.StatusChoice.QUEUED, send_after__lte=now
+    ).order_by("send_after", "id")
+    # A token unique to this claim, so concurrent senders claiming in
+    # the same instant never pick up each other's rows.
+    token = uuid.uuid4().hex
+    claimed = {
+        "status": OutboxEmail.StatusChoice.SENDING,
+        "locked_at": now,
+        "locked_by": token,
+        "attempts": F("attempts") + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                due.select_for_update(skip_locked=True).values_list("id", flat=True)[:batch_size]
+            )
+            OutboxEmail.objects.filter(pk__in=ids).update(**claimed)
+    else:
+        # One UPDATE ... WHERE id IN (SELECT ...), serialized by SQLite.
+        OutboxEmail.objects.filter(pk__in=due.values("id")[:batch_size]).update(**claimed)
+
+    return list(
+        OutboxEmail.objects.filter(status=OutboxEmail.StatusChoice.SENDING, locked_by=token)
+    )
+
+
+def send_queued(batch_size: int = 100) -> tuple[int, int]:
+    """
+    Deliver one batch from the outbox over a single SMTP connection.
+    Returns (sent, failed) counts; failed emails are retried with
+    backoff until they run out of attempts. When the mail server cannot
+    be reached, or drops the connection mid-batch, the unsent emails are
+    requeued without using up an attempt, so an outage never exhausts
+    them.
+    """
+    emails = claim_emails(batch_size)
+    if not emails:
+        return 0, 0
+
+    sent, failed = [], []
+    mail_connection = get_connection(fail_silently=False)
+    try:
+        mail_connection.open()
+    except Exception as error:
+        logger.warning("Could not connect to the mail server: %s", error)
+        _release(emails, error)
+        return 0, len(emails)
+
+    unsent = []
+    try:
+        for index, email in enumerate(emails):
+            message = EmailMultiAlternatives(
+                email.subject,
+                email.body,
+                email.from_email,
+                email.to,
+                connection=mail_connection,
+            )
+            if email.html_body:
+                message.attach_alternative(email.html_body, "text/html")
+            try:
+                message.send()
+            except Exception as error:
+                if _connection_lost(error):
+                    logger.warning("Lost the mail server connection: %s", error)
+                    unsent = emails[index:]
+                    _release(unsent, error)
+                    break
+                logger.warning("Sending email #%d failed: %s", email.pk, error)
+                email.last_error = repr(error)
+                failed.append(email)
+            else:
+                sent.append(email.pk)
+    finally:
+        mail_connection.close()
+
+    now = timezone.now()
+    OutboxEmail.objects.filter(pk__in=sent).update(
+        status=OutboxEmail.StatusChoice.SENT, sent_at=now, last_error=""
+    )
+
+    for email in failed:
+        if email.attempts >= email.max_attempts:
+            email.status = OutboxEmail.StatusChoice.FAILED
+        else:
+            email.status = OutboxEmail.StatusChoice.QUEUED
+            delay = min(BACKOFF_SECONDS * 2 ** (email.attempts - 1), MAX_BACKOFF_SECONDS)
+            email.send_after = now + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+    OutboxEmail.objects.bulk_update(failed, ["status", "send_after", "last_error"])
+
+    return len(sent), len(failed) + len(unsent)
+
+
+def _connection_lost(error: Exception) -> bool:
+    # SMTPException subclasses OSError, but apart from a dropped
+    # connection those are about one message, e.g. a refused recipient.
+    if isinstance(error, SMTPServerDisconnected):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, SMTPException)
+
+
+def _release(emails: list[OutboxEmail], error: Exception) -> None:
+    """Requeue claimed emails, giving back the attempt the claim took."""
+    delay = BACKOFF_SECONDS * random.uniform(0.8, 1.2)
+    OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+        status=OutboxEmail.StatusChoice.QUEUED,
+        attempts=F("attempts") - 1,
+        send_after=timezone.now() + timedelta(seconds=delay),
+        last_error=repr(error),
+    )
+
+
+def requeue_stale(older_than: timedelta = STALE_AFTER) -> int:
+    """Give back emails claimed by a sender that died mid-batch."""
+    return OutboxEmail.objects.filter(
+        status=OutboxEmail.StatusChoice.SENDING,
+        locked_at__lt=timezone.now() - older_than,
+    ).update(status=OutboxEmail.StatusChoice.QUEUED)
@@ -1,3 +1,187 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPDataError, SMTPServerDisconnected
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import OutboxEmail
+from accounts.services.email_service import (
+    EmailService,
+    claim_emails,
+    requeue_stale,
+    send_queued,
+)
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise SMTPDataError(554, "Message rejected")
+
+
+class DroppingBackend(EmailBackend):
+    """Delivers two messages, then loses the connection."""
+
+    def send_messages(self, messages):
+        if len(mail.outbox) >= 2:
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        return super().send_messages(messages)
+
+
+class UnreachableBackend(EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError("Connection refused")
+
+
+class OutboxTests(TestCase):
+    def register(self):
+        return self.client.post(
+            reverse("accounts:register"),
+            {
+                "username": "newcomer",
+                "email": "newcomer@example.com",
+                "role": "CS",
+                "password1": "a-long-Passw0rd",
+                "password2": "a-long-Passw0rd",
+            },
+        )
+
+    def test_register_queues_activation_email(self):
+        response = self.register()
+
+        self.assertRedirects(response, reverse("accounts:login"))
+        user = get_user_model().objects.get(username="newcomer")
+        email = OutboxEmail.objects.get()
+
+        self.assertFalse(user.is_active)
+        self.assertEqual(email.to, ["newcomer@example.com"])
+        self.assertEqual(mail.outbox, [])
+
+    def test_activation_link_works_after_delivery(self):
+        self.register()
+        call_command("send_emails", "--once", stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        link = next(
+            line.strip() for line in mail.outbox[0].body.splitlines() if "/activate/" in line
+        )
+        path = link[link.index("/accounts/"):]
+        self.client.get(path)
+
+        self.assertTrue(get_user_model().objects.get(username="newcomer").is_active)
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.StatusChoice.SENT)
+
+    def test_password_reset_goes_through_outbox(self):
+        get_user_model().objects.create_user(
+            username="customer", email="customer@example.com", password="pass"
+        )
+
+        self.client.post(reverse("accounts:password_reset"), {"email": "customer@example.com"})
+
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(OutboxEmail.objects.get().to, ["customer@example.com"])
+
+    @override_settings(EMAIL_BACKEND="accounts.tests.CountingBackend")
+    def test_batch_reuses_one_connection(self):
+        for i in range(5):
+            EmailService().queue("Subject", "Body", [f"user{i}@example.com"])
+        CountingBackend.opened = 0
+
+        self.assertEqual(send_queued(batch_size=10), (5, 0))
+        self.assertEqual(CountingBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 5)
+
+    @override_settings(EMAIL_BACKEND="accounts.tests.FailingBackend")
+    def test_failures_are_retried_then_given_up(self):
+        email = EmailService().queue("Subject", "Body", ["user@example.com"])
+        OutboxEmail.objects.filter(pk=email.pk).update(max_attempts=2)
+
+        with self.assertLogs("accounts.email", "WARNING"):
+            self.assertEqual(send_queued(), (0, 1))
+        email.refresh_from_db()
+
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.StatusChoice.QUEUED, 1))
+        self.assertGreater(email.send_after, timezone.now())
+        self.assertEqual(send_queued(), (0, 0))
+
+        OutboxEmail.objects.update(send_after=timezone.now())
+        with self.assertLogs("accounts.email", "WARNING"):
+            send_queued()
+        email.refresh_from_db()
+
+        self.assertEqual(email.status, OutboxEmail.StatusChoice.FAILED)
+        self.assertIn("Message rejected", email.last_error)
+
+    @override_settings(EMAIL_BACKEND="accounts.tests.UnreachableBackend")
+    def test_unreachable_server_requeues_the_batch(self):
+        EmailService().queue("Subject", "Body", ["user@example.com"])
+
+        with self.assertLogs("accounts.email", "WARNING"):
+            self.assertEqual(send_queued(), (0, 1))
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.StatusChoice.QUEUED, 0))
+        self.assertIn("Connection refused", email.last_error)
+        self.assertGreater(email.send_after, timezone.now())
+
+        # A long outage never exhausts the attempts.
+        for _ in range(email.max_attempts + 1):
+            OutboxEmail.objects.update(send_after=timezone.now())
+            with self.assertLogs("accounts.email", "WARNING"):
+                send_queued()
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.StatusChoice.QUEUED)
+
+    @override_settings(EMAIL_BACKEND="accounts.tests.DroppingBackend")
+    def test_dropped_connection_requeues_the_rest_of_the_batch(self):
+        for i in range(5):
+            EmailService().queue("Subject", "Body", [f"user{i}@example.com"])
+
+        with self.assertLogs("accounts.email", "WARNING"):
+            self.assertEqual(send_queued(), (2, 3))
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(
+            OutboxEmail.objects.filter(status=OutboxEmail.StatusChoice.SENT).count(), 2
+        )
+        unsent = OutboxEmail.objects.exclude(status=OutboxEmail.StatusChoice.SENT)
+        self.assertEqual(
+            set(unsent.values_list("status", "attempts")),
+            {(OutboxEmail.StatusChoice.QUEUED, 0)},
+        )
+        self.assertTrue(all("Connection unexpectedly closed" in e.last_error for e in unsent))
+
+    def test_claims_in_the_same_instant_do_not_overlap(self):
+        for i in range(3):
+            EmailService().queue("Subject", "Body", [f"user{i}@example.com"])
+        now = timezone.now()
+
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            first = claim_emails(batch_size=2)
+            second = claim_emails(batch_size=2)
+
+        self.assertEqual((len(first), len(second)), (2, 1))
+        self.assertFalse({email.pk for email in first} & {email.pk for email in second})
+
+    def test_abandoned_emails_are_requeued(self):
+        EmailService().queue("Subject", "Body", ["user@example.com"])
+        OutboxEmail.objects.update(
+            status=OutboxEmail.StatusChoice.SENDING,
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(send_queued(), (1, 0))
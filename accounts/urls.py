@@ -1,11 +1,28 @@
-from django.urls import path, include
+from django.contrib.auth import views as auth_views
+from django.urls import path, include, reverse_lazy
 
+from accounts.forms import OutboxPasswordResetForm
 from accounts.views import register, activate
 
 
 app_name = "accounts"
 
 urlpatterns = [
+    path(
+        "password_reset/",
+        auth_views.PasswordResetView.as_view(
+            form_class=OutboxPasswordResetForm,
+            success_url=reverse_lazy("accounts:password_reset_done"),
+        ),
+        name="password_reset",
+    ),
+    path(
+        "reset/<uidb64>/<token>/",
+        auth_views.PasswordResetConfirmView.as_view(
+            success_url=reverse_lazy("accounts:password_reset_complete"),
+        ),
+        name="password_reset_confirm",
+    ),
     path("", include("django.contrib.auth.urls")),
     path("register/", register, name="register"),
     path("activate/<str:uid>/<str:token>", activate, name="activate"),
@@ -1,7 +1,7 @@
 from django.contrib import messages
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Permission
 from django.contrib.sites.shortcuts import get_current_site
+from django.db import transaction
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
 from django.utils.encoding import force_bytes, force_str
@@ -10,6 +10,7 @@ from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from accounts.forms import RegisterForm
 from accounts.services.email_service import EmailService
 from accounts.services.token_service import account_activation_token
+from digital_store.services.permissions import add_to_seller_group
 
 
 User = get_user_model()
@@ -19,16 +20,16 @@ def register(request: HttpRequest):
 
     if request.method == "POST":
         if form.is_valid():
-            user = form.save(commit=False)
-            user.is_active = False
+            with transaction.atomic():
+                user = form.save(commit=False)
+                user.is_active = False
+                user.save()
 
-            domain = get_current_site(request).domain
-            uid = urlsafe_base64_encode(force_bytes(user.pk))
-            token = account_activation_token.make_token(user)
+                domain = get_current_site(request).domain
+                uid = urlsafe_base64_encode(force_bytes(user.pk))
+                token = account_activation_token.make_token(user)
 
-            try:
-                email_service = EmailService()
-                email_service.send_activation_email(
+                EmailService().send_activation_email(
                     username=user.username,
                     domain=domain,
                     uid=uid,
@@ -36,16 +37,8 @@ def register(request: HttpRequest):
                     token=token,
                 )
 
-                user.save()
-                messages.info(request, "Please confirm your activation by email")
-
-                return redirect("accounts:login")
-            except RuntimeError as error:
-                messages.error(
-                    request,
-                    f"There was an error sending the activation email: {error}"
-                )
-                return redirect("accounts:register")
+            messages.info(request, "Please confirm your activation by email")
+            return redirect("accounts:login")
 
     return render(request, "registration/register.html", {"form": form})
 
@@ -61,15 +54,11 @@ def activate(request, uid, token):
         return HttpResponse("Your account is already activated")
 
     if user is not None and account_activation_token.check_token(user, token):
-        user.is_active = True
-        if user.role == "SL":
-            permissions = Permission.objects.filter(
-                content_type__model__in=["category", "product"],
-                content_type__app_label="digital_store",
-            )
-            user.user_permissions.add(*permissions)
-
-        user.save()
+        with transaction.atomic():
+            user.is_active = True
+            user.save()
+            if user.role == "SL":
+                add_to_seller_group(user.pk)
 
         return HttpResponse(
             "Thank you for your email confirmation. Now you can login your account."
@@ -0,0 +1,25 @@
+import os
+
+
+def setup() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings.dev")
+    for name in ("SECRET_KEY", "EMAIL_HOST_USER", "EMAIL_HOST_PASSWORD"):
+        os.environ.setdefault(name, "benchmark")
+
+    import django
+
+    django.setup()
+
+
+def create_test_database() -> None:
+    """
+    Run the benchmark against a throwaway database (in-memory on SQLite)
+    built the same way the test runner builds it. DEBUG is switched off
+    as under the test runner, otherwise the debug toolbar and the query
+    log distort every measurement.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment(debug=False)
+    connection.creation.create_test_db(verbosity=0)
@@ -0,0 +1,107 @@
+"""
+Autocomplete costs of an in-memory prefix index: the full rebuild, the
+incremental add/remove run by save signals, and lookup latency with
+those writes in the overlay.
+
+Usage:
+    python -m benchmarks.autocomplete --names 1000000 --queries 20000 --writes 2000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from digital_store.services.prefix_index import PrefixIndex
+
+
+WORDS = (
+    "guitar", "piano", "python", "django", "cooking", "travel", "photo", "video",
+    "course", "ebook", "music", "album", "preset", "template", "font", "icon",
+    "podcast", "game", "skin", "plugin", "theme", "wallpaper", "sound", "loop",
+)
+
+
+def generate_names(count: int, rng: random.Random):
+    for i in range(count):
+        words = rng.sample(WORDS, 3)
+        yield "product", i, f"{words[0].capitalize()} {words[1]} {words[2]} {i}"
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--names", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--p99-budget-ms", type=float, default=1.0)
+    parser.add_argument("--write-p99-budget-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    started = time.perf_counter()
+    index = PrefixIndex.build(generate_names(args.names, rng))
+    build_seconds = time.perf_counter() - started
+
+    # Half new names, a quarter renames and a quarter removals, as the
+    # post_save and post_delete signals would apply them.
+    write_timings = []
+    for i in range(args.writes):
+        pk = rng.randrange(args.names)
+        started = time.perf_counter()
+        if i % 4 == 3:
+            index.remove("product", pk)
+        elif i % 4 == 2:
+            index.add("product", pk, f"Renamed {rng.choice(WORDS)} {pk}")
+        else:
+            index.add("product", args.names + i, f"New {rng.choice(WORDS)} {i}")
+        write_timings.append((time.perf_counter() - started) * 1000)
+    write_timings.sort()
+
+    prefixes = [
+        rng.choice(WORDS)[:rng.randint(1, 5)] + (str(rng.randint(0, 99)) if rng.random() < 0.1 else "")
+        for _ in range(args.queries)
+    ]
+
+    timings = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        index.search(prefix, limit=args.limit)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    p99 = percentile(timings, 0.99)
+
+    print(f"names:   {len(index)}")
+    print(f"rebuild: {build_seconds:.1f} s")
+    failed = False
+
+    if write_timings:
+        write_p99 = percentile(write_timings, 0.99)
+        print(f"writes:  {len(write_timings)} (overlay {index.overlay_size} names)")
+        print(f"  mean:  {statistics.fmean(write_timings):.4f} ms")
+        print(f"  p99:   {write_p99:.4f} ms")
+        if write_p99 > args.write_p99_budget_ms:
+            print(f"FAIL: write p99 above {args.write_p99_budget_ms} ms budget")
+            failed = True
+
+    print(f"queries: {len(timings)}")
+    print(f"  mean:  {statistics.fmean(timings):.4f} ms")
+    print(f"  p50:   {percentile(timings, 0.50):.4f} ms")
+    print(f"  p99:   {p99:.4f} ms")
+    if p99 > args.p99_budget_ms:
+        print(f"FAIL: p99 above {args.p99_budget_ms} ms budget")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
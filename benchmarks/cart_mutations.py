@@ -0,0 +1,102 @@
+"""
+Throughput and query count of cart mutations: the single-statement
+upsert / conditional update against the previous read-modify-write
+through get_or_create and save().
+
+Usage:
+    python -m benchmarks.cart_mutations --operations 5000 --products 200
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from benchmarks import _django
+
+
+def legacy_mutation(user, product_id: int, action: str) -> None:
+    from django.shortcuts import get_object_or_404
+
+    from digital_store.models import Cart, CartProduct, Product
+
+    product = get_object_or_404(Product, id=product_id)
+    cart, _ = Cart.objects.get_or_create(customer=user)
+    cart_product, _ = CartProduct.objects.get_or_create(cart=cart, product=product)
+
+    if action == "increase":
+        cart_product.quantity += 1
+        cart_product.save()
+    elif action == "reduce":
+        if cart_product.quantity > 1:
+            cart_product.quantity -= 1
+            cart_product.save()
+        else:
+            cart_product.delete()
+
+
+def atomic_mutation(user, product_id: int, action: str) -> None:
+    from digital_store.services.cart import add_to_cart, reduce_in_cart
+
+    if action == "increase":
+        add_to_cart(user.pk, product_id)
+    else:
+        reduce_in_cart(user.pk, product_id)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=5000)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    _django.setup()
+    _django.create_test_database()
+
+    from django.db import connection, transaction
+
+    from accounts.models import User
+    from digital_store.models import Cart, CartProduct, Product
+
+    seller = User.objects.create(username="seller", role="SL")
+    product_ids = [
+        product.pk
+        for product in Product.objects.bulk_create(
+            [Product(name=f"Product {i}", price=10, seller=seller) for i in range(args.products)]
+        )
+    ]
+    rng = random.Random(args.seed)
+    plan = [
+        (rng.choice(product_ids), "increase" if rng.random() < 0.7 else "reduce")
+        for _ in range(args.operations)
+    ]
+
+    for name, mutate in (("legacy", legacy_mutation), ("atomic", atomic_mutation)):
+        user = User.objects.create(username=f"customer-{name}")
+        Cart.objects.create(customer=user)
+
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            for product_id, action in plan:
+                with transaction.atomic():
+                    mutate(user, product_id, action)
+            elapsed = time.perf_counter() - started
+
+        lines = CartProduct.objects.filter(cart__customer=user).count()
+        print(
+            f"{name}: {args.operations / elapsed:,.0f} ops/s, "
+            f"{len(queries) / args.operations:.2f} queries/op, {lines} lines left"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
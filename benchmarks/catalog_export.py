@@ -0,0 +1,90 @@
+"""
+Throughput and peak Python memory of the streaming catalog export.
+
+Usage:
+    python -m benchmarks.catalog_export --products 5000000 --format csv
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from benchmarks import _django
+
+
+def populate(count: int, batch_size: int = 20000) -> None:
+    from accounts.models import User
+    from digital_store.models import Category, Product
+
+    seller = User.objects.create(username="seller", role="SL")
+    categories = Category.objects.bulk_create(
+        [Category(name=f"Category {i}", description="Benchmark") for i in range(10)]
+    )
+    through = Product.category.through
+
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        products = Product.objects.bulk_create(
+            [
+                Product(
+                    name=f"Product {start + i}",
+                    description="Benchmark product",
+                    price=10 + (start + i) % 990,
+                    seller=seller,
+                )
+                for i in range(size)
+            ]
+        )
+        through.objects.bulk_create(
+            [
+                through(product_id=product.pk, category_id=categories[product.pk % 10].pk)
+                for product in products
+            ]
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    _django.setup()
+    _django.create_test_database()
+
+    from digital_store.services.catalog_export import export_catalog
+
+    started = time.perf_counter()
+    populate(args.products)
+    print(f"populated {args.products} products in {time.perf_counter() - started:.1f}s")
+
+    def run() -> tuple[int, int]:
+        written = rows = 0
+        with open(os.devnull, "w") as output:
+            for line in export_catalog(args.format, chunk_size=args.chunk_size):
+                written += output.write(line)
+                rows += 1
+        return written, rows
+
+    started = time.perf_counter()
+    written, rows = run()
+    elapsed = time.perf_counter() - started
+
+    # Second pass under tracemalloc, which is too slow to time.
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"exported {rows - (args.format == 'csv')} rows, {written / 2**20:.1f} MiB")
+    print(f"elapsed: {elapsed:.1f}s ({args.products / elapsed:,.0f} rows/s)")
+    print(f"peak python memory: {peak / 2**20:.1f} MiB")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
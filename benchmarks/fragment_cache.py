@@ -0,0 +1,76 @@
+"""
+Render time of a 12-card product list page with a cold and a warm
+product-card fragment cache.
+
+Usage:
+    python -m benchmarks.fragment_cache --rounds 200
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from benchmarks import _django
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--cards", type=int, default=12)
+    args = parser.parse_args()
+
+    _django.setup()
+    _django.create_test_database()
+
+    from django.contrib.auth.models import AnonymousUser
+    from django.core.cache import cache
+    from django.template.loader import render_to_string
+    from django.test import RequestFactory
+
+    from accounts.models import User
+    from digital_store.models import Category, Product
+    from digital_store.services import cache_versions
+
+    seller = User.objects.create(username="seller", role="SL")
+    categories = [
+        Category.objects.create(name=f"Category {i}", description="Benchmark")
+        for i in range(3)
+    ]
+    for i in range(args.cards):
+        product = Product.objects.create(name=f"Product {i}", price=10 + i, seller=seller)
+        product.category.add(*categories[: i % 3 + 1])
+
+    request = RequestFactory().get("/products/")
+    request.user = AnonymousUser()
+
+    def render() -> float:
+        products = list(Product.objects.prefetch_related("category")[: args.cards])
+        context = {
+            "product_list": products,
+            "category_version": cache_versions.get_version(cache_versions.CATEGORY),
+        }
+        started = time.perf_counter()
+        render_to_string("digital_store/product_list.html", context, request=request)
+        return (time.perf_counter() - started) * 1000
+
+    cold, warm = [], []
+    for _ in range(args.rounds):
+        cache.clear()
+        cold.append(render())
+        warm.append(render())
+
+    for label, samples in (("cold", cold), ("warm", warm)):
+        samples.sort()
+        print(
+            f"{label}: mean {statistics.fmean(samples):.3f} ms, "
+            f"p50 {samples[len(samples) // 2]:.3f} ms, "
+            f"p95 {samples[int(len(samples) * 0.95)]:.3f} ms"
+        )
+    print(f"speedup: {statistics.fmean(cold) / statistics.fmean(warm):.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+"""
+Latency, query count and response size of every view in
+digital_store.urls and accounts.urls against a generated dataset.
+
+Each request runs inside a transaction that is rolled back, so
+mutating views (cart, orders, deletes) see the same data every round.
+Anonymous pages go through the page cache as they would in production;
+pass --cold-cache to clear it before every request instead.
+
+Usage:
+    python -m benchmarks.views --products 100000 --save-baseline
+    python -m benchmarks.views --products 100000
+
+The second form compares against the saved baseline and exits with 1
+when a view got slower than --latency-threshold at p95, or now runs
+more queries than it did.
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from benchmarks import _django
+
+
+DEFAULT_BASELINE = Path(__file__).with_name("baselines") / "views.json"
+DATASET_OPTIONS = ("users", "sellers", "products", "categories", "carts", "orders", "seed")
+URLCONFS = ("digital_store.urls", "accounts.urls")
+
+
+class Scenario(NamedTuple):
+    name: str
+    user: str
+    method: str = "get"
+    kwargs: str | None = None
+    query: str = ""
+    data: dict | str | None = None
+    content_type: str | None = None
+    range: str | None = None
+
+
+# One entry per URL name; a view without one makes the run fail, so
+# new views cannot silently escape the benchmark.
+SCENARIOS = [
+    Scenario("digital_store:index", "anonymous"),
+    Scenario("digital_store:category-list", "anonymous"),
+    Scenario("digital_store:category-create", "seller"),
+    Scenario("digital_store:category-update", "seller", kwargs="category"),
+    Scenario("digital_store:category-delete", "seller", "post", kwargs="category"),
+    Scenario("digital_store:product-list", "anonymous"),
+    Scenario("digital_store:product-list", "anonymous", query="name=product&category={category}"),
+    Scenario("digital_store:product-list", "customer"),
+    Scenario("digital_store:autocomplete", "anonymous", query="q=prod"),
+    Scenario("digital_store:product-detail", "anonymous", kwargs="product"),
+    Scenario("digital_store:product-create", "seller"),
+    Scenario("digital_store:product-update", "seller", kwargs="product"),
+    Scenario("digital_store:product-delete", "seller", "post", kwargs="product"),
+    Scenario("digital_store:catalog-export", "seller", query="format=jsonl"),
+    Scenario("digital_store:cart-list", "customer"),
+    Scenario("digital_store:cart-add", "customer", "post", "product", data={"action": "increase"}),
+    Scenario(
+        "digital_store:cart-quantity-change", "customer", "post", "product",
+        data={"action": "reduce"},
+    ),
+    Scenario(
+        "digital_store:cart-batch", "customer", "post",
+        data='{"changes": [{"product": 1, "quantity": 3}, {"product": 2, "quantity": 0}]}',
+        content_type="application/json",
+    ),
+    Scenario("digital_store:product-download", "customer", kwargs="product"),
+    Scenario("digital_store:asset-download", "anonymous", kwargs="download"),
+    Scenario("digital_store:asset-download", "anonymous", kwargs="download", range="bytes=-65536"),
+    Scenario("digital_store:order-list", "customer"),
+    Scenario("digital_store:order-create", "customer", "post"),
+    Scenario("accounts:login", "anonymous"),
+    Scenario("accounts:logout", "customer", "post"),
+    Scenario("accounts:password_change", "customer"),
+    Scenario("accounts:password_change_done", "customer"),
+    Scenario("accounts:password_reset", "anonymous"),
+    Scenario("accounts:password_reset_done", "anonymous"),
+    Scenario("accounts:password_reset_confirm", "anonymous", kwargs="reset"),
+    Scenario("accounts:password_reset_complete", "anonymous"),
+    Scenario("accounts:register", "anonymous"),
+    Scenario("accounts:activate", "anonymous", kwargs="activate"),
+]
+
+
+def url_names() -> set[str]:
+    from django.urls import URLPattern, URLResolver
+    from django.utils.module_loading import import_module
+
+    def walk(patterns, namespace):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, namespace)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                yield f"{namespace}:{pattern.name}"
+
+    names = set()
+    for urlconf in URLCONFS:
+        module = import_module(urlconf)
+        names.update(walk(module.urlpatterns, module.app_name))
+    return names
+
+
+def label(scenario: Scenario) -> str:
+    suffix = f"?{scenario.query}" if scenario.query else ""
+    if scenario.range:
+        suffix += f" ({scenario.range})"
+    return f"{scenario.method.upper()} {scenario.name}{suffix} [{scenario.user}]"
+
+
+def populate(args) -> dict:
+    from django.core.files.base import ContentFile
+    from django.core.management import call_command
+    from django.utils.encoding import force_bytes
+    from django.utils.http import urlsafe_base64_encode
+
+    from accounts.models import User
+    from accounts.services.token_service import account_activation_token
+    from digital_store.models import Cart, CartProduct, Category, Order, OrderProduct, Product
+    from digital_store.services.downloads import sign_download
+    from digital_store.services.permissions import add_to_seller_group
+
+    call_command(
+        "populate_db",
+        categories=args.categories,
+        users=args.users,
+        sellers=args.sellers,
+        products=args.products,
+        carts=args.carts,
+        orders=args.orders,
+        seed=args.seed,
+    )
+
+    # A regular seller, so permission checks run as they do in production.
+    seller = User.objects.create_user(username="bench-seller", role="SL", is_staff=True)
+    add_to_seller_group(seller.pk)
+    customer = User.objects.create_user(username="bench-customer", role="CS")
+    category = Category.objects.order_by("id").first()
+    product = Product.objects.create(
+        name="Benchmark product", description="Benchmark", price=10, seller=seller
+    )
+    product.category.add(category)
+    product.asset.save("benchmark.bin", ContentFile(os.urandom(args.asset_size)))
+
+    products = list(Product.objects.order_by("id")[: args.cart_items])
+    cart = Cart.objects.create(customer=customer)
+    CartProduct.objects.bulk_create(
+        [CartProduct(cart=cart, product=item, quantity=2) for item in products]
+        + [CartProduct(cart=cart, product=product, quantity=2)]
+    )
+    orders = Order.objects.bulk_create(
+        [Order(customer=customer) for _ in range(args.customer_orders)]
+    )
+    OrderProduct.objects.bulk_create(
+        [
+            OrderProduct(order=order, product=item, quantity=1, unit_price=item.price)
+            for order in orders
+            for item in products
+        ]
+    )
+
+    purchase = Order.objects.create(customer=customer, status=Order.StatusChoice.COMPLETED)
+    OrderProduct.objects.create(order=purchase, product=product)
+
+    uid = urlsafe_base64_encode(force_bytes(customer.pk))
+    return {
+        "users": {"seller": seller, "customer": customer},
+        "category": category.pk,
+        "kwargs": {
+            "category": {"pk": category.pk},
+            "product": {"pk": product.pk},
+            "reset": {"uidb64": uid, "token": "set-password"},
+            "activate": {"uid": uid, "token": account_activation_token.make_token(customer)},
+            "download": {"token": sign_download(product.pk, customer.pk, product.asset.name)},
+        },
+    }
+
+
+def make_clients(fixtures: dict) -> dict:
+    from django.test import Client
+
+    clients = {"anonymous": Client()}
+    for name, user in fixtures["users"].items():
+        client = Client()
+        client.force_login(user)
+        clients[name] = client
+    return clients
+
+
+def request(client, scenario: Scenario, fixtures: dict) -> tuple[int, int, int]:
+    from django.db import connection, transaction
+    from django.urls import reverse
+
+    kwargs = fixtures["kwargs"][scenario.kwargs] if scenario.kwargs else None
+    url = reverse(scenario.name, kwargs=kwargs)
+    if scenario.query:
+        url = f"{url}?{scenario.query.format(category=fixtures['category'])}"
+
+    # Logging out clears the client's cookies along with the session.
+    cookies = copy.deepcopy(client.cookies)
+
+    # Counted with a wrapper rather than the query log, which is capped.
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count), transaction.atomic():
+        extra = {"content_type": scenario.content_type} if scenario.content_type else {}
+        if scenario.range:
+            extra["headers"] = {"Range": scenario.range}
+        response = getattr(client, scenario.method)(url, scenario.data or {}, **extra)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        transaction.set_rollback(True)
+
+    client.cookies = cookies
+    return response.status_code, len(queries), size
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(scenario: Scenario, client, fixtures: dict, args) -> dict:
+    from django.core.cache import cache
+
+    timings, statuses = [], set()
+    query_count = size = 0
+
+    for round_number in range(args.warmup + args.rounds):
+        if args.cold_cache:
+            cache.clear()
+        started = time.perf_counter()
+        status, query_count, size = request(client, scenario, fixtures)
+        elapsed = (time.perf_counter() - started) * 1000
+        statuses.add(status)
+        if round_number >= args.warmup:
+            timings.append(elapsed)
+
+    return {
+        "status": sorted(statuses),
+        "p50_ms": round(percentile(timings, 0.50), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "p99_ms": round(percentile(timings, 0.99), 3),
+        "queries": query_count,
+        "bytes": size,
+    }
+
+
+def compare(results: dict, baseline: dict, args) -> list[str]:
+    regressions = []
+
+    for name, result in results.items():
+        previous = baseline["views"].get(name)
+        if previous is None:
+            continue
+
+        slower = result["p95_ms"] - previous["p95_ms"]
+        if (
+            result["p95_ms"] > previous["p95_ms"] * (1 + args.latency_threshold)
+            and slower > args.latency_slack
+        ):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms"
+            )
+        if result["queries"] > previous["queries"] + args.query_threshold:
+            regressions.append(
+                f"{name}: {previous['queries']} -> {result['queries']} queries"
+            )
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--sellers", type=int, default=100)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--carts", type=int, default=500)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cart-items", type=int, default=10)
+    parser.add_argument("--customer-orders", type=int, default=50)
+    parser.add_argument("--asset-size", type=int, default=4 * 1024 * 1024)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--cold-cache", action="store_true")
+    parser.add_argument("--only", help="Only run views whose label contains this text")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--latency-threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative p95 slowdown before failing",
+    )
+    parser.add_argument(
+        "--latency-slack",
+        type=float,
+        default=5.0,
+        help="Slowdowns below this many milliseconds are treated as noise",
+    )
+    parser.add_argument("--query-threshold", type=int, default=0)
+    args = parser.parse_args()
+
+    _django.setup()
+    _django.create_test_database()
+
+    from django.test import override_settings
+
+    # Product assets are written to a scratch directory, not the real one.
+    asset_root = tempfile.TemporaryDirectory()
+    override_settings(PRIVATE_MEDIA_ROOT=asset_root.name).enable()
+
+    missing = url_names() - {scenario.name for scenario in SCENARIOS}
+    if missing:
+        print(f"no benchmark scenario for: {', '.join(sorted(missing))}")
+        return 1
+
+    started = time.perf_counter()
+    fixtures = populate(args)
+    print(f"populated dataset in {time.perf_counter() - started:.1f}s")
+
+    clients = make_clients(fixtures)
+    results = {}
+
+    for scenario in SCENARIOS:
+        name = label(scenario)
+        if args.only and args.only not in name:
+            continue
+        result = results[name] = measure(scenario, clients[scenario.user], fixtures, args)
+        print(
+            f"{name:<75} {'/'.join(map(str, result['status'])):>7} "
+            f"p50 {result['p50_ms']:8.2f}  p95 {result['p95_ms']:8.2f}  "
+            f"p99 {result['p99_ms']:8.2f} ms  {result['queries']:4} queries  "
+            f"{result['bytes']:>9} bytes"
+        )
+
+    dataset = {option: getattr(args, option) for option in DATASET_OPTIONS}
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps({"dataset": dataset, "views": results}, indent=2) + "\n"
+        )
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, run with --save-baseline first")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["dataset"] != dataset:
+        print(f"baseline was recorded on a different dataset: {baseline['dataset']}")
+        return 1
+
+    regressions = compare(results, baseline, args)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -49,6 +49,7 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "digital_store.middleware.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -74,6 +75,7 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "digital_store.context_processors.cfg_assets_root",
+                "digital_store.context_processors.cart_summary",
             ],
         },
     },
@@ -137,6 +139,10 @@ INTERNAL_IPS = [
 
 AUTH_USER_MODEL = "accounts.User"
 
+AUTHENTICATION_BACKENDS = [
+    "digital_store.backends.CachedPermissionBackend",
+]
+
 LOGIN_REDIRECT_URL = '/'
 
 EMAIL_USE_TLS = True
@@ -148,3 +154,21 @@ EMAIL_PORT = 587
 PASSWORD_RESET_TIMEOUT = 14400
 
 ASSETS_ROOT = "/static/assets"
+
+# Purchased product files live outside any public directory and are
+# served through signed, expiring download URLs.
+PRIVATE_MEDIA_ROOT = BASE_DIR / "private_media"
+ASSET_DOWNLOAD_MAX_AGE = 60 * 60
+# None streams files from Django; "x-accel-redirect" (nginx) or
+# "x-sendfile" (Apache, lighttpd) hands them to the web server.
+ASSET_DOWNLOAD_OFFLOAD = None
+ASSET_ACCEL_REDIRECT_PREFIX = "/protected-assets/"
+# Sellers can also upload assets in resumable chunks through the API.
+ASSET_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+ASSET_UPLOAD_MAX_SIZE = 20 * 1024 ** 3
+
+# Query budget violations are logged, and raised under the test runner.
+# QUERY_BUDGET_TRACE (default: DEBUG) finds the origin of every query
+# rather than only of those over budget or repeated.
+TEST_RUNNER = "core.test_runner.QueryBudgetTestRunner"
+QUERY_BUDGET_RAISE = False
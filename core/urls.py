@@ -24,4 +24,5 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("digital_store.urls", namespace="digital_store")),
     path("accounts/", include("accounts.urls", namespace="accounts")),
+    path("api/v1/", include("digital_store.api.urls", namespace="api-v1")),
 ] + debug_toolbar_urls()
@@ -1,7 +1,15 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from digital_store.models import Order, Cart, Category, Product, OrderProduct
+from digital_store.models import (
+    AssetUpload,
+    Order,
+    Cart,
+    Category,
+    Product,
+    OrderProduct,
+    Job,
+)
 from accounts.models import User
 
 
@@ -99,3 +107,35 @@ class CartAdmin(admin.ModelAdmin):
         return "\n".join(order_details)
 
     display_products.short_description = "Products in Order"
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "kind",
+        "status",
+        "attempts",
+        "run_after",
+        "locked_by",
+        "finished_at",
+    )
+    list_filter = ("status", "kind",)
+    readonly_fields = ("created_at",)
+    list_per_page = 20
+
+
+@admin.register(AssetUpload)
+class AssetUploadAdmin(admin.ModelAdmin):
+    list_display = (
+        "filename",
+        "product",
+        "seller",
+        "status",
+        "received_bytes",
+        "size",
+        "updated_at",
+    )
+    list_filter = ("status",)
+    list_select_related = ("product", "seller")
+    readonly_fields = ("created_at", "updated_at")
+    list_per_page = 20
@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+
+from digital_store.models import Category, Product
+
+
+class Resource:
+    """
+    Describes how a model is exposed by the catalog API: every public
+    field maps to a ``.values()`` lookup, so rows are serialized straight
+    from dicts without building model instances.
+    """
+
+    fields: dict[str, str] = {}
+    default_fields: tuple[str, ...] = ()
+    ordering: tuple[str, ...] = ("id",)
+
+    def get_queryset(self, request) -> QuerySet:
+        raise NotImplementedError
+
+    def lookups_for(self, fields: list[str]) -> list[str]:
+        lookups = {"id"}
+        lookups.update(self.fields[name] for name in fields if name in self.fields)
+        lookups.update(field.lstrip("-") for field in self.ordering)
+        return sorted(lookups)
+
+    def serialize(self, rows: list[dict], fields: list[str]) -> list[dict]:
+        return [
+            {name: row[self.fields[name]] for name in fields if name in self.fields}
+            for row in rows
+        ]
+
+
+class ProductResource(Resource):
+    fields = {
+        "id": "id",
+        "name": "name",
+        "description": "description",
+        "price": "price",
+        "seller_id": "seller_id",
+        "seller": "seller__username",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
+    extra_fields = ("categories",)
+    default_fields = ("id", "name", "price", "seller", "categories", "created_at")
+    ordering = ("-created_at", "-id")
+
+    def get_queryset(self, request) -> QuerySet:
+        return Product.objects.all()
+
+    def serialize(self, rows: list[dict], fields: list[str]) -> list[dict]:
+        items = super().serialize(rows, fields)
+
+        if "categories" in fields:
+            categories = product_categories([row["id"] for row in rows])
+            for item, row in zip(items, rows):
+                item["categories"] = categories.get(row["id"], [])
+
+        return items
+
+
+class CategoryResource(Resource):
+    fields = {
+        "id": "id",
+        "name": "name",
+        "description": "description",
+    }
+    default_fields = ("id", "name", "description")
+    ordering = ("name", "id")
+
+    def get_queryset(self, request) -> QuerySet:
+        return Category.objects.all()
+
+
+class SellerResource(Resource):
+    fields = {
+        "id": "id",
+        "username": "username",
+        "first_name": "first_name",
+        "last_name": "last_name",
+    }
+    default_fields = ("id", "username", "first_name", "last_name")
+    ordering = ("id",)
+
+    def get_queryset(self, request) -> QuerySet:
+        User = get_user_model()
+        return User.objects.filter(role=User.UserRole.SELLER, is_active=True)
+
+
+def product_categories(product_ids: list[int]) -> dict[int, list[dict]]:
+    """Categories for a whole page of products in one query."""
+    through = Product.category.through
+    categories = {}
+
+    rows = through.objects.filter(product_id__in=product_ids).values_list(
+        "product_id", "category_id", "category__name"
+    ).order_by("category__name")
+    for product_id, category_id, name in rows:
+        categories.setdefault(product_id, []).append({"id": category_id, "name": name})
+
+    return categories
@@ -0,0 +1,42 @@
+from django.urls import path
+
+from digital_store.api.views import (
+    ProductListApiView,
+    ProductDetailApiView,
+    CategoryListApiView,
+    CategoryDetailApiView,
+    SellerListApiView,
+    SellerDetailApiView,
+    AssetUploadListView,
+    AssetUploadDetailView,
+    AssetUploadChunkView,
+    AssetUploadCompleteView,
+)
+
+
+app_name = "api"
+
+urlpatterns = [
+    path("products/", ProductListApiView.as_view(), name="product-list"),
+    path("products/<int:pk>/", ProductDetailApiView.as_view(), name="product-detail"),
+    path("categories/", CategoryListApiView.as_view(), name="category-list"),
+    path(
+        "categories/<int:pk>/",
+        CategoryDetailApiView.as_view(),
+        name="category-detail"
+    ),
+    path("sellers/", SellerListApiView.as_view(), name="seller-list"),
+    path("sellers/<int:pk>/", SellerDetailApiView.as_view(), name="seller-detail"),
+    path("uploads/", AssetUploadListView.as_view(), name="upload-list"),
+    path("uploads/<uuid:pk>/", AssetUploadDetailView.as_view(), name="upload-detail"),
+    path(
+        "uploads/<uuid:pk>/chunks/<int:index>/",
+        AssetUploadChunkView.as_view(),
+        name="upload-chunk"
+    ),
+    path(
+        "uploads/<uuid:pk>/complete/",
+        AssetUploadCompleteView.as_view(),
+        name="upload-complete"
+    ),
+]
@@ -0,0 +1,266 @@
+import json
+
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views import generic
+
+from digital_store.api.resources import (
+    CategoryResource,
+    ProductResource,
+    Resource,
+    SellerResource,
+)
+from digital_store.filters import ProductFilter
+from digital_store.models import AssetUpload
+from digital_store.pagination import KeysetPaginator
+from digital_store.services.permissions import SELLER_PERMISSIONS
+from digital_store.services.search import get_search_backend
+from digital_store.services.uploads import (
+    UploadError,
+    complete_upload,
+    discard_upload,
+    missing_chunks,
+    start_upload,
+    write_chunk,
+)
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class ApiErrorMixin:
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except (ApiError, UploadError) as error:
+            return JsonResponse({"error": str(error)}, status=error.status)
+
+
+class ResourceMixin(ApiErrorMixin):
+    resource: Resource
+    max_ids = 100
+
+    def get_fields(self, request: HttpRequest) -> list[str]:
+        requested = request.GET.get("fields")
+        if not requested:
+            return list(self.resource.default_fields)
+
+        fields = [field.strip() for field in requested.split(",") if field.strip()]
+        allowed = set(self.resource.fields) | set(getattr(self.resource, "extra_fields", ()))
+        unknown = [field for field in fields if field not in allowed]
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+
+        return fields
+
+    def get_queryset(self, request: HttpRequest):
+        return self.resource.get_queryset(request)
+
+
+class ResourceListView(ResourceMixin, generic.View):
+    default_page_size = 20
+    max_page_size = 100
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        fields = self.get_fields(request)
+        queryset = self.get_queryset(request)
+        ordering = tuple(queryset.query.order_by) or self.resource.ordering
+        lookups = self.resource.lookups_for(fields)
+        lookups += [field.lstrip("-") for field in ordering if field.lstrip("-") not in lookups]
+        rows = queryset.values(*lookups)
+
+        ids = self.get_ids(request)
+        if ids is not None:
+            rows = list(rows.filter(id__in=ids).order_by(*ordering))
+            return JsonResponse({"results": self.resource.serialize(rows, fields)})
+
+        paginator = KeysetPaginator(rows, self.get_page_size(request), ordering=ordering)
+        page = paginator.get_page(request.GET.get("cursor"))
+
+        return JsonResponse(
+            {
+                "results": self.resource.serialize(page.object_list, fields),
+                "next": page.next_cursor,
+                "previous": page.previous_cursor,
+            }
+        )
+
+    def get_ids(self, request: HttpRequest) -> list[int] | None:
+        raw = request.GET.get("ids")
+        if raw is None:
+            return None
+
+        try:
+            ids = [int(value) for value in raw.split(",") if value.strip()]
+        except ValueError:
+            raise ApiError("ids must be a comma-separated list of integers")
+
+        if len(ids) > self.max_ids:
+            raise ApiError(f"At most {self.max_ids} ids can be requested at once")
+
+        return ids
+
+    def get_page_size(self, request: HttpRequest) -> int:
+        try:
+            size = int(request.GET.get("limit", self.default_page_size))
+        except ValueError:
+            raise ApiError("limit must be an integer")
+
+        return max(1, min(size, self.max_page_size))
+
+
+class ResourceDetailView(ResourceMixin, generic.View):
+    def get(self, request: HttpRequest, pk: int, *args, **kwargs):
+        fields = self.get_fields(request)
+        rows = list(
+            self.get_queryset(request).filter(pk=pk).values(
+                *self.resource.lookups_for(fields)
+            )
+        )
+
+        if not rows:
+            raise ApiError("Not found", status=404)
+
+        return JsonResponse(self.resource.serialize(rows, fields)[0])
+
+
+class ProductQuerysetMixin:
+    resource = ProductResource()
+
+    def get_queryset(self, request: HttpRequest):
+        queryset = get_search_backend().search(
+            self.resource.get_queryset(request), request.GET.get("q")
+        )
+        filterset = ProductFilter(request.GET, queryset=queryset)
+
+        if not filterset.is_valid():
+            raise ApiError(filterset.errors.as_text())
+
+        return filterset.qs
+
+
+class ProductListApiView(ProductQuerysetMixin, ResourceListView):
+    def get_queryset(self, request: HttpRequest):
+        queryset = super().get_queryset(request)
+        rank_field = get_search_backend().rank_field
+
+        if not queryset.query.order_by and rank_field in queryset.query.annotations:
+            return queryset.order_by(f"-{rank_field}")
+
+        return queryset
+
+
+class ProductDetailApiView(ResourceDetailView):
+    resource = ProductResource()
+
+
+class CategoryListApiView(ResourceListView):
+    resource = CategoryResource()
+
+
+class CategoryDetailApiView(ResourceDetailView):
+    resource = CategoryResource()
+
+
+class SellerListApiView(ResourceListView):
+    resource = SellerResource()
+
+
+class SellerDetailApiView(ResourceDetailView):
+    resource = SellerResource()
+
+
+class UploadMixin(ApiErrorMixin, LoginRequiredMixin, PermissionRequiredMixin):
+    raise_exception = True
+    permission_required = SELLER_PERMISSIONS
+
+    def get_upload(self, request: HttpRequest, pk) -> AssetUpload:
+        upload = AssetUpload.objects.filter(pk=pk, seller=request.user).first()
+        if upload is None:
+            raise ApiError("Upload not found", status=404)
+        return upload
+
+    def serialize(self, upload: AssetUpload, missing: list[int] | None = None) -> dict:
+        data = {
+            "id": str(upload.pk),
+            "product": upload.product_id,
+            "filename": upload.filename,
+            "size": upload.size,
+            "chunk_size": upload.chunk_size,
+            "chunk_count": upload.chunk_count,
+            "received_bytes": upload.received_bytes,
+            "status": upload.get_status_display(),
+        }
+        if missing is not None:
+            data["missing_chunks"] = missing
+        return data
+
+
+class AssetUploadListView(UploadMixin, generic.View):
+    """
+    Start a resumable upload of a product asset. Expects
+    {"product": <id>, "filename": <name>, "size": <bytes>}; the chunks
+    are then PUT to the chunk URL in any order and the upload completed.
+    """
+
+    query_budget = 8
+
+    def post(self, request: HttpRequest, *args, **kwargs):
+        try:
+            data = json.loads(request.body)
+            product_id, size = int(data["product"]), int(data["size"])
+            filename = str(data["filename"])
+        except (ValueError, KeyError, TypeError):
+            raise ApiError("Expected product, filename and size")
+
+        upload = start_upload(request.user.pk, product_id, filename, size)
+        return JsonResponse(
+            self.serialize(upload, missing=list(range(upload.chunk_count))), status=201
+        )
+
+
+class AssetUploadDetailView(UploadMixin, generic.View):
+    query_budget = 6
+
+    def get(self, request: HttpRequest, pk, *args, **kwargs):
+        upload = self.get_upload(request, pk)
+        return JsonResponse(self.serialize(upload, missing=missing_chunks(upload)))
+
+    def delete(self, request: HttpRequest, pk, *args, **kwargs):
+        discard_upload(self.get_upload(request, pk))
+        return HttpResponse(status=204)
+
+
+class AssetUploadChunkView(UploadMixin, generic.View):
+    """
+    The raw chunk bytes are the request body, streamed to disk without
+    being read into memory.
+    """
+
+    query_budget = 8
+
+    def put(self, request: HttpRequest, pk, index: int, *args, **kwargs):
+        upload = self.get_upload(request, pk)
+        try:
+            length = int(request.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ApiError("Content-Length must be an integer")
+
+        created = write_chunk(upload, index, request, length)
+        upload.refresh_from_db(fields=["received_bytes"])
+
+        return JsonResponse(
+            {"index": index, "received_bytes": upload.received_bytes},
+            status=201 if created else 200,
+        )
+
+
+class AssetUploadCompleteView(UploadMixin, generic.View):
+    query_budget = 14
+
+    def post(self, request: HttpRequest, pk, *args, **kwargs):
+        product = complete_upload(pk, request.user.pk)
+        return JsonResponse({"product": product.pk, "asset": product.asset.name})
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DigitalGoodsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "digital_store"
+
+    def ready(self):
+        from digital_store import signals  # noqa: F401
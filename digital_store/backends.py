@@ -0,0 +1,26 @@
+from django.contrib.auth.backends import ModelBackend
+
+from digital_store.services import permissions
+
+
+class CachedPermissionBackend(ModelBackend):
+    """
+    ModelBackend whose resolved permission set is kept in the cache
+    between requests, so checks cost no queries once it is warm.
+    Invalidation is driven by the version stamps in services.permissions.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        if not hasattr(user_obj, "_perm_cache"):
+            user_obj._perm_cache = permissions.get_permissions(
+                user_obj,
+                lambda: {
+                    *self.get_user_permissions(user_obj),
+                    *self.get_group_permissions(user_obj),
+                },
+            )
+
+        return user_obj._perm_cache
@@ -1,5 +1,17 @@
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from digital_store.services.cart import get_cart_summary
 
 
 def cfg_assets_root(request):
     return {'ASSETS_ROOT': settings.ASSETS_ROOT}
+
+
+def cart_summary(request):
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return {}
+
+    # Lazy, so pages that do not show the badge never touch the cache.
+    return {"cart_summary": SimpleLazyObject(lambda: get_cart_summary(user.pk))}
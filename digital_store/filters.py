@@ -2,7 +2,7 @@ import django
 import django_filters
 from django.forms import Select
 
-from .models import Product, Category
+from .models import Order, Product, Category
 
 
 class ProductFilter(django_filters.FilterSet):
@@ -23,7 +23,31 @@ class ProductFilter(django_filters.FilterSet):
         label="Category",
         empty_label="Select a category",
     )
+    ordering = django_filters.OrderingFilter(
+        fields=(
+            ("created_at", "created_at"),
+            ("price", "price"),
+        ),
+        field_labels={
+            "created_at": "Date added",
+            "price": "Price",
+        },
+        label="Sort by",
+        empty_label="Newest first",
+    )
 
     class Meta:
         model = Product
-        fields = ("price_min", "price_max", "category")
+        fields = ("price_min", "price_max", "category", "ordering")
+
+
+class OrderFilter(django_filters.FilterSet):
+    status = django_filters.ChoiceFilter(
+        choices=Order.StatusChoice.choices,
+        label="Status",
+        empty_label="All orders",
+    )
+
+    class Meta:
+        model = Order
+        fields = ("status",)
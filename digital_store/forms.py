@@ -11,7 +11,7 @@ class ProductCreateForm(forms.ModelForm):
 
     class Meta:
         model = Product
-        fields = ("name", "description", "price", "category", "image")
+        fields = ("name", "description", "price", "category", "image", "asset")
 
 
 class ProductCategorySearchForm(forms.Form):
@@ -19,5 +19,11 @@ class ProductCategorySearchForm(forms.Form):
         max_length=255,
         required=False,
         label="",
-        widget=forms.TextInput(attrs={"placeholder": "Search by name"})
+        widget=forms.TextInput(
+            attrs={
+                "placeholder": "Search by name",
+                "autocomplete": "off",
+                "list": "search-suggestions",
+            }
+        )
     )
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from digital_store.services.uploads import cleanup_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Remove asset uploads that were abandoned before completion"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=float,
+            default=24,
+            help="Hours without a new chunk after which an upload is abandoned",
+        )
+
+    def handle(self, *args, **options):
+        removed = cleanup_stale_uploads(timedelta(hours=options["older_than"]))
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} abandoned uploads"))
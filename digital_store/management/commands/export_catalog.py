@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from digital_store.services.catalog_export import (
+    DEFAULT_CHUNK_SIZE,
+    FORMATS,
+    export_catalog,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream the product catalog as CSV or JSONL"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument(
+            "--output",
+            help="File to write to, standard output by default",
+        )
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        lines = export_catalog(options["format"], chunk_size=options["chunk_size"])
+
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        with open(options["output"], "w", encoding="utf-8", newline="") as output:
+            output.writelines(lines)
+
+        self.stderr.write(self.style.SUCCESS(f"Catalog exported to {options['output']}"))
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from digital_store.services.import_products import import_products
+
+
+class Command(BaseCommand):
+    help = "Bulk import products for a seller from a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument("--seller", required=True, help="Seller username")
+        parser.add_argument("--format", choices=("csv", "jsonl"))
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Validation processes, 0 validates in this process",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue after the last committed batch of a failed run",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        User = get_user_model()
+        try:
+            seller = User.objects.get(
+                username=options["seller"],
+                role=User.UserRole.SELLER,
+            )
+        except User.DoesNotExist:
+            raise CommandError(f"Seller not found: {options['seller']}")
+
+        file_format = options["format"] or ("jsonl" if path.suffix == ".jsonl" else "csv")
+
+        def progress(report):
+            self.stdout.write(
+                f"line {report.last_line}: {report.created} created, "
+                f"{report.skipped} skipped, {len(report.errors)} errors "
+                f"({report.rows_per_second:,.0f} rows/s)"
+            )
+
+        report = import_products(
+            path,
+            seller,
+            file_format=file_format,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            resume=options["resume"],
+            on_batch=progress,
+        )
+
+        for line, error in report.errors[:50]:
+            self.stderr.write(f"line {line}: {error}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.created} products from {report.read} rows "
+                f"({report.rows_per_second:,.0f} rows/s)"
+            )
+        )
@@ -1,14 +1,63 @@
 from django.core.management.base import BaseCommand
 
+from digital_store.services import cache_versions
 from digital_store.services.add_category import add_category, CATEGORIES
+from digital_store.services.add_orders import add_carts, add_orders
 from digital_store.services.add_products import add_products
 from digital_store.services.add_users import add_users
+from digital_store.services.store_stats import reconcile
 
 
 class Command(BaseCommand):
-    help = "Populate the database with categories"
+    help = "Populate the database with categories, users, products, carts and orders"
 
-    def handle(self, *args, **kwargs):
-        add_category(CATEGORIES)
-        add_users()
-        add_products()
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=len(CATEGORIES))
+        parser.add_argument("--users", type=int, default=38, help="Number of customers")
+        parser.add_argument("--sellers", type=int, default=13)
+        parser.add_argument("--products", type=int, default=37)
+        parser.add_argument("--carts", type=int, default=0)
+        parser.add_argument("--items-per-cart", type=int, default=3)
+        parser.add_argument("--orders", type=int, default=0)
+        parser.add_argument("--items-per-order", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--password",
+            default=None,
+            help="Password for every generated user, unusable if omitted",
+        )
+
+    def handle(self, *args, **options):
+        seed = options["seed"]
+        chunk_size = options["chunk_size"]
+
+        add_category(CATEGORIES, count=options["categories"])
+        add_users(
+            customers=options["users"],
+            sellers=options["sellers"],
+            seed=seed,
+            chunk_size=chunk_size,
+            password=options["password"],
+        )
+        add_products(options["products"], seed=seed, chunk_size=chunk_size)
+
+        if options["carts"]:
+            add_carts(
+                options["carts"],
+                items_per_cart=options["items_per_cart"],
+                seed=seed,
+                chunk_size=chunk_size,
+            )
+        if options["orders"]:
+            add_orders(
+                options["orders"],
+                items_per_order=options["items_per_order"],
+                seed=seed,
+                chunk_size=chunk_size,
+            )
+
+        # bulk_create skips the signals that keep the counters and
+        # the catalog version stamps current
+        reconcile()
+        cache_versions.bump_version(cache_versions.CATALOG, cache_versions.CATEGORY)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from digital_store.services import store_stats
+
+
+class Command(BaseCommand):
+    help = "Recount store statistics and correct counter drift"
+
+    def handle(self, *args, **kwargs):
+        drift = store_stats.reconcile()
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Store statistics are up to date"))
+            return
+
+        for name, (stored, actual) in drift.items():
+            self.stdout.write(f"{name}: {stored} -> {actual}")
+
+        self.stdout.write(self.style.SUCCESS("Store statistics reconciled"))
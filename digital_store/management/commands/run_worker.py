@@ -0,0 +1,131 @@
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from digital_store.services import jobs
+
+
+logger = logging.getLogger("digital_store.jobs")
+MAX_ERROR_BACKOFF_SECONDS = 60
+
+
+class Command(BaseCommand):
+    help = "Run background job workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--kind",
+            action="append",
+            dest="kinds",
+            help="Only run jobs of this kind; may be repeated",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=600,
+            help="Seconds after which a running job is considered abandoned",
+        )
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=10,
+            help="Consecutive errors after which a worker gives up",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        requeued = jobs.requeue_stale(timedelta(seconds=options["stale_after"]))
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} abandoned jobs")
+
+        stop = threading.Event()
+        totals = {"done": 0, "failed": 0, "crashed": 0}
+        lock = threading.Lock()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+        def work(number: int) -> None:
+            worker = f"{prefix}:{number}"
+            errors = 0
+            while not stop.is_set():
+                # An error here is usually the database being unavailable
+                # or locked; back off and retry rather than let the worker
+                # die. Jobs left running are picked up by requeue_stale.
+                try:
+                    close_old_connections()
+                    claimed = jobs.claim(worker, options["batch_size"], options["kinds"])
+                    if claimed:
+                        done, failed = jobs.run_jobs(claimed)
+                except Exception:
+                    errors += 1
+                    logger.exception("Worker %s failed (%d in a row)", worker, errors)
+                    if errors >= options["max_errors"]:
+                        raise
+                    delay = options["poll_interval"] * 2 ** errors
+                    stop.wait(min(delay, MAX_ERROR_BACKOFF_SECONDS))
+                    continue
+
+                errors = 0
+                if not claimed:
+                    if options["once"]:
+                        return
+                    stop.wait(options["poll_interval"])
+                    continue
+
+                with lock:
+                    totals["done"] += done
+                    totals["failed"] += failed
+
+        def work_in_thread(number: int) -> None:
+            try:
+                work(number)
+            except Exception:
+                with lock:
+                    totals["crashed"] += 1
+            finally:
+                connections.close_all()
+
+        threads = []
+        try:
+            if options["threads"] == 1:
+                try:
+                    work(0)
+                except Exception:
+                    totals["crashed"] += 1
+            else:
+                for number in range(options["threads"]):
+                    thread = threading.Thread(
+                        target=work_in_thread, args=(number,), name=f"worker-{number}"
+                    )
+                    thread.start()
+                    threads.append(thread)
+                while any(thread.is_alive() for thread in threads):
+                    for thread in threads:
+                        thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping after the current batch...")
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        summary = f"Jobs done: {totals['done']}, failed: {totals['failed']}"
+        if totals["crashed"]:
+            raise CommandError(f"{summary}; {totals['crashed']} workers crashed")
+
+        self.stdout.write(self.style.SUCCESS(summary))
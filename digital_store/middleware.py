@@ -0,0 +1,76 @@
+import logging
+
+from django.conf import settings
+from django.http import HttpRequest
+
+from digital_store.services.query_budget import QueryBudgetExceeded, QueryRecorder, analyze
+
+
+logger = logging.getLogger("digital_store.query_budget")
+
+
+def query_budget(budget: int):
+    """Declare a query budget on a function-based view."""
+
+    def decorator(view):
+        view.query_budget = budget
+        return view
+
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """
+    Records the queries of every request and checks them against the
+    view's ``query_budget`` and for repeated statements (N+1).
+
+    Findings are logged, or raised as QueryBudgetExceeded when
+    QUERY_BUDGET_RAISE is set, as it is under the test runner.
+    Streaming responses are only checked up to the first chunk.
+
+    Origins are traced for every query only with QUERY_BUDGET_TRACE,
+    which defaults to DEBUG; otherwise just for the suspect ones.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        if not getattr(settings, "QUERY_BUDGET_ENABLED", True):
+            return self.get_response(request)
+
+        repeat_threshold = getattr(settings, "QUERY_BUDGET_REPEAT_THRESHOLD", 5)
+        recorder = QueryRecorder(
+            trace=getattr(settings, "QUERY_BUDGET_TRACE", settings.DEBUG),
+            repeat_threshold=repeat_threshold,
+        )
+        request._query_recorder = recorder
+
+        with recorder:
+            response = self.get_response(request)
+
+        findings = analyze(
+            recorder.records,
+            budget=getattr(request, "query_budget", None),
+            repeat_threshold=repeat_threshold,
+        )
+        if not findings:
+            return response
+
+        view = getattr(request.resolver_match, "view_name", request.path)
+        report = "; ".join(str(finding) for finding in findings)
+
+        if getattr(settings, "QUERY_BUDGET_RAISE", False):
+            raise QueryBudgetExceeded(f"{view}: {report}")
+
+        logger.warning("%s: %s", view, report)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs) -> None:
+        view = getattr(view_func, "view_class", view_func)
+        budget = getattr(view, "query_budget", None)
+        if budget is not None:
+            request.query_budget = budget
+            recorder = getattr(request, "_query_recorder", None)
+            if recorder is not None:
+                recorder.budget = budget
@@ -0,0 +1,73 @@
+from django.db import migrations
+
+
+# The SQL is spelled out here rather than imported from
+# digital_store.services.search, so this migration keeps building the
+# index it always built whatever that module turns into later.
+
+POSTGRES_INSTALL = [
+    "ALTER TABLE digital_store_product ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS product_search_vector_idx "
+    "ON digital_store_product USING gin (search_vector)",
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS product_search_vector_idx",
+    "ALTER TABLE digital_store_product DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS digital_store_product_fts USING fts5("
+    "name, description, content='digital_store_product', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS digital_store_product_fts_ai "
+    "AFTER INSERT ON digital_store_product BEGIN "
+    "INSERT INTO digital_store_product_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, coalesce(new.description, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS digital_store_product_fts_ad "
+    "AFTER DELETE ON digital_store_product BEGIN "
+    "INSERT INTO digital_store_product_fts(digital_store_product_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, coalesce(old.description, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS digital_store_product_fts_au "
+    "AFTER UPDATE OF name, description ON digital_store_product BEGIN "
+    "INSERT INTO digital_store_product_fts(digital_store_product_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, coalesce(old.description, '')); "
+    "INSERT INTO digital_store_product_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, coalesce(new.description, '')); END",
+    "INSERT INTO digital_store_product_fts(digital_store_product_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS digital_store_product_fts_ai",
+    "DROP TRIGGER IF EXISTS digital_store_product_fts_ad",
+    "DROP TRIGGER IF EXISTS digital_store_product_fts_au",
+    "DROP TABLE IF EXISTS digital_store_product_fts",
+]
+
+INSTALL = {"postgresql": POSTGRES_INSTALL, "sqlite": SQLITE_INSTALL}
+UNINSTALL = {"postgresql": POSTGRES_UNINSTALL, "sqlite": SQLITE_UNINSTALL}
+
+
+def install_search_index(apps, schema_editor):
+    for statement in INSTALL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def uninstall_search_index(apps, schema_editor):
+    for statement in UNINSTALL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("digital_store", "0004_product_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.3 on 2026-10-18 10:36
+
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    Product = apps.get_model("digital_store", "Product")
+    StoreCounter = apps.get_model("digital_store", "StoreCounter")
+
+    StoreCounter.objects.bulk_create(
+        [
+            StoreCounter(name="users", value=User.objects.count()),
+            StoreCounter(name="sellers", value=User.objects.filter(role="SL").count()),
+            StoreCounter(name="products", value=Product.objects.count()),
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("digital_store", "0005_product_search_index"),
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoreCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.3 on 2026-10-18 10:54
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+BATCH_SIZE = 5000
+
+
+def backfill_order_totals(apps, schema_editor):
+    Order = apps.get_model("digital_store", "Order")
+    OrderProduct = apps.get_model("digital_store", "OrderProduct")
+    money = models.DecimalField(max_digits=12, decimal_places=2)
+
+    lines = OrderProduct.objects.filter(order=OuterRef("pk")).order_by().values("order")
+    item_count = lines.annotate(value=Count("id")).values("value")
+    total = lines.annotate(
+        value=Sum(F("quantity") * F("product__price"), output_field=money)
+    ).values("value")
+
+    last = Order.objects.aggregate(last=Max("pk"))["last"] or 0
+    for start in range(0, last, BATCH_SIZE):
+        Order.objects.filter(pk__gt=start, pk__lte=start + BATCH_SIZE).update(
+            item_count=Coalesce(Subquery(item_count), 0),
+            total=Coalesce(Subquery(total), Value(Decimal("0.00")), output_field=money),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("digital_store", "0007_product_sku"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="item_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="total",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["customer", "-order_date", "-id"],
+                name="order_customer_date_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_order_totals, migrations.RunPython.noop),
+    ]
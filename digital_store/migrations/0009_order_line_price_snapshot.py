@@ -0,0 +1,74 @@
+# Generated by Django 5.1.3 on 2026-10-18 11:20
+
+import django.db.models.deletion
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+BATCH_SIZE = 5000
+
+
+def snapshot_line_prices(apps, schema_editor):
+    OrderProduct = apps.get_model("digital_store", "OrderProduct")
+    Product = apps.get_model("digital_store", "Product")
+    product = Product.objects.filter(pk=OuterRef("product_id"))
+
+    last = OrderProduct.objects.aggregate(last=Max("pk"))["last"] or 0
+    for start in range(0, last, BATCH_SIZE):
+        OrderProduct.objects.filter(
+            pk__gt=start, pk__lte=start + BATCH_SIZE, unit_price__isnull=True
+        ).update(
+            unit_price=Subquery(product.values("price")),
+            seller_id=Subquery(product.values("seller_id")),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("digital_store", "0008_order_totals"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="orderproduct",
+            name="unit_price",
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name="orderproduct",
+            name="seller",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="sold_items",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunPython(snapshot_line_prices, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="orderproduct",
+            name="unit_price",
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name="orderproduct",
+            name="line_total",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("quantity"), "*", models.F("unit_price")
+                ),
+                output_field=models.DecimalField(decimal_places=2, max_digits=12),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["status", "order_date"], name="order_status_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.3 on 2026-10-18 11:40
+
+from django.contrib.auth.management import create_permissions
+from django.db import migrations
+
+
+SELLER_GROUP = "Seller"
+SELLER_CODENAMES = [
+    "can_add_category",
+    "can_edit_category",
+    "can_delete_category",
+    "can_add_product",
+    "can_edit_product",
+    "can_delete_product",
+]
+
+
+def create_seller_group(apps, schema_editor):
+    # Custom permissions are normally created after migrate has run;
+    # the group needs them now.
+    app_config = apps.get_app_config("digital_store")
+    app_config.models_module = True
+    create_permissions(app_config, verbosity=0, apps=apps)
+    app_config.models_module = None
+
+    Group = apps.get_model("auth", "Group")
+    Permission = apps.get_model("auth", "Permission")
+    User = apps.get_model("accounts", "User")
+    Membership = User.groups.through
+
+    group, _ = Group.objects.get_or_create(name=SELLER_GROUP)
+    group.permissions.set(
+        Permission.objects.filter(
+            content_type__app_label="digital_store", codename__in=SELLER_CODENAMES
+        )
+    )
+
+    sellers = User.objects.filter(role="SL", is_active=True).values_list("pk", flat=True)
+    Membership.objects.bulk_create(
+        [Membership(user_id=pk, group_id=group.pk) for pk in sellers.iterator()],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def delete_seller_group(apps, schema_editor):
+    apps.get_model("auth", "Group").objects.filter(name=SELLER_GROUP).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("digital_store", "0011_job"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_seller_group, delete_seller_group),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 11:45
+
+import digital_store.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("digital_store", "0012_seller_group"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="asset",
+            field=models.FileField(
+                blank=True,
+                storage=digital_store.storage.PrivateStorage(),
+                upload_to="assets/%Y/%m/",
+            ),
+        ),
+    ]
@@ -0,0 +1,147 @@
+import hashlib
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from digital_store.pagination import KeysetPaginator
+from digital_store.services import cache_versions
+
+
+def is_anonymous_request(request: HttpRequest) -> bool:
+    # No session cookie means no login, and no messages cookie means no
+    # flashed messages under cookie or fallback storage. The check
+    # itself does not touch the session store.
+    return (
+        settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def request_signature(request: HttpRequest, versions: dict[str, int]) -> str:
+    query = sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        for value in values
+    )
+    return hashlib.md5(
+        repr((request.path, query, sorted(versions.items()))).encode()
+    ).hexdigest()
+
+
+def page_cache_key(request: HttpRequest, tags: tuple[str, ...]) -> str:
+    signature = request_signature(request, cache_versions.get_versions(*tags))
+    return f"page:{request.method}:{signature}"
+
+
+class AnonymousPageCacheMixin:
+    """
+    Cache whole responses for anonymous GET requests. Entries are keyed
+    on the version stamps listed in ``page_cache_tags``, so bumping a
+    stamp invalidates every page tagged with it.
+    """
+
+    page_cache_tags = (cache_versions.CATALOG,)
+    page_cache_timeout = 300
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or not is_anonymous_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = page_cache_key(request, self.page_cache_tags)
+        response = cache.get(key)
+        if response is not None:
+            return get_conditional_response(
+                request,
+                etag=response.get("ETag"),
+                last_modified=parse_http_date_safe(response.get("Last-Modified", "")),
+                response=response,
+            )
+
+        response = super().dispatch(request, *args, **kwargs)
+
+        if hasattr(response, "add_post_render_callback") and not response.is_rendered:
+            response.add_post_render_callback(
+                lambda rendered: self.store_page(request, rendered, key)
+            )
+        else:
+            self.store_page(request, response, key)
+
+        return response
+
+    def store_page(self, request, response, key: str) -> None:
+        if response.status_code != 200 or response.streaming or response.cookies:
+            return
+
+        # A page that embeds a CSRF token is specific to one visitor.
+        if request.META.get("CSRF_COOKIE_NEEDS_UPDATE"):
+            return
+
+        storage = getattr(request, "_messages", None)
+        if storage is not None and len(storage):
+            return
+
+        cache.set(key, response, self.page_cache_timeout)
+
+
+class ConditionalGetMixin:
+    """
+    Answer anonymous revalidations with 304 before the queryset and the
+    template are evaluated. By default validators come from the version
+    stamps in ``conditional_tags``, which cost a cache lookup only.
+    """
+
+    conditional_tags = (cache_versions.CATALOG,)
+
+    def get_validators(self, request) -> tuple[str | None, datetime | None]:
+        versions = cache_versions.get_versions(*self.conditional_tags)
+        last_modified = datetime.fromtimestamp(
+            max(versions.values()) / 1e9, tz=timezone.utc
+        )
+        return f'W/"{request_signature(request, versions)}"', last_modified
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or not is_anonymous_request(request):
+            response = super().dispatch(request, *args, **kwargs)
+            patch_vary_headers(response, ("Cookie",))
+            return response
+
+        etag, last_modified = self.get_validators(request)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            if etag and not response.has_header("ETag"):
+                response["ETag"] = quote_etag(etag)
+            if timestamp and not response.has_header("Last-Modified"):
+                response["Last-Modified"] = http_date(timestamp)
+        patch_vary_headers(response, ("Cookie",))
+
+        return response
+
+
+class KeysetPaginationMixin:
+    """
+    Paginate a ListView with KeysetPaginator. The queryset's own ordering
+    is used when it has one, ``get_default_ordering`` otherwise.
+    """
+
+    cursor_kwarg = "cursor"
+    default_ordering = ("-created_at",)
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = queryset.query.order_by or self.get_default_ordering(queryset)
+        paginator = KeysetPaginator(queryset, page_size, ordering=ordering)
+        page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_default_ordering(self, queryset) -> tuple[str, ...]:
+        return self.default_ordering
@@ -1,7 +1,12 @@
+import uuid
+
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from digital_store.storage import private_storage
+
 
 class Product(models.Model):
     name = models.CharField(max_length=255)
@@ -17,10 +22,28 @@ class Product(models.Model):
         related_name="seller_products",
     )
     image = models.ImageField(upload_to="products/", blank=True)
+    asset = models.FileField(upload_to="assets/%Y/%m/", storage=private_storage, blank=True)
+    sku = models.CharField(max_length=64, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="product_created_at_id_idx",
+            ),
+            models.Index(
+                fields=["price", "id"],
+                name="product_price_id_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["seller", "sku"],
+                name="unique_seller_sku",
+            ),
+        ]
         permissions = [
             ("can_add_product", "Can add product"),
             ("can_edit_product", "Can edit product"),
@@ -73,6 +96,31 @@ class Order(models.Model):
         related_name="orders",
         default=1,
     )
+    # Kept in step with the order lines (see services/orders.py), so that
+    # order history never has to aggregate them.
+    item_count = models.PositiveIntegerField(default=0)
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Sent by the client with a checkout, so a retried submit finds the
+    # order it already created instead of placing another one.
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["customer", "idempotency_key"],
+                name="unique_order_idempotency_key",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["customer", "-order_date", "-id"],
+                name="order_customer_date_idx",
+            ),
+            models.Index(
+                fields=["status", "order_date"],
+                name="order_status_date_idx",
+            ),
+        ]
 
 
 class Cart(models.Model):
@@ -102,10 +150,30 @@ class OrderProduct(models.Model):
         related_name="order_items"
     )
     quantity = models.PositiveIntegerField(default=1)
+    # Copied from the product at checkout, so reports neither join the
+    # product table nor change when a seller edits a price.
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    seller = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="sold_items",
+    )
+    line_total = models.GeneratedField(
+        expression=models.F("quantity") * models.F("unit_price"),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+    )
 
     class Meta:
         unique_together = ("product", "order")
 
+    def save(self, *args, **kwargs) -> None:
+        if self.unit_price is None:
+            self.unit_price = self.product.price
+            self.seller_id = self.product.seller_id
+        super().save(*args, **kwargs)
+
 
 class CartProduct(models.Model):
     cart = models.ForeignKey(
@@ -121,3 +189,111 @@ class CartProduct(models.Model):
 
     class Meta:
         unique_together = ("product", "cart")
+
+
+class StoreCounter(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.value}"
+
+
+class Job(models.Model):
+    class StatusChoice(models.TextChoices):
+        QUEUED = "QU", _("Queued")
+        RUNNING = "RU", _("Running")
+        DONE = "DO", _("Done")
+        FAILED = "FA", _("Failed")
+
+    kind = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=2,
+        choices=StatusChoice,
+        default=StatusChoice.QUEUED,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, null=True, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "run_after", "id"],
+                name="job_claim_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Job {self.kind} #{self.pk} ({self.get_status_display()})"
+
+
+class AssetUpload(models.Model):
+    class StatusChoice(models.TextChoices):
+        UPLOADING = "UP", _("Uploading")
+        COMPLETE = "CO", _("Complete")
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    product = models.ForeignKey(
+        to=Product,
+        on_delete=models.CASCADE,
+        related_name="asset_uploads",
+    )
+    seller = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="asset_uploads",
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    received_bytes = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(
+        max_length=2,
+        choices=StatusChoice,
+        default=StatusChoice.UPLOADING
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "updated_at"],
+                name="asset_upload_stale_idx",
+            ),
+        ]
+
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.size // self.chunk_size)
+
+    @property
+    def part_name(self) -> str:
+        return f"uploads/{self.pk}.part"
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.received_bytes}/{self.size} bytes)"
+
+
+class AssetUploadChunk(models.Model):
+    upload = models.ForeignKey(
+        to=AssetUpload,
+        on_delete=models.CASCADE,
+        related_name="chunks",
+    )
+    index = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["upload", "index"],
+                name="unique_asset_upload_chunk",
+            ),
+        ]
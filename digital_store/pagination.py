@@ -0,0 +1,169 @@
+from django.core import signing
+from django.db.models import Q, QuerySet
+
+
+CURSOR_SALT = "digital_store.pagination.cursor"
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    is_keyset = True
+
+    def __init__(
+            self,
+            object_list: list,
+            ordering: tuple[str, ...],
+            has_next: bool,
+            has_previous: bool,
+    ) -> None:
+        self.object_list = object_list
+        self.ordering = ordering
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self) -> str | None:
+        if not self._has_next:
+            return None
+        return encode_cursor(self.ordering, self.object_list[-1], reverse=False)
+
+    @property
+    def previous_cursor(self) -> str | None:
+        if not self._has_previous:
+            return None
+        return encode_cursor(self.ordering, self.object_list[0], reverse=True)
+
+
+class KeysetPaginator:
+    """
+    Seek pagination over a stable ordering, so no page ever needs
+    a COUNT(*) or an OFFSET scan. The primary key is always appended
+    as a tie-breaker to keep the ordering total.
+    """
+
+    def __init__(
+            self,
+            queryset: QuerySet,
+            per_page: int,
+            ordering: tuple[str, ...] | list[str] = ("-created_at",),
+    ) -> None:
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = _with_tie_breaker(tuple(ordering))
+
+    def get_page(self, cursor: str | None) -> KeysetPage:
+        position, reverse = None, False
+
+        if cursor:
+            try:
+                position, reverse = decode_cursor(cursor, self.ordering)
+            except InvalidCursor:
+                position, reverse = None, False
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = self.queryset.order_by(*ordering)
+
+        if position is not None:
+            queryset = queryset.filter(_seek_filter(ordering, position))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if reverse:
+            rows.reverse()
+            return KeysetPage(rows, self.ordering, has_next=True, has_previous=has_more)
+
+        return KeysetPage(
+            rows,
+            self.ordering,
+            has_next=has_more,
+            has_previous=position is not None,
+        )
+
+
+def encode_cursor(ordering: tuple[str, ...], row, reverse: bool) -> str:
+    values = [_stringify(_get_value(row, field.lstrip("-"))) for field in ordering]
+    return signing.dumps(
+        {"o": list(ordering), "v": values, "r": reverse},
+        salt=CURSOR_SALT,
+        compress=True,
+    )
+
+
+def decode_cursor(cursor: str, ordering: tuple[str, ...]) -> tuple[list, bool]:
+    try:
+        payload = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise InvalidCursor("Cursor signature is invalid")
+
+    if payload.get("o") != list(ordering) or len(payload.get("v", [])) != len(ordering):
+        raise InvalidCursor("Cursor does not match the current ordering")
+
+    return payload["v"], bool(payload.get("r"))
+
+
+def _with_tie_breaker(ordering: tuple[str, ...]) -> tuple[str, ...]:
+    fields = [field.lstrip("-") for field in ordering]
+    if "pk" in fields or "id" in fields:
+        return ordering
+
+    descending = bool(ordering) and ordering[-1].startswith("-")
+    return ordering + ("-id" if descending else "id",)
+
+
+def _reverse_ordering(ordering: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple(
+        field[1:] if field.startswith("-") else f"-{field}"
+        for field in ordering
+    )
+
+
+def _seek_filter(ordering: tuple[str, ...], values: list) -> Q:
+    """
+    Expand the row-value comparison (a, b, c) > (x, y, z) into
+    a OR-chain that works on every backend:
+    a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z).
+    """
+    condition = Q()
+    equal = {}
+
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+
+    return condition
+
+
+def _get_value(row, field: str):
+    if isinstance(row, dict):
+        return row[field]
+    return getattr(row, field)
+
+
+def _stringify(value):
+    if isinstance(value, (int, float, str)) or value is None:
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
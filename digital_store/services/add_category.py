@@ -41,8 +41,29 @@ CATEGORIES = [
 ]
 
 
-def add_category(categories: list[dict]) -> None:
-    category_objects = [Category(**category) for category in categories]
-    Category.objects.bulk_create(category_objects)
+def add_category(categories: list[dict], count: int | None = None) -> None:
+    """
+    Add the given categories, topped up with generated ones when
+    ``count`` asks for more than the list holds.
+    """
+    categories = list(categories[:count] if count is not None else categories)
+    existing = set(Category.objects.values_list("name", flat=True))
+    number = len(existing)
+
+    while count is not None and len(categories) < count:
+        number += 1
+        categories.append(
+            {
+                "name": f"Category {number}",
+                "description": f"Generated category #{number}",
+            }
+        )
+
+    category_objects = [
+        Category(**category)
+        for category in categories
+        if category["name"] not in existing
+    ]
+    Category.objects.bulk_create(category_objects, ignore_conflicts=True)
 
     print("Categories added successfully")
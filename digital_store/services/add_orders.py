@@ -0,0 +1,119 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from digital_store.models import Cart, CartProduct, Order, OrderProduct, Product
+from digital_store.services.bulk_write import bulk_write
+from digital_store.services.orders import refresh_order_totals, snapshot_line_prices
+
+
+def _sample_products(rng: random.Random, product_ids: range, count: int) -> list[int]:
+    # Sampling without replacement keeps (product, order) and
+    # (product, cart) pairs unique, as the tables require.
+    return rng.sample(product_ids, min(count, len(product_ids)))
+
+
+def _id_range(model) -> range:
+    # Generated tables have no gaps, and a range samples without
+    # materialising millions of ids.
+    ids = model.objects.aggregate(first=Min("id"), last=Max("id"))
+    if ids["first"] is None:
+        return range(0)
+    return range(ids["first"], ids["last"] + 1)
+
+
+def add_carts(
+        count: int,
+        items_per_cart: int = 3,
+        seed: int | None = None,
+        chunk_size: int = 5000,
+) -> tuple[int, int] | None:
+    rng = random.Random(seed)
+    product_ids = _id_range(Product)
+    customer_ids = list(
+        get_user_model().objects
+        .filter(role="CS", cart__isnull=True)
+        .values_list("id", flat=True)[:count]
+    )
+
+    if not customer_ids or not product_ids:
+        print("No customers or products to fill carts with")
+        return None
+
+    ids = bulk_write(Cart, ("customer_id",), ((pk,) for pk in customer_ids), chunk_size)
+
+    bulk_write(
+        CartProduct,
+        ("cart_id", "product_id", "quantity"),
+        (
+            (cart_id, product_id, rng.randint(1, 3))
+            for cart_id in range(ids[0], ids[1] + 1)
+            for product_id in _sample_products(rng, product_ids, items_per_cart)
+        ),
+        chunk_size,
+    )
+
+    print("Carts added successfully")
+
+    return ids
+
+
+def add_orders(
+        count: int,
+        items_per_order: int = 3,
+        seed: int | None = None,
+        chunk_size: int = 5000,
+) -> tuple[int, int] | None:
+    rng = random.Random(seed)
+    product_ids = _id_range(Product)
+    customer_ids = list(
+        get_user_model().objects.filter(role="CS").values_list("id", flat=True)
+    )
+
+    if not customer_ids or not product_ids:
+        print("No customers or products to place orders with")
+        return None
+
+    statuses = Order.StatusChoice.values
+    now = timezone.now()
+
+    # Totals start at zero and are refreshed once the lines are written.
+    ids = bulk_write(
+        Order,
+        ("customer_id", "status", "order_date", "item_count", "total"),
+        (
+            (
+                rng.choice(customer_ids),
+                rng.choice(statuses),
+                now,
+                0,
+                0,
+            )
+            for _ in range(count)
+        ),
+        chunk_size,
+    )
+
+    # Prices are unknown without loading every product, so lines start
+    # at zero and take their snapshot from the product table afterwards.
+    bulk_write(
+        OrderProduct,
+        ("order_id", "product_id", "quantity", "unit_price"),
+        (
+            (order_id, product_id, rng.randint(1, 3), 0)
+            for order_id in range(ids[0], ids[1] + 1)
+            for product_id in _sample_products(rng, product_ids, items_per_order)
+        ),
+        chunk_size,
+    )
+    snapshot_line_prices(
+        OrderProduct.objects.filter(order__gte=ids[0], order__lte=ids[1]),
+        chunk_size,
+    )
+    refresh_order_totals(Order.objects.filter(pk__range=ids))
+
+    print("Orders added successfully")
+
+    return ids
@@ -1,31 +1,63 @@
 import random
 
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 from digital_store.models import Category, Product
-
-
-def add_products() -> None:
-    categories = list(Category.objects.all())
-    sellers = list(get_user_model().objects.filter(role="SL"))
-
-    product_objects = [
-        Product(
-            name=f"product_{i + 1}",
-            description=f"Description of product #{i + 1}",
-            price=round(random.uniform(100.00, 999.99), 2),
-            seller=random.choice(sellers),
+from digital_store.services.bulk_write import bulk_write
+
+
+PRODUCT_FIELDS = (
+    "name",
+    "description",
+    "price",
+    "seller_id",
+    "image",
+    "asset",
+    "created_at",
+    "updated_at",
+)
+
+
+def add_products(
+        count: int = 37,
+        seed: int | None = None,
+        chunk_size: int = 5000,
+) -> tuple[int, int] | None:
+    rng = random.Random(seed)
+    category_ids = list(Category.objects.values_list("id", flat=True))
+    seller_ids = list(
+        get_user_model().objects.filter(role="SL").values_list("id", flat=True)
+    )
+    now = timezone.now()
+
+    if not seller_ids:
+        print("No sellers to assign products to")
+        return None
+
+    def rows():
+        for i in range(count):
+            yield (
+                f"product_{i + 1}",
+                f"Description of product #{i + 1}",
+                round(rng.uniform(100.00, 999.99), 2),
+                rng.choice(seller_ids),
+                "",
+                "",
+                now,
+                now,
+            )
+
+    ids = bulk_write(Product, PRODUCT_FIELDS, rows(), chunk_size=chunk_size)
+
+    if ids and category_ids:
+        bulk_write(
+            Product.category.through,
+            ("product_id", "category_id"),
+            ((pk, rng.choice(category_ids)) for pk in range(ids[0], ids[1] + 1)),
+            chunk_size=chunk_size,
         )
-        for i in range(37)
-    ]
-
-    products = Product.objects.bulk_create(product_objects)
-
-    product_categories = [
-        product.category.through(product_id=product.id, category_id=random.choice(categories).id)
-        for product in products
-    ]
-
-    Product.category.through.objects.bulk_create(product_categories)
 
     print("Products created successfully")
+
+    return ids
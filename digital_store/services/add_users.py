@@ -1,27 +1,80 @@
 import random
 
+from django.contrib.auth.hashers import make_password
+from django.db.models import Max
+from django.utils import timezone
 from faker import Faker
 
 from accounts.models import User
+from digital_store.services.bulk_write import bulk_write
+from digital_store.services.permissions import seller_group_id
 
 
-fake = Faker()
-
-def add_users():
-    roles = ["SL"] * 1 + ["CS"] * 3
-    user_objects = [
-        User(
-            username=fake.user_name(),
-            password=fake.password(),
-            first_name=fake.first_name(),
-            last_name=fake.last_name(),
-            email=fake.email(),
-            is_staff=False,
-            is_active=True,
-            role=random.choice(roles),
+NAME_POOL_SIZE = 500
+USER_FIELDS = (
+    "username",
+    "password",
+    "first_name",
+    "last_name",
+    "email",
+    "is_staff",
+    "is_active",
+    "is_superuser",
+    "role",
+    "date_joined",
+)
+
+
+def add_users(
+        customers: int = 38,
+        sellers: int = 13,
+        seed: int | None = None,
+        chunk_size: int = 5000,
+        password: str | None = None,
+) -> tuple[int, int] | None:
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+
+    # Faker is far too slow to call per row at millions of rows.
+    first_names = [fake.first_name() for _ in range(NAME_POOL_SIZE)]
+    last_names = [fake.last_name() for _ in range(NAME_POOL_SIZE)]
+    hashed_password = make_password(password)
+    prefix = f"{rng.getrandbits(24):06x}"
+    # Keeps usernames unique when the command is re-run with the same seed.
+    offset = User.objects.aggregate(last=Max("id"))["last"] or 0
+    joined = timezone.now()
+
+    def rows():
+        for i in range(customers + sellers):
+            first_name = rng.choice(first_names)
+            last_name = rng.choice(last_names)
+            username = f"{first_name}.{last_name}.{prefix}{offset + i}".lower()
+            yield (
+                username,
+                hashed_password,
+                first_name,
+                last_name,
+                f"{username}@example.com",
+                False,
+                True,
+                False,
+                User.UserRole.SELLER if i < sellers else User.UserRole.CUSTOMER,
+                joined,
+            )
+
+    ids = bulk_write(User, USER_FIELDS, rows(), chunk_size=chunk_size)
+
+    if ids and sellers:
+        # Sellers are written first, so their ids are the start of the range.
+        group_id = seller_group_id()
+        bulk_write(
+            User.groups.through,
+            ("user_id", "group_id"),
+            ((user_id, group_id) for user_id in range(ids[0], ids[0] + sellers)),
+            chunk_size=chunk_size,
         )
-        for _ in range(51)
-    ]
-    User.objects.bulk_create(user_objects)
 
     print("Users added successfully")
+
+    return ids
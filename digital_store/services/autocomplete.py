@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from digital_store.models import Category, Product
+from digital_store.services.prefix_index import PrefixIndex, Suggestion
+
+
+logger = logging.getLogger("digital_store.autocomplete")
+
+PRODUCT = "product"
+CATEGORY = "category"
+
+_index: PrefixIndex | None = None
+_built_at = 0.0
+# Guards the swap of _index and the log of writes made during a rebuild.
+_state_lock = threading.Lock()
+_build_lock = threading.Lock()
+_rebuilding = False
+_pending: list[tuple] | None = None
+
+
+def _rebuild_interval() -> float:
+    # Signals only reach the worker that saved the object, so every worker
+    # also rebuilds from the database now and then to pick up the rest.
+    return getattr(settings, "AUTOCOMPLETE_REBUILD_SECONDS", 600)
+
+
+def _max_overlay() -> int:
+    # Writes cost in proportion to the overlay, so a large one is folded
+    # into a fresh build early.
+    return getattr(settings, "AUTOCOMPLETE_MAX_OVERLAY", 5000)
+
+
+def _load_names():
+    for pk, name in Category.objects.values_list("id", "name").iterator(chunk_size=2000):
+        yield CATEGORY, pk, name
+    for pk, name in Product.objects.values_list("id", "name").iterator(chunk_size=2000):
+        yield PRODUCT, pk, name
+
+
+def _needs_rebuild() -> bool:
+    return (
+        _index is None
+        or time.monotonic() - _built_at >= _rebuild_interval()
+        or _index.overlay_size > _max_overlay()
+    )
+
+
+def _apply(index: PrefixIndex, change: tuple) -> None:
+    if change[0] == "add":
+        index.add(*change[1:])
+    else:
+        index.remove(*change[1:])
+
+
+def rebuild_index() -> PrefixIndex:
+    """
+    Build a fresh index from the database and swap it in. Writes that
+    arrive while the names are loading are replayed onto the new index,
+    so none are lost to the swap.
+    """
+    global _index, _built_at, _pending
+
+    with _state_lock:
+        _pending = []
+    try:
+        index = PrefixIndex.build(_load_names())
+    except BaseException:
+        with _state_lock:
+            _pending = None
+        raise
+
+    with _state_lock:
+        for change in _pending:
+            _apply(index, change)
+        _index, _built_at, _pending = index, time.monotonic(), None
+
+    return index
+
+
+def _rebuild_in_background() -> None:
+    global _built_at, _rebuilding
+
+    try:
+        rebuild_index()
+    except Exception:
+        logger.exception("Rebuilding the autocomplete index failed")
+        if _index is not None:
+            # Keep serving the old index and retry after an interval.
+            _built_at = time.monotonic()
+    finally:
+        connection.close()
+        _rebuilding = False
+
+
+def get_index() -> PrefixIndex:
+    """
+    The current index. Rebuilds run in a background thread while the
+    previous index keeps serving, so no request waits on one; until the
+    first build finishes lookups find nothing. Set
+    AUTOCOMPLETE_BACKGROUND_BUILD to False to build in the request.
+    """
+    global _rebuilding
+
+    if not _needs_rebuild():
+        return _index
+
+    if not getattr(settings, "AUTOCOMPLETE_BACKGROUND_BUILD", True):
+        with _build_lock:
+            if _needs_rebuild():
+                rebuild_index()
+        return _index
+
+    with _state_lock:
+        start = not _rebuilding
+        _rebuilding = True
+    if start:
+        threading.Thread(
+            target=_rebuild_in_background, name="autocomplete-rebuild", daemon=True
+        ).start()
+
+    return _index if _index is not None else PrefixIndex()
+
+
+def reset_index() -> None:
+    global _index, _built_at
+    _index, _built_at = None, 0.0
+
+
+def suggest(query: str, limit: int = 10) -> list[Suggestion]:
+    return get_index().search(query, limit=limit)
+
+
+def _record(change: tuple) -> None:
+    with _state_lock:
+        # Nothing to update until the first lookup has built the index.
+        if _index is not None:
+            _apply(_index, change)
+        if _pending is not None:
+            _pending.append(change)
+
+
+def index_object(kind: str, pk: int, name: str) -> None:
+    _record(("add", kind, pk, name))
+
+
+def unindex_object(kind: str, pk: int) -> None:
+    _record(("remove", kind, pk))
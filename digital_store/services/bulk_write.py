@@ -0,0 +1,64 @@
+import csv
+import io
+from itertools import islice
+from typing import Iterable, Sequence
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+
+def _chunks(rows: Iterable, size: int):
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _copy_chunk(model, fields: Sequence[str], chunk: list[tuple]) -> None:
+    quote = connection.ops.quote_name
+    model_fields = [model._meta.get_field(name) for name in fields]
+    columns = ", ".join(quote(field.column) for field in model_fields)
+    # COPY reads an empty CSV field as NULL; NOT NULL columns take it as
+    # the empty string instead, as blank CharFields and FileFields store.
+    not_null = ", ".join(quote(field.column) for field in model_fields if not field.null)
+    options = f"FORMAT csv, FORCE_NOT_NULL ({not_null})" if not_null else "FORMAT csv"
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(chunk)
+    buffer.seek(0)
+
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN WITH ({options})",
+            buffer,
+        )
+
+
+def bulk_write(
+        model,
+        fields: Sequence[str],
+        rows: Iterable[tuple],
+        chunk_size: int = 5000,
+) -> tuple[int, int] | None:
+    """
+    Insert generated rows chunk by chunk and return the (first, last)
+    primary keys written. Uses COPY on PostgreSQL and bulk_create
+    elsewhere; ids are assumed contiguous, which holds for a single
+    writer filling a table.
+    """
+    use_copy = connection.vendor == "postgresql"
+    written = 0
+
+    for chunk in _chunks(rows, chunk_size):
+        with transaction.atomic():
+            if use_copy:
+                _copy_chunk(model, fields, chunk)
+            else:
+                model.objects.bulk_create(
+                    [model(**dict(zip(fields, row))) for row in chunk]
+                )
+        written += len(chunk)
+
+    if not written:
+        return None
+
+    last = model.objects.aggregate(last=Max("pk"))["last"]
+    return last - written + 1, last
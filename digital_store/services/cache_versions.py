@@ -0,0 +1,51 @@
+import time
+
+from django.core.cache import cache
+
+
+CATALOG = "catalog"
+CATEGORY = "category"
+STORE_STATS = "store_stats"
+
+KEY_PREFIX = "version"
+
+
+def _key(name: str) -> str:
+    return f"{KEY_PREFIX}:{name}"
+
+
+def get_version(name: str) -> int:
+    return get_versions(name)[name]
+
+
+def get_versions(*names: str) -> dict[str, int]:
+    """
+    Version stamps are nanosecond timestamps, so a stamp that was evicted
+    from the cache comes back as a newer value and can never resurrect
+    stale entries keyed on an older one.
+    """
+    found = cache.get_many([_key(name) for name in names])
+    versions = {}
+
+    for name in names:
+        version = found.get(_key(name))
+        if version is None:
+            version = time.time_ns()
+            if not cache.add(_key(name), version, timeout=None):
+                version = cache.get(_key(name), version)
+        versions[name] = version
+
+    return versions
+
+
+def bump_version(*names: str) -> None:
+    now = time.time_ns()
+    current = cache.get_many([_key(name) for name in names])
+
+    cache.set_many(
+        {
+            _key(name): max(now, current.get(_key(name), 0) + 1)
+            for name in names
+        },
+        timeout=None,
+    )
@@ -0,0 +1,149 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from digital_store.models import Cart, CartProduct, Product
+from digital_store.services import cache_versions
+
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+SUMMARY_TIMEOUT = 3600
+
+
+def _cache_key(user_id: int) -> str:
+    # Keyed on the catalog stamp too, so a price edit refreshes every total.
+    version = cache_versions.get_version(cache_versions.CATALOG)
+    return f"cart-summary:{user_id}:{version}"
+
+
+def summarize_cart(user_id: int) -> dict:
+    return CartProduct.objects.filter(cart__customer_id=user_id).aggregate(
+        item_count=Coalesce(Sum("quantity"), 0),
+        total=Coalesce(
+            Sum(ExpressionWrapper(F("quantity") * F("product__price"), output_field=MONEY)),
+            Value(Decimal("0.00")),
+            output_field=MONEY,
+        ),
+    )
+
+
+def get_cart_summary(user_id: int) -> dict:
+    """The number of items in a user's cart and their total price."""
+    key = _cache_key(user_id)
+    summary = cache.get(key)
+
+    if summary is None:
+        summary = summarize_cart(user_id)
+        cache.set(key, summary, SUMMARY_TIMEOUT)
+
+    return summary
+
+
+def invalidate_cart_summary(user_id: int) -> None:
+    transaction.on_commit(lambda: cache.delete(_cache_key(user_id)))
+
+
+def _upsert_sql(increment: bool) -> str:
+    quote = connection.ops.quote_name
+    cart, product, line = (
+        quote(model._meta.db_table) for model in (Cart, Product, CartProduct)
+    )
+    # Without increment the existing line is "updated" to itself rather
+    # than skipped with DO NOTHING, so the row still counts and an
+    # existing line is not mistaken for a missing product.
+    on_conflict = (
+        f"DO UPDATE SET quantity = {line}.quantity + excluded.quantity"
+        if increment
+        else f"DO UPDATE SET quantity = {line}.quantity"
+    )
+    return (
+        f"INSERT INTO {line} (cart_id, product_id, quantity) "
+        f"SELECT {cart}.id, {product}.id, %s FROM {cart}, {product} "
+        f"WHERE {cart}.customer_id = %s AND {product}.id = %s "
+        f"ON CONFLICT (product_id, cart_id) {on_conflict}"
+    )
+
+
+def add_to_cart(user_id: int, product_id: int, quantity: int = 1, increment: bool = True) -> bool:
+    """
+    Put a product in the user's cart, or add ``quantity`` to the line
+    already there, in a single INSERT ... ON CONFLICT statement. With
+    ``increment=False`` an existing line is left as it is.
+
+    Returns False when the product does not exist.
+    """
+    sql = _upsert_sql(increment)
+    params = (quantity, user_id, product_id)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        if not cursor.rowcount:
+            # First item for this user: create the cart and try once more.
+            Cart.objects.bulk_create([Cart(customer_id=user_id)], ignore_conflicts=True)
+            cursor.execute(sql, params)
+
+        added = cursor.rowcount > 0
+
+    if added:
+        invalidate_cart_summary(user_id)
+
+    return added
+
+
+def reduce_in_cart(user_id: int, product_id: int) -> bool:
+    """Take one off a cart line, dropping the line when it reaches zero."""
+    lines = CartProduct.objects.filter(cart__customer_id=user_id, product_id=product_id)
+    changed = bool(lines.filter(quantity__gt=1).update(quantity=F("quantity") - 1))
+
+    if not changed:
+        changed = bool(lines.filter(quantity__lte=1).delete()[0])
+
+    if changed:
+        invalidate_cart_summary(user_id)
+
+    return changed
+
+
+def remove_from_cart(user_id: int, product_id: int) -> bool:
+    deleted, _ = CartProduct.objects.filter(
+        cart__customer_id=user_id, product_id=product_id
+    ).delete()
+
+    if deleted:
+        invalidate_cart_summary(user_id)
+
+    return bool(deleted)
+
+
+def set_cart_quantities(user_id: int, quantities: dict[int, int]) -> list[int]:
+    """
+    Apply {product_id: quantity} to the user's cart with set-based
+    writes: one DELETE for the lines set to zero and one upsert for the
+    rest. Returns the ids of products that do not exist.
+    """
+    cart, _ = Cart.objects.get_or_create(customer_id=user_id)
+
+    removed = [pk for pk, quantity in quantities.items() if quantity <= 0]
+    wanted = {pk: quantity for pk, quantity in quantities.items() if quantity > 0}
+
+    if removed:
+        CartProduct.objects.filter(cart=cart, product_id__in=removed).delete()
+
+    existing = set(Product.objects.filter(pk__in=wanted).values_list("pk", flat=True))
+    if existing:
+        CartProduct.objects.bulk_create(
+            [
+                CartProduct(cart=cart, product_id=pk, quantity=wanted[pk])
+                for pk in sorted(existing)
+            ],
+            update_conflicts=True,
+            unique_fields=["product", "cart"],
+            update_fields=["quantity"],
+        )
+
+    invalidate_cart_summary(user_id)
+
+    return sorted(set(wanted) - existing)
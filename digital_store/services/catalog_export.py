@@ -0,0 +1,110 @@
+import csv
+from itertools import islice
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from digital_store.models import Product
+
+
+EXPORT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "seller_id",
+    "seller",
+    "categories",
+    "created_at",
+    "updated_at",
+)
+FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _category_names(product_ids: list[int]) -> dict[int, list[str]]:
+    names = {}
+    rows = Product.category.through.objects.filter(
+        product_id__in=product_ids
+    ).values_list("product_id", "category__name").order_by("category__name")
+
+    for product_id, name in rows:
+        names.setdefault(product_id, []).append(name)
+
+    return names
+
+
+def iter_catalog(chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Stream products with their seller and categories. Rows are read with
+    a server-side cursor where available and categories are fetched once
+    per chunk, so memory use does not grow with the catalog.
+    """
+    rows = Product.objects.order_by("id").values_list(
+        "id",
+        "name",
+        "description",
+        "price",
+        "seller_id",
+        "seller__username",
+        "created_at",
+        "updated_at",
+    ).iterator(chunk_size=chunk_size)
+
+    for chunk in _chunks(rows, chunk_size):
+        categories = _category_names([row[0] for row in chunk])
+
+        for pk, name, description, price, seller_id, seller, created_at, updated_at in chunk:
+            yield {
+                "id": pk,
+                "name": name,
+                "description": description,
+                "price": price,
+                "seller_id": seller_id,
+                "seller": seller,
+                "categories": categories.get(pk, []),
+                "created_at": created_at,
+                "updated_at": updated_at,
+            }
+
+
+class _Echo:
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(rows: Iterable[dict]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+
+    for row in rows:
+        yield writer.writerow(
+            [
+                "|".join(row[field]) if field == "categories" else row[field]
+                for field in EXPORT_FIELDS
+            ]
+        )
+
+
+def iter_jsonl(rows: Iterable[dict]) -> Iterator[str]:
+    encoder = DjangoJSONEncoder()
+
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def export_catalog(export_format: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    if export_format not in FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    rows = iter_catalog(chunk_size=chunk_size)
+    return iter_csv(rows) if export_format == "csv" else iter_jsonl(rows)
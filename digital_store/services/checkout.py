@@ -0,0 +1,71 @@
+from django.db import IntegrityError, connection, transaction
+
+from digital_store.models import Cart, CartProduct, Order, OrderProduct, Product
+from digital_store.services import jobs
+from digital_store.services.cart import invalidate_cart_summary
+from digital_store.services.orders import refresh_order_totals
+
+
+def _copy_lines_sql() -> str:
+    quote = connection.ops.quote_name
+    line, cart_line, product = (
+        quote(model._meta.db_table) for model in (OrderProduct, CartProduct, Product)
+    )
+    return (
+        f"INSERT INTO {line} (order_id, product_id, quantity, unit_price, seller_id) "
+        f"SELECT %s, {cart_line}.product_id, {cart_line}.quantity, "
+        f"{product}.price, {product}.seller_id "
+        f"FROM {cart_line} INNER JOIN {product} ON {product}.id = {cart_line}.product_id "
+        f"WHERE {cart_line}.cart_id = %s"
+    )
+
+
+def checkout(user_id: int, idempotency_key: str | None = None) -> Order | None:
+    """
+    Turn the user's cart into an order as one atomic unit: lock the
+    cart, copy its lines with a single INSERT ... SELECT, store the
+    totals, empty the cart and queue fulfilment. A repeated ``idempotency_key`` returns
+    the order it already produced. Returns None for an empty cart.
+    """
+    try:
+        with transaction.atomic():
+            order = _checkout(user_id, idempotency_key)
+    except IntegrityError:
+        # A concurrent submit with the same key won the race; ours is
+        # rolled back in full.
+        if not idempotency_key:
+            raise
+        return Order.objects.filter(customer_id=user_id, idempotency_key=idempotency_key).first()
+
+    invalidate_cart_summary(user_id)
+    return order
+
+
+def _checkout(user_id: int, idempotency_key: str | None) -> Order | None:
+    cart = Cart.objects.select_for_update().filter(customer_id=user_id).first()
+
+    if idempotency_key:
+        existing = Order.objects.filter(
+            customer_id=user_id, idempotency_key=idempotency_key
+        ).first()
+        if existing is not None:
+            return existing
+
+    if cart is None or not cart.cart_items.exists():
+        return None
+
+    order = Order.objects.create(customer_id=user_id, idempotency_key=idempotency_key)
+
+    with connection.cursor() as cursor:
+        cursor.execute(_copy_lines_sql(), (order.pk, cart.pk))
+
+    # Totals come from the copied lines rather than a separate read of
+    # the cart, so they always match what the order contains.
+    refresh_order_totals(Order.objects.filter(pk=order.pk))
+    order.refresh_from_db(fields=["item_count", "total"])
+    cart.cart_items.all().delete()
+
+    # Fulfilment runs in a worker; the job commits with the order.
+    jobs.enqueue(jobs.FULFIL_ORDERS, {"order": order.pk})
+
+    return order
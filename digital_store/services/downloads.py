@@ -0,0 +1,171 @@
+import mimetypes
+import os
+import re
+from pathlib import PurePosixPath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Exists, OuterRef, Q
+from django.http import FileResponse, HttpRequest, HttpResponse
+from django.utils.http import content_disposition_header, http_date, quote_etag
+
+from digital_store.models import Order, OrderProduct, Product
+from digital_store.storage import private_storage
+
+
+SALT = "digital_store.downloads"
+BLOCK_SIZE = 256 * 1024
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def downloadable_asset(product_id: int, user_id: int) -> str | None:
+    """
+    The product's asset name if the user may download it: they bought it
+    in a completed order or they sell it. One query; the purchase check
+    walks the customer's orders and probes the (product, order) unique
+    index for each.
+    """
+    purchased = OrderProduct.objects.filter(
+        product_id=OuterRef("pk"),
+        order__customer_id=user_id,
+        order__status=Order.StatusChoice.COMPLETED,
+    )
+    return (
+        Product.objects.filter(pk=product_id)
+        .exclude(asset="")
+        .filter(Q(seller_id=user_id) | Exists(purchased))
+        .values_list("asset", flat=True)
+        .first()
+    )
+
+
+def sign_download(product_id: int, user_id: int, name: str) -> str:
+    # The file name is part of the token, so replacing the asset
+    # invalidates links to the old one.
+    return signing.dumps({"p": product_id, "u": user_id, "f": name}, salt=SALT)
+
+
+def unsign_download(token: str) -> dict:
+    """Raises signing.BadSignature (or SignatureExpired) for a bad token."""
+    return signing.loads(
+        token, salt=SALT, max_age=getattr(settings, "ASSET_DOWNLOAD_MAX_AGE", 3600)
+    )
+
+
+def asset_filename(name: str) -> str:
+    return PurePosixPath(name).name
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    The inclusive (start, end) of a single "bytes=" range, or None to
+    serve the whole file. Multiple ranges are answered with the whole
+    file, which RFC 9110 allows.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the final N bytes.
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+class FileRange:
+    """
+    Reads at most ``length`` bytes of an already positioned file. It
+    exposes fileno() so wsgi.file_wrapper can still use sendfile(),
+    which starts at the descriptor's offset and stops at Content-Length.
+    """
+
+    def __init__(self, file, length: int) -> None:
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def serve_asset(request: HttpRequest, name: str, filename: str) -> HttpResponse:
+    offload = getattr(settings, "ASSET_DOWNLOAD_OFFLOAD", None)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    if offload:
+        # The web server streams the file and handles Range itself.
+        response = HttpResponse(content_type=content_type)
+        if offload == "x-accel-redirect":
+            prefix = getattr(settings, "ASSET_ACCEL_REDIRECT_PREFIX", "/protected-assets/")
+            response["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{quote(name)}"
+        else:
+            response["X-Sendfile"] = private_storage.path(name)
+        response["Content-Disposition"] = content_disposition_header(True, filename)
+        return response
+
+    path = private_storage.path(name)
+    stat = os.stat(path)
+    etag = quote_etag(f"{stat.st_size:x}-{stat.st_mtime_ns:x}")
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and (if_range is None or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+            return response
+
+    file = open(path, "rb")
+    if byte_range is None:
+        response = FileResponse(
+            file, as_attachment=True, filename=filename, content_type=content_type
+        )
+    else:
+        start, end = byte_range
+        file.seek(start)
+        response = FileResponse(
+            FileRange(file, end - start + 1),
+            status=206,
+            as_attachment=True,
+            filename=filename,
+            content_type=content_type,
+        )
+        response["Content-Length"] = end - start + 1
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+
+    response.block_size = BLOCK_SIZE
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    return response
@@ -0,0 +1,98 @@
+import hashlib
+import json
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet
+
+from digital_store.models import Category
+from digital_store.services import cache_versions
+
+
+DEFAULT_PRICE_BUCKETS = (0, 100, 250, 500, 1000)
+FACETS_TIMEOUT = 300
+PRICE_STEP = Decimal("0.01")
+
+
+def get_price_buckets() -> list[tuple[Decimal, Decimal | None]]:
+    edges = [
+        Decimal(edge)
+        for edge in getattr(settings, "PRODUCT_PRICE_BUCKETS", DEFAULT_PRICE_BUCKETS)
+    ]
+    return list(zip(edges, edges[1:] + [None]))
+
+
+def get_categories() -> list[tuple[int, str]]:
+    version = cache_versions.get_version(cache_versions.CATEGORY)
+    key = f"facets:categories:{version}"
+    categories = cache.get(key)
+
+    if categories is None:
+        categories = list(Category.objects.values_list("id", "name"))
+        cache.set(key, categories, FACETS_TIMEOUT)
+
+    return categories
+
+
+def facet_signature(params: dict) -> str:
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.md5(payload.encode()).hexdigest()
+
+
+def get_product_facets(
+        queryset: QuerySet,
+        params: dict,
+        selected_category: int | None = None,
+) -> dict:
+    """
+    Category counts and a price histogram for the current search and
+    filter state, computed by a single conditional-aggregate query.
+
+    ``queryset`` must already be narrowed by everything except the
+    category filter, so the category facet keeps showing the other
+    categories; the histogram is narrowed by ``selected_category``.
+    """
+    version = cache_versions.get_version(cache_versions.CATALOG)
+    key = f"facets:{version}:{facet_signature(params)}"
+    facets = cache.get(key)
+
+    if facets is not None:
+        return facets
+
+    categories = get_categories()
+    buckets = get_price_buckets()
+    in_selected = Q(category__id=selected_category) if selected_category else Q()
+
+    aggregates = {
+        f"category_{pk}": Count("id", filter=Q(category__id=pk), distinct=True)
+        for pk, _ in categories
+    }
+    for position, (low, high) in enumerate(buckets):
+        in_bucket = Q(price__gte=low)
+        if high is not None:
+            in_bucket &= Q(price__lt=high)
+        aggregates[f"price_{position}"] = Count(
+            "id", filter=in_bucket & in_selected, distinct=True
+        )
+
+    counts = queryset.order_by().aggregate(**aggregates)
+
+    facets = {
+        "categories": [
+            {"id": pk, "name": name, "count": counts[f"category_{pk}"]}
+            for pk, name in categories
+            if counts[f"category_{pk}"]
+        ],
+        "price_histogram": [
+            {
+                "min": low,
+                "max": high - PRICE_STEP if high is not None else None,
+                "count": counts[f"price_{position}"],
+            }
+            for position, (low, high) in enumerate(buckets)
+        ],
+    }
+    cache.set(key, facets, FACETS_TIMEOUT)
+
+    return facets
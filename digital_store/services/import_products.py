@@ -0,0 +1,183 @@
+import csv
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterator
+
+from django.db import transaction
+
+from digital_store.models import Category, Product
+from digital_store.services import cache_versions, store_stats
+from digital_store.services.import_validation import validate_batch
+
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    created: int = 0
+    skipped: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    last_line: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.read / elapsed if elapsed else 0.0
+
+
+def read_rows(path: Path, file_format: str, start_line: int = 0) -> Iterator[tuple[int, dict | str]]:
+    """
+    Yield (line, row) pairs. CSV rows are dicts; JSONL rows are left as
+    text and decoded by ``validate_row``, so a malformed line becomes a
+    row error and decoding runs in the worker processes.
+    """
+    with open(path, encoding="utf-8", newline="") as source:
+        if file_format == "csv":
+            rows = csv.DictReader(source)
+        else:
+            rows = (line for line in source if line.strip())
+
+        for line, row in enumerate(rows, start=1):
+            if line > start_line:
+                yield line, row
+
+
+def checkpoint_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.checkpoint")
+
+
+def read_checkpoint(path: Path) -> int:
+    try:
+        return int(checkpoint_path(path).read_text())
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _batches(rows: Iterator, size: int) -> Iterator[list]:
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _validated_batches(rows, batch_size: int, workers: int):
+    """
+    Validate batches in a process pool while keeping only a small window
+    of batches in flight, so huge files are never read ahead into memory.
+    """
+    if workers < 1:
+        for batch in _batches(rows, batch_size):
+            yield validate_batch(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in _batches(rows, batch_size):
+            pending.append(executor.submit(validate_batch, batch))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _write_batch(seller, rows: list[dict], category_ids: dict[str, int]) -> int:
+    skus = [row["sku"] for row in rows]
+
+    with transaction.atomic():
+        existing = set(
+            Product.objects.filter(seller=seller, sku__in=skus).values_list("sku", flat=True)
+        )
+        new_rows = list(
+            {row["sku"]: row for row in reversed(rows) if row["sku"] not in existing}.values()
+        )
+
+        Product.objects.bulk_create(
+            [
+                Product(
+                    sku=row["sku"],
+                    name=row["name"],
+                    description=row["description"],
+                    price=row["price"],
+                    seller=seller,
+                )
+                for row in new_rows
+            ],
+            ignore_conflicts=True,
+        )
+
+        product_ids = dict(
+            Product.objects.filter(
+                seller=seller, sku__in=[row["sku"] for row in new_rows]
+            ).values_list("sku", "id")
+        )
+        through = Product.category.through
+        through.objects.bulk_create(
+            [
+                through(product_id=product_ids[row["sku"]], category_id=category_ids[name])
+                for row in new_rows
+                if row["sku"] in product_ids
+                for name in row["categories"]
+            ],
+            ignore_conflicts=True,
+        )
+
+        if new_rows:
+            store_stats.increment(store_stats.PRODUCTS, len(new_rows))
+
+    return len(new_rows)
+
+
+def import_products(
+        path: Path,
+        seller,
+        file_format: str = "csv",
+        batch_size: int = 1000,
+        workers: int = 2,
+        resume: bool = False,
+        on_batch: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """
+    Import products for ``seller``. Each batch is committed on its own
+    and recorded in a checkpoint file next to the source, and rows are
+    keyed by (seller, sku), so a rerun after a failure creates no
+    duplicates and with ``resume`` skips the batches already committed.
+    """
+    path = Path(path)
+    start_line = read_checkpoint(path) if resume else 0
+    report = ImportReport(last_line=start_line)
+    category_ids = {
+        name.lower(): pk for pk, name in Category.objects.values_list("id", "name")
+    }
+
+    rows = read_rows(path, file_format, start_line=start_line)
+
+    for results in _validated_batches(rows, batch_size, workers):
+        valid = []
+        for line, row, error in results:
+            if error is None:
+                unknown = [name for name in row["categories"] if name not in category_ids]
+                if unknown:
+                    error = f"unknown categories: {', '.join(unknown)}"
+            if error is None:
+                valid.append(row)
+            else:
+                report.errors.append((line, error))
+
+        created = _write_batch(seller, valid, category_ids)
+
+        report.read += len(results)
+        report.created += created
+        report.skipped += len(valid) - created
+        report.last_line = results[-1][0]
+        checkpoint_path(path).write_text(str(report.last_line))
+
+        if on_batch:
+            on_batch(report)
+
+    checkpoint_path(path).unlink(missing_ok=True)
+    if report.created:
+        cache_versions.bump_version(cache_versions.CATALOG, cache_versions.CATEGORY)
+
+    return report
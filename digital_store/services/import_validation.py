@@ -0,0 +1,58 @@
+import json
+from decimal import Decimal, InvalidOperation
+
+
+MAX_PRICE = Decimal("99999999.99")
+CATEGORY_SEPARATOR = "|"
+
+
+def validate_row(line: int, row: dict | str) -> tuple[int, dict | None, str | None]:
+    """
+    Check one raw import row, given as a dict or as a JSON line. Kept
+    free of Django imports so it can run in worker processes without
+    setting Django up.
+    """
+    if isinstance(row, str):
+        try:
+            row = json.loads(row)
+        except ValueError as error:
+            return line, None, f"invalid JSON: {error}"
+    if not isinstance(row, dict):
+        return line, None, "row must be a JSON object"
+
+    sku = str(row.get("sku") or "").strip()
+    name = str(row.get("name") or "").strip()
+
+    if not sku or len(sku) > 64:
+        return line, None, "sku is required and must be at most 64 characters"
+    if not name or len(name) > 255:
+        return line, None, "name is required and must be at most 255 characters"
+
+    try:
+        price = Decimal(str(row.get("price"))).quantize(Decimal("0.01"))
+    except (InvalidOperation, ValueError):
+        return line, None, f"invalid price: {row.get('price')!r}"
+    if not Decimal(0) <= price <= MAX_PRICE:
+        return line, None, f"price out of range: {price}"
+
+    categories = row.get("categories") or []
+    if isinstance(categories, str):
+        categories = categories.split(CATEGORY_SEPARATOR)
+    if not isinstance(categories, list):
+        return line, None, "categories must be a list or a separated string"
+
+    return line, {
+        "sku": sku,
+        "name": name,
+        "description": str(row.get("description") or "").strip() or None,
+        "price": price,
+        "categories": [
+            str(category).strip().lower()
+            for category in categories
+            if str(category).strip()
+        ],
+    }, None
+
+
+def validate_batch(batch: list[tuple[int, dict | str]]) -> list[tuple[int, dict | None, str | None]]:
+    return [validate_row(line, row) for line, row in batch]
@@ -0,0 +1,161 @@
+import logging
+import random
+import traceback
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from digital_store.models import Job
+
+
+logger = logging.getLogger("digital_store.jobs")
+
+FULFIL_ORDERS = "order.fulfil"
+
+DEFAULT_HANDLERS = {
+    FULFIL_ORDERS: "digital_store.services.fulfilment.fulfil_orders",
+}
+BACKOFF_SECONDS = 5
+MAX_BACKOFF_SECONDS = 3600
+STALE_AFTER = timedelta(minutes=10)
+
+
+def get_handler(kind: str):
+    """
+    Handlers take the payloads of a whole batch of jobs of one kind,
+    so they can work on them with set-based statements. A failed batch
+    is run again one job at a time, so handlers must be safe to re-run:
+    all or nothing, and a no-op for work already done.
+    """
+    handlers = {**DEFAULT_HANDLERS, **getattr(settings, "JOB_HANDLERS", {})}
+    return import_string(handlers[kind])
+
+
+def enqueue(kind: str, payload: dict, run_after: datetime | None = None) -> Job:
+    # A plain insert, so the job commits or rolls back with the caller's
+    # transaction and never refers to rows that do not exist.
+    return Job.objects.create(
+        kind=kind,
+        payload=payload,
+        run_after=run_after or timezone.now(),
+    )
+
+
+def claim(worker: str, batch_size: int = 50, kinds: list[str] | None = None) -> list[Job]:
+    """
+    Mark up to ``batch_size`` due jobs as running for ``worker``.
+
+    On PostgreSQL rows are picked with SELECT ... FOR UPDATE SKIP LOCKED,
+    so workers never wait on each other. Elsewhere the claim is a single
+    UPDATE ... WHERE id IN (SELECT ...), which takes the write lock up
+    front; SQLite serializes those, so two workers never get one job.
+    """
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.StatusChoice.QUEUED, run_after__lte=now)
+    if kinds:
+        due = due.filter(kind__in=kinds)
+    due = due.order_by("run_after", "id")
+    token = f"{worker}:{uuid.uuid4().hex[:8]}"
+    claimed = {
+        "status": Job.StatusChoice.RUNNING,
+        "locked_by": token,
+        "locked_at": now,
+        "attempts": F("attempts") + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                due.select_for_update(skip_locked=True).values_list("id", flat=True)[:batch_size]
+            )
+            Job.objects.filter(pk__in=ids).update(**claimed)
+    else:
+        Job.objects.filter(pk__in=due.values("id")[:batch_size]).update(**claimed)
+
+    return list(Job.objects.filter(status=Job.StatusChoice.RUNNING, locked_by=token))
+
+
+def backoff(attempts: int) -> timedelta:
+    seconds = min(BACKOFF_SECONDS * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS)
+    return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+
+def run_jobs(jobs: list[Job]) -> tuple[int, int]:
+    """Run claimed jobs grouped by kind; returns (done, failed) counts."""
+    by_kind = defaultdict(list)
+    for job in jobs:
+        by_kind[job.kind].append(job)
+
+    done = failed = 0
+    for kind, batch in by_kind.items():
+        handler = get_handler(kind)
+        if len(batch) > 1:
+            try:
+                handler([job.payload for job in batch])
+            except Exception:
+                # Run the batch again job by job, so only the jobs that
+                # fail on their own use up an attempt.
+                logger.info(
+                    "batch of %d %s jobs failed, running them one at a time",
+                    len(batch), kind, exc_info=True,
+                )
+            else:
+                _mark_done(batch)
+                done += len(batch)
+                continue
+
+        succeeded = []
+        for job in batch:
+            try:
+                handler([job.payload])
+            except Exception:
+                error = traceback.format_exc()
+                logger.warning("%s job %s failed:\n%s", kind, job.pk, error)
+                _retry_or_fail([job], error)
+                failed += 1
+            else:
+                succeeded.append(job)
+        _mark_done(succeeded)
+        done += len(succeeded)
+
+    return done, failed
+
+
+def _mark_done(batch: list[Job]) -> None:
+    Job.objects.filter(pk__in=[job.pk for job in batch]).update(
+        status=Job.StatusChoice.DONE,
+        finished_at=timezone.now(),
+        last_error="",
+    )
+
+
+def _retry_or_fail(batch: list[Job], error: str) -> None:
+    now = timezone.now()
+
+    for job in batch:
+        if job.attempts >= job.max_attempts:
+            job.status = Job.StatusChoice.FAILED
+            job.finished_at = now
+        else:
+            job.status = Job.StatusChoice.QUEUED
+            job.run_after = now + backoff(job.attempts)
+        job.locked_by = None
+        job.last_error = error
+
+    Job.objects.bulk_update(
+        batch, ["status", "finished_at", "run_after", "locked_by", "last_error"]
+    )
+
+
+def requeue_stale(older_than: timedelta = STALE_AFTER) -> int:
+    """Give jobs of crashed workers back to the queue."""
+    return Job.objects.filter(
+        status=Job.StatusChoice.RUNNING,
+        locked_at__lt=timezone.now() - older_than,
+    ).update(status=Job.StatusChoice.QUEUED, locked_by=None)
@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+from django.db.models import (
+    Count,
+    DecimalField,
+    Max,
+    Min,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+from digital_store.models import OrderProduct, Product
+
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def _per_order(aggregate):
+    lines = OrderProduct.objects.filter(order=OuterRef("pk")).order_by().values("order")
+    return Subquery(lines.annotate(value=aggregate).values("value"))
+
+
+def refresh_order_totals(orders: QuerySet) -> int:
+    """Recompute the stored line count and total of ``orders`` in one UPDATE."""
+    return orders.update(
+        item_count=Coalesce(_per_order(Count("id")), 0),
+        total=Coalesce(
+            _per_order(Sum("line_total")),
+            Value(Decimal("0.00")),
+            output_field=MONEY,
+        ),
+    )
+
+
+def snapshot_line_prices(lines: QuerySet, batch_size: int = 5000) -> None:
+    """
+    Copy the current product price and seller onto order lines, in
+    primary key batches so no single UPDATE holds locks for long.
+    """
+    product = Product.objects.filter(pk=OuterRef("product_id"))
+    bounds = lines.aggregate(first=Min("pk"), last=Max("pk"))
+    if bounds["first"] is None:
+        return
+
+    for start in range(bounds["first"], bounds["last"] + 1, batch_size):
+        lines.filter(pk__gte=start, pk__lt=start + batch_size).update(
+            unit_price=Subquery(product.values("price")),
+            seller_id=Subquery(product.values("seller_id")),
+        )
@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import transaction
+
+from digital_store.services import cache_versions
+
+
+User = get_user_model()
+
+SELLER_GROUP = "Seller"
+SELLER_PERMISSIONS = [
+    "digital_store.can_add_category",
+    "digital_store.can_edit_category",
+    "digital_store.can_delete_category",
+    "digital_store.can_add_product",
+    "digital_store.can_edit_product",
+    "digital_store.can_delete_product",
+]
+
+# Bumped when any group's permissions change, since that affects all
+# of its members at once.
+GROUPS = "permissions"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def user_version(user_id: int) -> str:
+    return f"permissions:{user_id}"
+
+
+def cache_key(user) -> str:
+    versions = cache_versions.get_versions(GROUPS, user_version(user.pk))
+    return (
+        f"permissions:{user.pk}:{int(user.is_superuser)}:"
+        f"{versions[GROUPS]}:{versions[user_version(user.pk)]}"
+    )
+
+
+def get_permissions(user, load) -> set[str]:
+    """
+    The user's resolved "app_label.codename" set, shared across requests
+    through the cache. ``load`` computes it on a miss.
+    """
+    key = cache_key(user)
+    permissions = cache.get(key)
+
+    if permissions is None:
+        permissions = load()
+        cache.set(key, permissions, CACHE_TIMEOUT)
+
+    return permissions
+
+
+# Stamps are bumped once the change commits; bumped earlier, a
+# concurrent request could cache the old permissions under the new stamp.
+
+def invalidate_user_permissions(*user_ids: int) -> None:
+    if user_ids:
+        names = [user_version(user_id) for user_id in user_ids]
+        transaction.on_commit(lambda: cache_versions.bump_version(*names))
+
+
+def invalidate_group_permissions() -> None:
+    transaction.on_commit(lambda: cache_versions.bump_version(GROUPS))
+
+
+def seller_group_id() -> int:
+    return Group.objects.values_list("pk", flat=True).get(name=SELLER_GROUP)
+
+
+def add_to_seller_group(*user_ids: int) -> None:
+    """One INSERT of the memberships; users already in the group are skipped."""
+    group_id = seller_group_id()
+    membership = User.groups.through
+
+    membership.objects.bulk_create(
+        [membership(user_id=user_id, group_id=group_id) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+    # bulk_create sends no m2m_changed, so invalidate here.
+    invalidate_user_permissions(*user_ids)
@@ -0,0 +1,140 @@
+import heapq
+import threading
+from bisect import bisect_left
+from typing import Iterable, NamedTuple
+
+
+class Suggestion(NamedTuple):
+    kind: str
+    pk: int
+    name: str
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _word_suffixes(name: str, max_words: int) -> list[str]:
+    suffixes = [name]
+    position = name.find(" ")
+    while position != -1 and len(suffixes) < max_words:
+        suffixes.append(name[position + 1:])
+        position = name.find(" ", position + 1)
+    return suffixes
+
+
+def _matches(keys, refs, prefix: str, source: int):
+    position = bisect_left(keys, prefix)
+    while position < len(keys) and keys[position].startswith(prefix):
+        yield keys[position], refs[position], source
+        position += 1
+
+
+OVERLAY, BASE = 0, 1
+
+
+class PrefixIndex:
+    """
+    In-memory prefix index over names, kept as a sorted array searched
+    with bisect. Every word start of a name is indexed, so "book" finds
+    "Cooking book".
+
+    The arrays built by ``build`` are never modified. Later writes go to
+    a small sorted overlay that shadows the base entries of the names it
+    changes. The overlay is replaced with a single assignment, so reads
+    are lock-free, and a write costs in proportion to the overlay, not
+    to the index. A rebuild folds the overlay back into the base.
+    """
+
+    def __init__(self, max_words: int = 4) -> None:
+        self.max_words = max_words
+        # (keys, refs, names); keys and refs are parallel sorted lists.
+        self._base: tuple[list[str], list[tuple[str, int]], dict[tuple[str, int], str]] = (
+            [], [], {}
+        )
+        # (keys, refs, changes); changes maps a ref to its new name, or
+        # to None once it is removed.
+        self._overlay: tuple[
+            tuple[str, ...], tuple[tuple[str, int], ...], dict[tuple[str, int], str | None]
+        ] = ((), (), {})
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        names = self._base[2]
+        changes = self._overlay[2]
+        added = sum(1 for ref, name in changes.items() if name is not None and ref not in names)
+        removed = sum(1 for ref, name in changes.items() if name is None and ref in names)
+        return len(names) + added - removed
+
+    @property
+    def overlay_size(self) -> int:
+        return len(self._overlay[2])
+
+    @classmethod
+    def build(cls, items: Iterable[tuple[str, int, str]], max_words: int = 4) -> "PrefixIndex":
+        index = cls(max_words=max_words)
+        entries, names = [], {}
+
+        for kind, pk, name in items:
+            names[(kind, pk)] = name
+            for key in _word_suffixes(normalize(name), max_words):
+                entries.append((key, kind, pk))
+
+        entries.sort()
+        index._base = (
+            [key for key, _, _ in entries],
+            [(kind, pk) for _, kind, pk in entries],
+            names,
+        )
+
+        return index
+
+    def add(self, kind: str, pk: int, name: str) -> None:
+        ref = (kind, pk)
+        keys = _word_suffixes(normalize(name), self.max_words)
+        with self._lock:
+            self._write(ref, name, [(key, ref) for key in keys])
+
+    def remove(self, kind: str, pk: int) -> None:
+        ref = (kind, pk)
+        with self._lock:
+            changes = self._overlay[2]
+            if ref in changes and changes[ref] is None:
+                return
+            if ref not in changes and ref not in self._base[2]:
+                return
+            self._write(ref, None, [])
+
+    def _write(self, ref: tuple[str, int], name: str | None, new_entries: list) -> None:
+        keys, refs, changes = self._overlay
+        entries = [(key, other) for key, other in zip(keys, refs) if other != ref]
+        entries.extend(new_entries)
+        entries.sort()
+        self._overlay = (
+            tuple(key for key, _ in entries),
+            tuple(other for _, other in entries),
+            {**changes, ref: name},
+        )
+
+    def search(self, prefix: str, limit: int = 10) -> list[Suggestion]:
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        base_keys, base_refs, names = self._base
+        keys, refs, changes = self._overlay
+        results, seen = [], set()
+
+        for _, ref, source in heapq.merge(
+            _matches(keys, refs, prefix, OVERLAY),
+            _matches(base_keys, base_refs, prefix, BASE),
+        ):
+            if ref in seen or (source == BASE and ref in changes):
+                continue
+            seen.add(ref)
+            name = changes[ref] if source == OVERLAY else names[ref]
+            results.append(Suggestion(ref[0], ref[1], name))
+            if len(results) >= limit:
+                break
+
+        return results
@@ -0,0 +1,175 @@
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import connections
+
+
+IN_LIST_RE = re.compile(r"\bIN \((?:%s, )*%s\)")
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+TEMPLATE_BASE = str(Path(django.__file__).parent / "template" / "base.py")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+@dataclass
+class QueryRecord:
+    sql: str
+    shape: str
+    origin: str | None
+    duration: float
+
+
+@dataclass
+class Finding:
+    kind: str
+    message: str
+    origin: str
+
+    def __str__(self) -> str:
+        return f"{self.message} ({self.origin})"
+
+
+@dataclass
+class QueryRecorder:
+    """
+    Records every query run on any database connection while active,
+    together with the template line or code path that issued it.
+
+    Finding the origin walks the Python stack, so without ``trace`` it
+    is only done for suspect queries: those past ``budget`` and repeats
+    of a statement seen ``repeat_threshold`` times already.
+    """
+
+    trace: bool = True
+    budget: int | None = None
+    repeat_threshold: int = 5
+    records: list[QueryRecord] = field(default_factory=list)
+    shape_counts: Counter = field(default_factory=Counter)
+
+    def __enter__(self) -> "QueryRecorder":
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if not sql.startswith(IGNORED_PREFIXES):
+                self.record(sql, time.perf_counter() - started)
+
+    def record(self, sql: str, duration: float) -> None:
+        shape = sql_shape(sql)
+        self.shape_counts[shape] += 1
+        suspect = (
+            self.trace
+            or self.shape_counts[shape] >= self.repeat_threshold
+            or (self.budget is not None and len(self.records) >= self.budget)
+        )
+        self.records.append(
+            QueryRecord(
+                sql=sql,
+                shape=shape,
+                origin=find_origin() if suspect else None,
+                duration=duration,
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+def sql_shape(sql: str) -> str:
+    """Collapse the parts of a statement that vary between N+1 siblings."""
+    shape = IN_LIST_RE.sub("IN (...)", sql)
+    shape = STRING_RE.sub("?", shape)
+    return NUMBER_RE.sub("?", shape)
+
+
+def find_origin() -> str:
+    """
+    The innermost template node being rendered, which points at the
+    exact tag or variable, or failing that the innermost frame of
+    project code.
+    """
+    base_dir = str(settings.BASE_DIR)
+    frame = sys._getframe(1)
+    code_path = None
+
+    while frame is not None:
+        filename = frame.f_code.co_filename
+
+        if filename == TEMPLATE_BASE and frame.f_code.co_name == "render_annotated":
+            node = frame.f_locals.get("self")
+            token = getattr(node, "token", None)
+            origin = getattr(node, "origin", None)
+            if token is not None and origin is not None:
+                return f"{origin.template_name or origin.name}:{token.lineno} ({token.contents})"
+
+        if (
+            code_path is None
+            and filename.startswith(base_dir)
+            and filename != __file__
+            and "site-packages" not in filename
+        ):
+            code_path = f"{filename[len(base_dir) + 1:]}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+        frame = frame.f_back
+
+    return code_path or "<unknown>"
+
+
+def _most_common_origin(records: list[QueryRecord]) -> str:
+    origins = Counter(record.origin for record in records if record.origin is not None)
+    return origins.most_common(1)[0][0] if origins else "<unknown>"
+
+
+def analyze(
+        records: list[QueryRecord],
+        budget: int | None = None,
+        repeat_threshold: int = 5,
+) -> list[Finding]:
+    findings = []
+
+    if budget is not None and len(records) > budget:
+        findings.append(
+            Finding(
+                kind="budget",
+                message=f"{len(records)} queries, budget is {budget}",
+                origin=_most_common_origin(records),
+            )
+        )
+
+    shapes = Counter(record.shape for record in records)
+    for shape, count in shapes.items():
+        if count < repeat_threshold:
+            continue
+
+        findings.append(
+            Finding(
+                kind="repeated",
+                message=f"same query ran {count} times, likely N+1: {shape[:200]}",
+                origin=_most_common_origin(
+                    [record for record in records if record.shape == shape]
+                ),
+            )
+        )
+
+    return findings
@@ -0,0 +1,57 @@
+from datetime import datetime
+from decimal import Decimal
+
+from django.db.models import QuerySet, Sum
+
+from digital_store.models import Order, OrderProduct
+
+
+# Orders that were cancelled or refunded earned nothing.
+EARNING_STATUSES = (
+    Order.StatusChoice.PENDING,
+    Order.StatusChoice.PROCESSING,
+    Order.StatusChoice.COMPLETED,
+)
+
+
+def sold_lines(
+        since: datetime | None = None,
+        until: datetime | None = None,
+        statuses: tuple[str, ...] = EARNING_STATUSES,
+) -> QuerySet:
+    """
+    Order lines in the period. Prices are the snapshots taken at
+    checkout, so nothing here joins the product table.
+    """
+    lines = OrderProduct.objects.filter(order__status__in=statuses)
+    if since is not None:
+        lines = lines.filter(order__order_date__gte=since)
+    if until is not None:
+        lines = lines.filter(order__order_date__lt=until)
+    return lines.order_by()
+
+
+def total_revenue(**period) -> Decimal:
+    revenue = sold_lines(**period).aggregate(revenue=Sum("line_total"))["revenue"]
+    return revenue or Decimal("0.00")
+
+
+def revenue_by_seller(**period) -> QuerySet:
+    return (
+        sold_lines(**period)
+        .values("seller_id")
+        .annotate(revenue=Sum("line_total"), units=Sum("quantity"))
+    )
+
+
+def top_sellers(limit: int = 10, **period) -> list[dict]:
+    return list(revenue_by_seller(**period).order_by("-revenue", "seller_id")[:limit])
+
+
+def top_products(limit: int = 10, **period) -> list[dict]:
+    return list(
+        sold_lines(**period)
+        .values("product_id")
+        .annotate(revenue=Sum("line_total"), units=Sum("quantity"))
+        .order_by("-revenue", "product_id")[:limit]
+    )
@@ -0,0 +1,158 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from digital_store.models import Product
+
+
+PRODUCT_TABLE = Product._meta.db_table
+FTS_TABLE = f"{PRODUCT_TABLE}_fts"
+SEARCH_CONFIG = "english"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(query: str | None) -> list[str]:
+    return TOKEN_RE.findall((query or "").lower())
+
+
+class BaseSearchBackend:
+    """
+    Product search backends filter a queryset by a free-text query and
+    annotate each row with ``search_rank`` (higher is more relevant).
+    """
+
+    rank_field = "search_rank"
+
+    def search(self, queryset: QuerySet, query: str | None) -> QuerySet:
+        raise NotImplementedError
+
+    def search_categories(self, queryset: QuerySet, query: str | None) -> QuerySet:
+        # The category table is small and bounded, a plain scan is cheaper
+        # than keeping a second full-text index in sync.
+        if not query:
+            return queryset
+        return queryset.filter(name__icontains=query)
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    def search(self, queryset: QuerySet, query: str | None) -> QuerySet:
+        if not tokenize(query):
+            return queryset
+
+        return queryset.filter(name__icontains=query).annotate(
+            **{self.rank_field: RawSQL("1.0", (), output_field=FloatField())}
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Uses the generated ``search_vector`` tsvector column, indexed with GIN.
+    Name matches are weighted above description matches.
+    """
+
+    def search(self, queryset: QuerySet, query: str | None) -> QuerySet:
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+
+        ts_query = " & ".join(f"{token}:*" for token in tokens)
+        vector = f"{connection.ops.quote_name(PRODUCT_TABLE)}.search_vector"
+
+        return queryset.filter(
+            RawSQL(
+                f"{vector} @@ to_tsquery('{SEARCH_CONFIG}', %s)",
+                (ts_query,),
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            **{
+                self.rank_field: RawSQL(
+                    f"ts_rank({vector}, to_tsquery('{SEARCH_CONFIG}', %s))",
+                    (ts_query,),
+                    output_field=FloatField(),
+                )
+            }
+        )
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    Uses an FTS5 external-content table shadowing the product table,
+    kept in sync by triggers. bm25() is negated so that higher is better.
+    """
+
+    name_weight = 10.0
+    description_weight = 1.0
+
+    def search(self, queryset: QuerySet, query: str | None) -> QuerySet:
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+
+        match = " ".join(f'"{token}"*' for token in tokens)
+        product_id = f"{connection.ops.quote_name(PRODUCT_TABLE)}.id"
+
+        return queryset.filter(
+            RawSQL(
+                f"{product_id} IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)",
+                (match,),
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            **{
+                self.rank_field: RawSQL(
+                    f"(SELECT -bm25({FTS_TABLE}, %s, %s) FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s AND rowid = {product_id})",
+                    (self.name_weight, self.description_weight, match),
+                    output_field=FloatField(),
+                )
+            }
+        )
+
+
+VENDOR_BACKENDS = {
+    "postgresql": "digital_store.services.search.PostgresSearchBackend",
+    "sqlite": "digital_store.services.search.SQLiteSearchBackend",
+}
+
+
+@lru_cache(maxsize=None)
+def get_search_backend() -> BaseSearchBackend:
+    path = getattr(settings, "PRODUCT_SEARCH_BACKEND", None) or VENDOR_BACKENDS.get(
+        connection.vendor,
+        "digital_store.services.search.SimpleSearchBackend",
+    )
+    return import_string(path)()
+
+
+def install_sqlite_triggers(cursor) -> None:
+    """
+    SQLite rebuilds a table on many ALTERs, which drops its triggers, so
+    the ones migration 0005 created are put back after every migrate (see
+    signals.py). Keep these in step with that migration.
+    """
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {PRODUCT_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+        f"VALUES (new.id, new.name, coalesce(new.description, '')); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {PRODUCT_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+        f"VALUES ('delete', old.id, old.name, coalesce(old.description, '')); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+        f"AFTER UPDATE OF name, description ON {PRODUCT_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+        f"VALUES ('delete', old.id, old.name, coalesce(old.description, '')); "
+        f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+        f"VALUES (new.id, new.name, coalesce(new.description, '')); END"
+    )
+
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from digital_store.models import Product, StoreCounter
+from digital_store.services import cache_versions
+
+
+USERS = "users"
+SELLERS = "sellers"
+PRODUCTS = "products"
+COUNTERS = (USERS, SELLERS, PRODUCTS)
+
+CACHE_KEY = "store_stats"
+
+
+def get_store_stats() -> dict[str, int]:
+    stats = cache.get(CACHE_KEY)
+
+    if stats is None:
+        stats = dict.fromkeys(COUNTERS, 0)
+        stats.update(StoreCounter.objects.values_list("name", "value"))
+        cache.set(CACHE_KEY, stats, timeout=None)
+
+    return stats
+
+
+def invalidate_store_stats() -> None:
+    def invalidate():
+        cache.delete(CACHE_KEY)
+        cache_versions.bump_version(cache_versions.STORE_STATS)
+
+    transaction.on_commit(invalidate)
+
+
+def increment(name: str, delta: int = 1) -> None:
+    updated = StoreCounter.objects.filter(name=name).update(value=F("value") + delta)
+
+    if not updated:
+        StoreCounter.objects.get_or_create(name=name)
+        StoreCounter.objects.filter(name=name).update(value=F("value") + delta)
+
+    invalidate_store_stats()
+
+
+def count_actual() -> dict[str, int]:
+    User = get_user_model()
+
+    return {
+        USERS: User.objects.count(),
+        SELLERS: User.objects.filter(role=User.UserRole.SELLER).count(),
+        PRODUCTS: Product.objects.count(),
+    }
+
+
+def reconcile() -> dict[str, tuple[int, int]]:
+    """
+    Overwrite the counters with real counts and return the drift found
+    as {name: (stored, actual)} for every counter that was off.
+    """
+    drift = {}
+
+    with transaction.atomic():
+        stored = dict(
+            StoreCounter.objects.select_for_update().values_list("name", "value")
+        )
+        actual = count_actual()
+        for name, value in actual.items():
+            if stored.get(name) != value:
+                drift[name] = (stored.get(name, 0), value)
+                StoreCounter.objects.update_or_create(name=name, defaults={"value": value})
+
+        invalidate_store_stats()
+
+    return drift
@@ -0,0 +1,250 @@
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from digital_store.models import AssetUpload, AssetUploadChunk, Product
+from digital_store.storage import private_storage
+
+
+BLOCK_SIZE = 1024 * 1024
+STALE_AFTER = timedelta(hours=24)
+LINK_ATTEMPTS = 10
+UPLOAD_DIR = "uploads"
+
+
+class UploadError(Exception):
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def chunk_size() -> int:
+    return getattr(settings, "ASSET_UPLOAD_CHUNK_SIZE", 8 * 1024 * 1024)
+
+
+def max_size() -> int:
+    return getattr(settings, "ASSET_UPLOAD_MAX_SIZE", 20 * 1024 ** 3)
+
+
+def start_upload(seller_id: int, product_id: int, filename: str, size: int) -> AssetUpload:
+    """
+    Register an upload and create its part file at full length. The file
+    is sparse, so no space is used until chunks arrive, and every chunk
+    can go straight to its final offset in any order.
+    """
+    if not 0 < size <= max_size():
+        raise UploadError(f"size must be between 1 and {max_size()} bytes")
+
+    if not Product.objects.filter(pk=product_id, seller_id=seller_id).exists():
+        raise UploadError("Product not found", status=404)
+
+    try:
+        filename = get_valid_filename(os.path.basename(filename or ""))
+    except SuspiciousFileOperation:
+        raise UploadError("filename is not valid")
+
+    with transaction.atomic():
+        upload = AssetUpload.objects.create(
+            product_id=product_id,
+            seller_id=seller_id,
+            filename=filename,
+            size=size,
+            chunk_size=chunk_size(),
+        )
+
+        path = private_storage.path(upload.part_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+
+    return upload
+
+
+def chunk_length(upload: AssetUpload, index: int) -> int:
+    return min(upload.chunk_size, upload.size - index * upload.chunk_size)
+
+
+def write_chunk(upload: AssetUpload, index: int, stream, length: int) -> bool:
+    """
+    Copy one chunk from ``stream`` to its offset in the part file with
+    pwrite(), a block at a time, so memory stays constant whatever the
+    chunk size. Returns False when the chunk had already been received;
+    resending one is harmless since it lands on the same bytes.
+    """
+    if upload.status != AssetUpload.StatusChoice.UPLOADING:
+        raise UploadError("Upload is already complete", status=409)
+    if not 0 <= index < upload.chunk_count:
+        raise UploadError(f"Chunk index must be below {upload.chunk_count}")
+    if length != chunk_length(upload, index):
+        raise UploadError(f"Chunk {index} must be {chunk_length(upload, index)} bytes")
+
+    offset = index * upload.chunk_size
+    remaining = length
+    try:
+        fd = os.open(private_storage.path(upload.part_name), os.O_WRONLY)
+    except FileNotFoundError:
+        raise UploadError("Upload is no longer accepting chunks", status=409)
+    try:
+        while remaining:
+            data = stream.read(min(BLOCK_SIZE, remaining))
+            if not data:
+                raise UploadError(f"Chunk {index} ended {remaining} bytes early")
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                offset += written
+                view = view[written:]
+            remaining -= len(data)
+    finally:
+        os.close(fd)
+
+    try:
+        with transaction.atomic():
+            AssetUploadChunk.objects.create(upload=upload, index=index)
+            AssetUpload.objects.filter(pk=upload.pk).update(
+                received_bytes=F("received_bytes") + length,
+                updated_at=timezone.now(),
+            )
+    except IntegrityError:
+        return False
+
+    return True
+
+
+def missing_chunks(upload: AssetUpload) -> list[int]:
+    received = set(upload.chunks.values_list("index", flat=True))
+    return [index for index in range(upload.chunk_count) if index not in received]
+
+
+def complete_upload(upload_id, seller_id: int) -> Product:
+    """
+    Link the finished part file into place, so the data is never copied
+    again, and point the product at it.
+    """
+    with transaction.atomic():
+        upload = (
+            AssetUpload.objects.select_for_update()
+            .select_related("product")
+            .filter(pk=upload_id, seller_id=seller_id)
+            .first()
+        )
+        if upload is None:
+            raise UploadError("Upload not found", status=404)
+        if upload.status != AssetUpload.StatusChoice.UPLOADING:
+            raise UploadError("Upload is already complete", status=409)
+
+        missing = upload.chunk_count - upload.chunks.count()
+        if missing:
+            raise UploadError(f"{missing} chunks are still missing", status=409)
+
+        product = upload.product
+        previous = product.asset.name
+        part_path = private_storage.path(upload.part_name)
+
+        fd = os.open(part_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        name = _link_asset(
+            part_path, product.asset.field.generate_filename(product, upload.filename)
+        )
+
+        try:
+            product.asset.name = name
+            product.save(update_fields=["asset", "updated_at"])
+            upload.chunks.all().delete()
+            AssetUpload.objects.filter(pk=upload.pk).update(
+                status=AssetUpload.StatusChoice.COMPLETE,
+                updated_at=timezone.now(),
+            )
+        except BaseException:
+            private_storage.delete(name)
+            raise
+
+        transaction.on_commit(lambda: remove_part(upload.part_name))
+        if previous and previous != name:
+            transaction.on_commit(lambda: private_storage.delete(previous))
+
+    return product
+
+
+def _link_asset(part_path: str, name: str) -> str:
+    """
+    Hard-link the part file to a free name and return that name. Unlike
+    a rename, link() fails rather than replacing a file that appeared
+    since the name was picked, e.g. when two uploads of the same file
+    name finish together; the next free name is tried then.
+    """
+    for _ in range(LINK_ATTEMPTS):
+        name = private_storage.get_available_name(name)
+        path = private_storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            os.link(part_path, path)
+        except FileExistsError:
+            continue
+        return name
+
+    raise UploadError("Could not find a free name for the asset", status=409)
+
+
+def discard_upload(upload: AssetUpload) -> None:
+    # The post_delete signal removes the part file.
+    upload.delete()
+
+
+def cleanup_stale_uploads(older_than: timedelta = STALE_AFTER) -> int:
+    """
+    Delete uploads nobody has sent a chunk to for ``older_than``; the
+    post_delete signal removes their part files. Part files left without
+    a row, e.g. by a crash between the two, are swept as well.
+    """
+    cutoff = timezone.now() - older_than
+    _, deleted = AssetUpload.objects.filter(
+        status=AssetUpload.StatusChoice.UPLOADING, updated_at__lt=cutoff
+    ).delete()
+
+    parts = _old_part_files(cutoff)
+    known = set(AssetUpload.objects.filter(pk__in=parts).values_list("pk", flat=True))
+    for upload_id, name in parts.items():
+        if upload_id not in known:
+            private_storage.delete(name)
+
+    return deleted.get(AssetUpload._meta.label, 0)
+
+
+def _old_part_files(cutoff) -> dict[uuid.UUID, str]:
+    if not private_storage.exists(UPLOAD_DIR):
+        return {}
+
+    parts = {}
+    for filename in private_storage.listdir(UPLOAD_DIR)[1]:
+        stem, _, suffix = filename.rpartition(".")
+        if suffix != "part":
+            continue
+        try:
+            upload_id = uuid.UUID(stem)
+        except ValueError:
+            continue
+        name = f"{UPLOAD_DIR}/{filename}"
+        if private_storage.get_modified_time(name) < cutoff:
+            parts[upload_id] = name
+    return parts
+
+
+def remove_part(name: str) -> None:
+    try:
+        os.remove(private_storage.path(name))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,175 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import connections, transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_migrate,
+    post_save,
+)
+from django.dispatch import receiver
+
+from digital_store.models import AssetUpload, Category, Product
+from digital_store.services import (
+    autocomplete,
+    cache_versions,
+    permissions,
+    search,
+    store_stats,
+    uploads,
+)
+
+
+User = get_user_model()
+
+
+AUTOCOMPLETE_KINDS = {
+    Product: autocomplete.PRODUCT,
+    Category: autocomplete.CATEGORY,
+}
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+
+    if search.FTS_TABLE not in connection.introspection.table_names():
+        return
+
+    with connection.cursor() as cursor:
+        search.install_sqlite_triggers(cursor)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Category)
+def index_autocomplete_name(sender, instance, **kwargs):
+    kind = AUTOCOMPLETE_KINDS[sender]
+    transaction.on_commit(
+        lambda: autocomplete.index_object(kind, instance.pk, instance.name)
+    )
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Category)
+def unindex_autocomplete_name(sender, instance, **kwargs):
+    kind = AUTOCOMPLETE_KINDS[sender]
+    pk = instance.pk
+    transaction.on_commit(lambda: autocomplete.unindex_object(kind, pk))
+
+
+# Stamps are bumped once the change commits; bumped earlier, a
+# concurrent request could cache the old rows under the new stamp.
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def bump_catalog_version(sender, **kwargs):
+    transaction.on_commit(lambda: cache_versions.bump_version(cache_versions.CATALOG))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_category_version(sender, **kwargs):
+    transaction.on_commit(
+        lambda: cache_versions.bump_version(cache_versions.CATALOG, cache_versions.CATEGORY)
+    )
+
+
+@receiver(m2m_changed, sender=Product.category.through)
+def bump_product_category_version(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        transaction.on_commit(
+            lambda: cache_versions.bump_version(cache_versions.CATALOG, cache_versions.CATEGORY)
+        )
+
+
+@receiver(post_init, sender=User)
+def remember_loaded_role(sender, instance, **kwargs):
+    # Deferred fields are skipped, reading them here would cost a query.
+    instance._loaded_role = instance.__dict__.get("role")
+
+
+@receiver(post_save, sender=User)
+def count_saved_user(sender, instance, created, **kwargs):
+    is_seller = instance.role == User.UserRole.SELLER
+
+    if created:
+        store_stats.increment(store_stats.USERS)
+        if is_seller:
+            store_stats.increment(store_stats.SELLERS)
+    elif instance._loaded_role is not None:
+        was_seller = instance._loaded_role == User.UserRole.SELLER
+        if is_seller != was_seller:
+            store_stats.increment(store_stats.SELLERS, 1 if is_seller else -1)
+
+    instance._loaded_role = instance.role
+
+
+@receiver(post_delete, sender=User)
+def count_deleted_user(sender, instance, **kwargs):
+    store_stats.increment(store_stats.USERS, -1)
+    if instance.role == User.UserRole.SELLER:
+        store_stats.increment(store_stats.SELLERS, -1)
+
+
+@receiver(post_save, sender=Product)
+def count_saved_product(sender, instance, created, **kwargs):
+    if created:
+        store_stats.increment(store_stats.PRODUCTS)
+
+
+@receiver(post_delete, sender=Product)
+def count_deleted_product(sender, instance, **kwargs):
+    store_stats.increment(store_stats.PRODUCTS, -1)
+
+
+@receiver(post_save, sender=User)
+def bump_new_user_permissions(sender, instance, created, **kwargs):
+    # A fresh stamp keeps a reused primary key from picking up the
+    # cached permissions of a deleted or rolled back user.
+    if created:
+        permissions.invalidate_user_permissions(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def bump_deleted_user_permissions(sender, instance, **kwargs):
+    permissions.invalidate_user_permissions(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def bump_user_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        permissions.invalidate_user_permissions(instance.pk)
+    elif pk_set:
+        permissions.invalidate_user_permissions(*pk_set)
+    else:
+        # A cleared group or permission does not say which users it had.
+        permissions.invalidate_group_permissions()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def bump_group_permissions(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        permissions.invalidate_group_permissions()
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@receiver(post_delete, sender=Group)
+def bump_all_permissions(sender, **kwargs):
+    permissions.invalidate_group_permissions()
+
+
+@receiver(post_delete, sender=AssetUpload)
+def remove_upload_part(sender, instance, **kwargs):
+    # Covers every way a row goes: discarded, cleaned up, deleted with
+    # its product or seller, or from the admin. The pk is gone by commit
+    # time, so take the name now.
+    name = instance.part_name
+    transaction.on_commit(lambda: uploads.remove_part(name))
@@ -0,0 +1,66 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from digital_store.models import Category, Product
+
+
+class CatalogApiTests(TestCase):
+    def setUp(self):
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        get_user_model().objects.create_user(username="customer", role="CS")
+        self.category = Category.objects.create(name="Music", description="Tracks")
+        self.products = []
+        for i in range(5):
+            product = Product.objects.create(
+                name=f"Track {i}", price=Decimal(10 + i), seller=self.seller
+            )
+            product.category.add(self.category)
+            self.products.append(product)
+
+    def test_product_list_cursor_pagination(self):
+        url = reverse("api-v1:product-list")
+        first = self.client.get(url, {"limit": 3, "ordering": "price"}).json()
+        second = self.client.get(
+            url, {"limit": 3, "ordering": "price", "cursor": first["next"]}
+        ).json()
+
+        self.assertEqual(
+            [item["name"] for item in first["results"] + second["results"]],
+            [f"Track {i}" for i in range(5)],
+        )
+        self.assertIsNone(second["next"])
+        self.assertEqual(first["results"][0]["categories"], [{"id": self.category.pk, "name": "Music"}])
+        self.assertEqual(first["results"][0]["price"], "10.00")
+
+    def test_sparse_fieldsets_and_batch_lookup_in_one_query(self):
+        ids = f"{self.products[0].pk},{self.products[2].pk}"
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("api-v1:product-list"), {"ids": ids, "fields": "id,name"}
+            )
+
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"id": self.products[2].pk, "name": "Track 2"},
+                {"id": self.products[0].pk, "name": "Track 0"},
+            ],
+        )
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse("api-v1:product-list"), {"fields": "password"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_sellers_and_category_detail(self):
+        sellers = self.client.get(reverse("api-v1:seller-list")).json()["results"]
+        category = self.client.get(reverse("api-v1:category-detail", args=[self.category.pk]))
+        missing = self.client.get(reverse("api-v1:product-detail", args=[999]))
+
+        self.assertEqual([seller["username"] for seller in sellers], ["seller"])
+        self.assertEqual(category.json()["name"], "Music")
+        self.assertEqual(missing.status_code, 404)
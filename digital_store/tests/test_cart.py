@@ -0,0 +1,240 @@
+import json
+import threading
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from digital_store.models import Cart, CartProduct, Order, Product
+from digital_store.services.cart import add_to_cart, reduce_in_cart, remove_from_cart
+from digital_store.services.checkout import checkout
+
+
+class CartMutationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="customer")
+        seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.product = Product.objects.create(name="Track", price=1, seller=seller)
+        self.client.force_login(self.user)
+
+    def quantity(self):
+        line = CartProduct.objects.filter(cart__customer=self.user, product=self.product).first()
+        return line.quantity if line else None
+
+    def test_first_add_creates_cart_and_line(self):
+        self.assertTrue(add_to_cart(self.user.pk, self.product.pk))
+
+        self.assertTrue(Cart.objects.filter(customer=self.user).exists())
+        self.assertEqual(self.quantity(), 1)
+
+    def test_increase_reduce_delete(self):
+        Cart.objects.create(customer=self.user)
+
+        with self.assertNumQueries(1):
+            add_to_cart(self.user.pk, self.product.pk)
+        add_to_cart(self.user.pk, self.product.pk, quantity=2)
+        self.assertEqual(self.quantity(), 3)
+
+        add_to_cart(self.user.pk, self.product.pk, increment=False)
+        self.assertEqual(self.quantity(), 3)
+
+        with self.assertNumQueries(1):
+            reduce_in_cart(self.user.pk, self.product.pk)
+        self.assertEqual(self.quantity(), 2)
+
+        self.assertTrue(remove_from_cart(self.user.pk, self.product.pk))
+        self.assertIsNone(self.quantity())
+        self.assertFalse(reduce_in_cart(self.user.pk, self.product.pk))
+
+    def test_reduce_drops_last_item(self):
+        add_to_cart(self.user.pk, self.product.pk)
+        reduce_in_cart(self.user.pk, self.product.pk)
+
+        self.assertIsNone(self.quantity())
+
+    def test_unknown_product_is_not_found(self):
+        response = self.client.post(
+            reverse("digital_store:cart-add", args=[self.product.pk + 100]),
+            {"action": "increase"},
+        )
+
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(
+            reverse("digital_store:cart-add", args=[self.product.pk + 100])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_repeated_add_keeps_the_line(self):
+        url = reverse("digital_store:cart-add", args=[self.product.pk])
+
+        for _ in range(2):
+            response = self.client.post(url)
+            self.assertRedirects(response, reverse("digital_store:cart-list"))
+
+        self.assertEqual(self.quantity(), 1)
+
+
+class CartBatchTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="customer")
+        seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.track = Product.objects.create(name="Track", price=Decimal("2.50"), seller=seller)
+        self.album = Product.objects.create(name="Album", price=Decimal("10"), seller=seller)
+        add_to_cart(self.user.pk, self.album.pk)
+        self.client.force_login(self.user)
+        self.url = reverse("digital_store:cart-batch")
+
+    def post(self, payload):
+        return self.client.post(self.url, json.dumps(payload), content_type="application/json")
+
+    def test_applies_changes_and_returns_summary(self):
+        response = self.post(
+            {
+                "changes": [
+                    {"product": self.track.pk, "quantity": 4},
+                    {"product": self.album.pk, "quantity": 0},
+                    {"product": self.album.pk + 100, "quantity": 1},
+                ]
+            }
+        )
+
+        self.assertEqual(
+            response.json(),
+            {"item_count": 4, "total": "10.00", "unknown_products": [self.album.pk + 100]},
+        )
+        self.assertEqual(
+            list(CartProduct.objects.values_list("product_id", "quantity")),
+            [(self.track.pk, 4)],
+        )
+
+    def test_updates_existing_line_in_place(self):
+        self.post({"changes": [{"product": self.album.pk, "quantity": 7}]})
+
+        self.assertEqual(CartProduct.objects.get(product=self.album).quantity, 7)
+
+    def test_rejects_malformed_payload(self):
+        self.assertEqual(self.post({"changes": [{"product": "x"}]}).status_code, 400)
+        self.assertEqual(
+            self.client.post(self.url, "not json", content_type="application/json").status_code,
+            400,
+        )
+
+    def test_requires_login(self):
+        self.client.logout()
+
+        self.assertEqual(self.post({"changes": []}).status_code, 403)
+
+
+class CheckoutTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="customer")
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.track = Product.objects.create(name="Track", price=Decimal("2.50"), seller=self.seller)
+        self.album = Product.objects.create(name="Album", price=Decimal("10"), seller=self.seller)
+        add_to_cart(self.user.pk, self.track.pk, quantity=2)
+        add_to_cart(self.user.pk, self.album.pk)
+        self.client.force_login(self.user)
+
+    def test_copies_cart_into_order_and_empties_it(self):
+        with self.assertNumQueries(10):
+            order = checkout(self.user.pk)
+
+        self.assertEqual((order.item_count, order.total), (2, Decimal("15")))
+        self.assertEqual(
+            sorted(order.order_items.values_list("product_id", "quantity", "unit_price", "seller_id")),
+            [
+                (self.track.pk, 2, Decimal("2.50"), self.seller.pk),
+                (self.album.pk, 1, Decimal("10"), self.seller.pk),
+            ],
+        )
+        self.assertFalse(CartProduct.objects.exists())
+
+    def test_empty_cart_places_no_order(self):
+        checkout(self.user.pk)
+
+        self.assertIsNone(checkout(self.user.pk))
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_retried_submit_returns_the_same_order(self):
+        url = reverse("digital_store:order-create")
+        self.client.post(url, {"idempotency_key": "abc"})
+        add_to_cart(self.user.pk, self.album.pk)
+
+        self.client.post(url, {"idempotency_key": "abc"})
+        order = Order.objects.get()
+
+        self.assertEqual(order.idempotency_key, "abc")
+        self.assertTrue(CartProduct.objects.exists())
+        self.assertEqual(checkout(self.user.pk, "abc"), order)
+
+    def test_idempotency_key_header(self):
+        url = reverse("digital_store:order-create")
+        self.client.post(url, headers={"Idempotency-Key": "xyz"})
+        add_to_cart(self.user.pk, self.album.pk)
+        self.client.post(url, headers={"Idempotency-Key": "xyz"})
+
+        self.assertEqual(Order.objects.count(), 1)
+
+
+class ConcurrentCartTests(TransactionTestCase):
+    threads = 8
+    clicks = 10
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="customer")
+        seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.product = Product.objects.create(name="Track", price=1, seller=seller)
+        Cart.objects.create(customer=self.user)
+
+    def run_concurrently(self, target):
+        barrier = threading.Barrier(self.threads)
+        errors = []
+
+        def click():
+            # SQLite's shared-cache test database fails concurrent writers
+            # with "locked" instead of waiting, so retry those.
+            for _ in range(200):
+                try:
+                    with transaction.atomic():
+                        return target()
+                except OperationalError as error:
+                    if "locked" not in str(error):
+                        raise
+                    time.sleep(0.005)
+            raise AssertionError("Cart stayed locked")
+
+        def worker():
+            try:
+                barrier.wait()
+                for _ in range(self.clicks):
+                    click()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+    def test_concurrent_increments_are_not_lost(self):
+        self.run_concurrently(lambda: add_to_cart(self.user.pk, self.product.pk))
+
+        line = CartProduct.objects.get(cart__customer=self.user, product=self.product)
+        self.assertEqual(line.quantity, self.threads * self.clicks)
+
+    def test_concurrent_checkouts_place_one_order(self):
+        add_to_cart(self.user.pk, self.product.pk)
+
+        self.run_concurrently(lambda: checkout(self.user.pk, idempotency_key="submit"))
+
+        order = Order.objects.get(customer=self.user)
+        self.assertEqual(order.item_count, 1)
+        self.assertFalse(CartProduct.objects.exists())
@@ -0,0 +1,131 @@
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from digital_store.models import Order, OrderProduct, Product
+from digital_store.services.downloads import downloadable_asset, sign_download
+
+
+CONTENT = b"0123456789" * 10
+
+
+class DownloadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(PRIVATE_MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.buyer = get_user_model().objects.create_user(username="buyer")
+        self.product = Product.objects.create(name="Album", price=10, seller=self.seller)
+        self.product.asset.save("album.zip", ContentFile(CONTENT))
+        self.order = Order.objects.create(
+            customer=self.buyer, status=Order.StatusChoice.COMPLETED
+        )
+        OrderProduct.objects.create(order=self.order, product=self.product)
+
+    def download_url(self, user):
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse("digital_store:product-download", args=[self.product.pk])
+        )
+        self.assertEqual(response.status_code, 302)
+        self.client.logout()
+        return response.url
+
+    def get(self, url, **headers):
+        response = self.client.get(url, headers=headers)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_ownership_is_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                downloadable_asset(self.product.pk, self.buyer.pk), self.product.asset.name
+            )
+
+    def test_buyer_and_seller_can_download(self):
+        for user in (self.buyer, self.seller):
+            url = self.download_url(user)
+            with self.assertNumQueries(0):
+                response, body = self.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(body, CONTENT)
+            self.assertEqual(response["Accept-Ranges"], "bytes")
+            self.assertEqual(response["Content-Length"], str(len(CONTENT)))
+            self.assertIn('attachment; filename="album', response["Content-Disposition"])
+
+    def test_unpaid_or_foreign_orders_cannot_download(self):
+        stranger = get_user_model().objects.create_user(username="stranger")
+        Order.objects.filter(pk=self.order.pk).update(status=Order.StatusChoice.PENDING)
+
+        for user in (self.buyer, stranger):
+            self.client.force_login(user)
+            response = self.client.get(
+                reverse("digital_store:product-download", args=[self.product.pk])
+            )
+            self.assertEqual(response.status_code, 404)
+
+    def test_range_requests(self):
+        url = self.download_url(self.buyer)
+
+        response, body = self.get(url, Range="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, CONTENT[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(CONTENT)}")
+        self.assertEqual(response["Content-Length"], "10")
+
+        response, body = self.get(url, Range="bytes=95-")
+        self.assertEqual((response.status_code, body), (206, CONTENT[95:]))
+
+        response, body = self.get(url, Range="bytes=-3")
+        self.assertEqual((response.status_code, body), (206, CONTENT[-3:]))
+
+        response, _ = self.get(url, Range="bytes=500-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(CONTENT)}")
+
+    def test_stale_if_range_gets_the_whole_file(self):
+        url = self.download_url(self.buyer)
+        response, _ = self.get(url)
+
+        response, body = self.get(url, Range="bytes=0-0", **{"If-Range": response["ETag"]})
+        self.assertEqual((response.status_code, body), (206, CONTENT[:1]))
+
+        response, body = self.get(url, Range="bytes=0-0", **{"If-Range": '"old"'})
+        self.assertEqual((response.status_code, body), (200, CONTENT))
+
+    def test_tampered_and_expired_links_are_refused(self):
+        url = self.download_url(self.buyer)
+
+        self.assertEqual(self.client.get(url[:-3] + "xx/").status_code, 403)
+        with override_settings(ASSET_DOWNLOAD_MAX_AGE=-1):
+            self.assertEqual(self.client.get(url).status_code, 403)
+
+    @override_settings(
+        ASSET_DOWNLOAD_OFFLOAD="x-accel-redirect",
+        ASSET_ACCEL_REDIRECT_PREFIX="/protected/",
+    )
+    def test_offload_to_web_server(self):
+        token = sign_download(self.product.pk, self.buyer.pk, self.product.asset.name)
+
+        response = self.client.get(reverse("digital_store:asset-download", args=[token]))
+
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected/{self.product.asset.name}")
+
+    def test_order_history_links_completed_purchases(self):
+        self.client.force_login(self.buyer)
+
+        response = self.client.get(reverse("digital_store:order-list"))
+
+        self.assertContains(
+            response, reverse("digital_store:product-download", args=[self.product.pk])
+        )
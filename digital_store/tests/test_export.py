@@ -0,0 +1,48 @@
+import json
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from digital_store.models import Category, Product
+
+
+class CatalogExportTests(TestCase):
+    def setUp(self):
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        music = Category.objects.create(name="Music", description="Tracks")
+        games = Category.objects.create(name="Games", description="Games")
+        for i in range(5):
+            product = Product.objects.create(
+                name=f"Item {i}", price=Decimal("1.50"), seller=self.seller
+            )
+            product.category.add(music, games)
+
+    def test_command_exports_jsonl_in_chunks(self):
+        output = StringIO()
+
+        call_command("export_catalog", "--format", "jsonl", "--chunk-size", "2", stdout=output)
+
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([row["name"] for row in rows], [f"Item {i}" for i in range(5)])
+        self.assertEqual(rows[0]["categories"], ["Games", "Music"])
+        self.assertEqual(rows[0]["seller"], "seller")
+        self.assertEqual(rows[0]["price"], "1.50")
+
+    def test_endpoint_streams_csv_for_staff_only(self):
+        url = reverse("digital_store:catalog-export")
+        self.client.force_login(self.seller)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.seller.is_staff = True
+        self.seller.save()
+        response = self.client.get(url)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(lines[0].split(",")[:3], ["id", "name", "description"])
+        self.assertEqual(len(lines), 6)
+        self.assertIn("Games|Music", lines[1])
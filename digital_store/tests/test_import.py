@@ -0,0 +1,87 @@
+import json
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from digital_store.models import Category, Product
+from digital_store.services import import_products
+
+
+class ImportProductsTests(TestCase):
+    def setUp(self):
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.music = Category.objects.create(name="Music", description="Tracks")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "products.jsonl"
+        rows = [
+            {"sku": f"SKU-{i}", "name": f"Track {i}", "price": "9.99", "categories": ["music"]}
+            for i in range(5)
+        ]
+        rows.insert(2, {"sku": "BAD", "name": "Broken", "price": "free"})
+        self.path.write_text("\n".join(json.dumps(row) for row in rows))
+
+    def run_import(self, *args):
+        output = StringIO()
+        call_command(
+            "import_products", str(self.path), "--seller", "seller",
+            "--batch-size", "2", "--workers", "0", *args,
+            stdout=output, stderr=StringIO(),
+        )
+        return output.getvalue()
+
+    def test_imports_valid_rows_with_categories(self):
+        output = self.run_import()
+
+        self.assertIn("Imported 5 products from 6 rows", output)
+        self.assertEqual(self.music.category_products.count(), 5)
+        self.assertEqual(Product.objects.get(sku="SKU-0").price, Decimal("9.99"))
+
+    def test_resume_after_failure_creates_no_duplicates(self):
+        write_batch = import_products._write_batch
+        calls = []
+
+        def failing_write(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError("database went away")
+            return write_batch(*args)
+
+        with mock.patch.object(import_products, "_write_batch", failing_write):
+            with self.assertRaises(RuntimeError):
+                self.run_import()
+
+        self.assertEqual(Product.objects.count(), 2)
+        self.assertEqual(import_products.read_checkpoint(self.path), 2)
+
+        self.run_import("--resume")
+        self.run_import()
+
+        self.assertEqual(Product.objects.filter(seller=self.seller).count(), 5)
+
+    def test_malformed_lines_are_row_errors(self):
+        with self.path.open("a") as file:
+            file.write('\n{"sku": "SKU-9", "name": \n')
+            file.write('["not", "an", "object"]\n')
+            file.write('{"sku": "SKU-8", "name": "Tag", "price": 1, "categories": 3}\n')
+            file.write(json.dumps({"sku": "SKU-7", "name": "Track 7", "price": "1.50"}))
+
+        report = import_products.import_products(
+            self.path, self.seller, file_format="jsonl", batch_size=2, workers=0
+        )
+
+        self.assertEqual(report.created, 6)
+        self.assertEqual([line for line, _ in report.errors], [3, 7, 8, 9])
+        self.assertTrue(report.errors[1][1].startswith("invalid JSON"))
+        self.assertEqual(report.errors[2][1], "row must be a JSON object")
+
+    def test_process_pool_validation(self):
+        output = self.run_import("--workers", "2")
+
+        self.assertIn("Imported 5 products", output)
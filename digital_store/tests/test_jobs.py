@@ -0,0 +1,159 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from digital_store.models import Job, Order, Product
+from digital_store.services import jobs
+from digital_store.services.cart import add_to_cart
+
+
+def failing_handler(payloads):
+    raise RuntimeError("delivery failed")
+
+
+def picky_handler(payloads):
+    if any(payload.get("bad") for payload in payloads):
+        raise RuntimeError("bad payload")
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="customer")
+        seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.product = Product.objects.create(name="Track", price=Decimal("2.50"), seller=seller)
+
+    def place_order(self):
+        add_to_cart(self.user.pk, self.product.pk)
+        self.client.force_login(self.user)
+        self.client.post(reverse("digital_store:order-create"))
+        return Order.objects.latest("id")
+
+    def test_checkout_enqueues_fulfilment_once(self):
+        self.client.force_login(self.user)
+        add_to_cart(self.user.pk, self.product.pk)
+        url = reverse("digital_store:order-create")
+        self.client.post(url, {"idempotency_key": "abc"})
+        self.client.post(url, {"idempotency_key": "abc"})
+
+        order = Order.objects.get()
+        job = Job.objects.get()
+
+        self.assertEqual(order.status, Order.StatusChoice.PENDING)
+        self.assertEqual((job.kind, job.payload), (jobs.FULFIL_ORDERS, {"order": order.pk}))
+
+    def test_worker_completes_orders_in_bulk(self):
+        orders = [self.place_order() for _ in range(3)]
+        cancelled = orders.pop()
+        Order.objects.filter(pk=cancelled.pk).update(status=Order.StatusChoice.CANCELLED)
+
+        call_command("run_worker", "--once", "--threads", "1", stdout=StringIO())
+
+        self.assertEqual(
+            set(Order.objects.values_list("status", flat=True).filter(pk__in=[o.pk for o in orders])),
+            {Order.StatusChoice.COMPLETED},
+        )
+        cancelled.refresh_from_db()
+        self.assertEqual(cancelled.status, Order.StatusChoice.CANCELLED)
+        self.assertFalse(Job.objects.exclude(status=Job.StatusChoice.DONE).exists())
+
+    def test_worker_retries_after_an_error(self):
+        order = self.place_order()
+        claim = jobs.claim
+        calls = []
+
+        def flaky_claim(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise OperationalError("database is locked")
+            return claim(*args, **kwargs)
+
+        with mock.patch.object(jobs, "claim", flaky_claim), self.assertLogs("digital_store.jobs"):
+            call_command(
+                "run_worker", "--once", "--threads", "1", "--poll-interval", "0",
+                stdout=StringIO(),
+            )
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, Order.StatusChoice.COMPLETED)
+
+    def test_crashed_workers_fail_the_command(self):
+        failing_claim = mock.Mock(side_effect=OperationalError("database is locked"))
+
+        with mock.patch.object(jobs, "claim", failing_claim), self.assertLogs("digital_store.jobs"):
+            with self.assertRaisesMessage(CommandError, "1 workers crashed"):
+                call_command(
+                    "run_worker", "--once", "--threads", "1", "--poll-interval", "0",
+                    "--max-errors", "3", stdout=StringIO(),
+                )
+
+        self.assertEqual(failing_claim.call_count, 3)
+
+    def test_claims_do_not_overlap(self):
+        for pk in range(5):
+            jobs.enqueue("noop", {"order": pk})
+
+        first = jobs.claim("a", batch_size=3)
+        second = jobs.claim("b", batch_size=3)
+
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertFalse({job.pk for job in first} & {job.pk for job in second})
+        self.assertEqual(jobs.claim("c"), [])
+
+    def test_future_jobs_wait(self):
+        jobs.enqueue("noop", {}, run_after=timezone.now() + timedelta(minutes=1))
+
+        self.assertEqual(jobs.claim("a"), [])
+
+    @override_settings(JOB_HANDLERS={"broken": "digital_store.tests.test_jobs.failing_handler"})
+    def test_failures_back_off_then_give_up(self):
+        job = jobs.enqueue("broken", {}, run_after=timezone.now())
+        Job.objects.filter(pk=job.pk).update(max_attempts=2)
+
+        with self.assertLogs("digital_store.jobs", "WARNING"):
+            self.assertEqual(jobs.run_jobs(jobs.claim("a")), (0, 1))
+        job.refresh_from_db()
+
+        self.assertEqual((job.status, job.attempts), (Job.StatusChoice.QUEUED, 1))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("delivery failed", job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs("digital_store.jobs", "WARNING"):
+            jobs.run_jobs(jobs.claim("a"))
+        job.refresh_from_db()
+
+        self.assertEqual((job.status, job.attempts), (Job.StatusChoice.FAILED, 2))
+
+    @override_settings(JOB_HANDLERS={"picky": "digital_store.tests.test_jobs.picky_handler"})
+    def test_only_the_failing_job_of_a_batch_loses_an_attempt(self):
+        good = [jobs.enqueue("picky", {}) for _ in range(2)]
+        bad = jobs.enqueue("picky", {"bad": True})
+
+        with self.assertLogs("digital_store.jobs", "INFO") as logs:
+            self.assertEqual(jobs.run_jobs(jobs.claim("a")), (2, 1))
+
+        self.assertEqual(sum("WARNING" in line for line in logs.output), 1)
+        self.assertEqual(
+            set(Job.objects.filter(pk__in=[job.pk for job in good]).values_list("status", flat=True)),
+            {Job.StatusChoice.DONE},
+        )
+        bad.refresh_from_db()
+        self.assertEqual((bad.status, bad.attempts), (Job.StatusChoice.QUEUED, 1))
+        self.assertIn("bad payload", bad.last_error)
+
+    def test_abandoned_jobs_are_requeued(self):
+        jobs.enqueue("noop", {})
+        jobs.claim("crashed")
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(jobs.requeue_stale(timedelta(minutes=10)), 1)
+        self.assertEqual(len(jobs.claim("a")), 1)
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from accounts.services.token_service import account_activation_token
+from digital_store.services.add_users import add_users
+from digital_store.services.permissions import SELLER_GROUP, SELLER_PERMISSIONS, cache_key
+
+
+User = get_user_model()
+
+
+class SellerPermissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.get(name=SELLER_GROUP)
+        self.seller = User.objects.create_user(username="seller", role="SL", is_active=False)
+
+    def activate(self, user):
+        uid = urlsafe_base64_encode(force_bytes(user.pk))
+        token = account_activation_token.make_token(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse("accounts:activate", args=[uid, token]))
+
+    def fresh(self, user):
+        return User.objects.get(pk=user.pk)
+
+    def test_seller_group_has_store_permissions(self):
+        self.assertEqual(
+            {
+                f"{app_label}.{codename}"
+                for app_label, codename in self.group.permissions.values_list(
+                    "content_type__app_label", "codename"
+                )
+            },
+            set(SELLER_PERMISSIONS),
+        )
+
+    def test_activated_seller_can_manage_catalog(self):
+        customer = User.objects.create_user(username="customer")
+
+        self.activate(self.seller)
+        self.client.force_login(self.seller)
+        seller_response = self.client.get(reverse("digital_store:category-create"))
+        self.client.force_login(customer)
+        customer_response = self.client.get(reverse("digital_store:category-create"))
+
+        self.assertEqual(list(self.seller.groups.all()), [self.group])
+        self.assertFalse(self.seller.user_permissions.exists())
+        self.assertEqual(seller_response.status_code, 200)
+        self.assertEqual(customer_response.status_code, 403)
+
+    def test_resolved_permissions_are_cached_across_requests(self):
+        self.activate(self.seller)
+        self.assertTrue(self.fresh(self.seller).has_perms(SELLER_PERMISSIONS))
+
+        user = self.fresh(self.seller)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perms(SELLER_PERMISSIONS))
+
+    def test_group_changes_invalidate_cached_permissions(self):
+        self.activate(self.seller)
+        self.assertTrue(self.fresh(self.seller).has_perm("digital_store.can_add_category"))
+
+        key = cache_key(self.seller)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.remove(Permission.objects.get(codename="can_add_category"))
+            # Not before the commit, or a concurrent request could cache
+            # the old permissions under the new stamp.
+            self.assertEqual(cache_key(self.seller), key)
+
+        self.assertFalse(self.fresh(self.seller).has_perm("digital_store.can_add_category"))
+
+    def test_user_changes_invalidate_cached_permissions(self):
+        self.seller.is_active = True
+        self.seller.save()
+        self.assertFalse(self.fresh(self.seller).has_perm("digital_store.can_add_product"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.seller.user_permissions.add(Permission.objects.get(codename="can_add_product"))
+        self.assertTrue(self.fresh(self.seller).has_perm("digital_store.can_add_product"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.user_set.add(self.seller)
+            self.seller.user_permissions.clear()
+        self.assertTrue(self.fresh(self.seller).has_perm("digital_store.can_add_category"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.user_set.clear()
+        self.assertFalse(self.fresh(self.seller).has_perm("digital_store.can_add_category"))
+
+    def test_generated_sellers_join_the_group(self):
+        first, last = add_users(customers=2, sellers=3, seed=0)
+
+        self.assertEqual(
+            list(
+                User.objects.filter(pk__range=(first, last), groups=self.group)
+                .values_list("role", flat=True)
+                .distinct()
+            ),
+            ["SL"],
+        )
+        self.assertEqual(self.group.user_set.filter(pk__range=(first, last)).count(), 3)
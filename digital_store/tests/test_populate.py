@@ -0,0 +1,109 @@
+from contextlib import contextmanager
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import NOT_PROVIDED
+from django.test import TestCase
+
+from digital_store.models import Cart, CartProduct, Category, Order, OrderProduct, Product, StoreCounter
+from digital_store.services import bulk_write
+from digital_store.services.store_stats import PRODUCTS, USERS
+
+
+class PopulateDbTests(TestCase):
+    def populate(self, *args):
+        call_command("populate_db", *args, stdout=StringIO())
+
+    def test_defaults_match_original_dataset(self):
+        self.populate()
+
+        self.assertEqual(Category.objects.count(), 9)
+        self.assertEqual(get_user_model().objects.count(), 51)
+        self.assertEqual(get_user_model().objects.filter(role="SL").count(), 13)
+        self.assertEqual(Product.objects.count(), 37)
+        self.assertEqual(Product.category.through.objects.count(), 37)
+        self.assertFalse(Order.objects.exists())
+
+    def test_sizes_and_relations(self):
+        self.populate(
+            "--categories=12", "--users=20", "--sellers=4", "--products=50",
+            "--carts=10", "--orders=30", "--items-per-order=4", "--chunk-size=7",
+            "--seed=1",
+        )
+
+        self.assertEqual(Category.objects.count(), 12)
+        self.assertEqual(Product.objects.filter(seller__role="SL").count(), 50)
+        self.assertEqual(Cart.objects.filter(customer__role="CS").count(), 10)
+        self.assertEqual(CartProduct.objects.count(), 30)
+        self.assertEqual(Order.objects.count(), 30)
+        self.assertEqual(OrderProduct.objects.count(), 120)
+        counters = dict(StoreCounter.objects.values_list("name", "value"))
+        self.assertEqual(counters[USERS], 24)
+        self.assertEqual(counters[PRODUCTS], 50)
+
+    def test_seed_is_reproducible(self):
+        self.populate("--seed=7", "--products=5")
+        first = list(Product.objects.order_by("id").values_list("price", flat=True))
+        Product.objects.all().delete()
+        get_user_model().objects.all().delete()
+
+        self.populate("--seed=7", "--products=5")
+        second = list(Product.objects.order_by("id").values_list("price", flat=True))
+
+        self.assertEqual(first, second)
+
+
+class CopyColumnsTests(TestCase):
+    """
+    SQLite cannot run COPY, so these check what the PostgreSQL path
+    would send: every NOT NULL column without a database default must
+    be written, or COPY fails.
+    """
+
+    def test_copy_writes_every_required_column(self):
+        written = []
+
+        def record_copy(model, fields, chunk):
+            written.append((model, fields))
+            model.objects.bulk_create([model(**dict(zip(fields, row))) for row in chunk])
+
+        with mock.patch.object(connection, "vendor", "postgresql"), \
+                mock.patch.object(bulk_write, "_copy_chunk", record_copy):
+            call_command("populate_db", "--carts=2", "--orders=2", stdout=StringIO())
+
+        self.assertTrue(written)
+        for model, fields in written:
+            columns = {model._meta.get_field(name).column for name in fields}
+            required = {
+                field.column
+                for field in model._meta.concrete_fields
+                if not field.null
+                and not field.primary_key
+                and not field.generated
+                and field.db_default is NOT_PROVIDED
+            }
+            with self.subTest(model=model._meta.label):
+                self.assertLessEqual(required, columns)
+
+    def test_empty_strings_are_not_copied_as_null(self):
+        copied = {}
+
+        class Cursor:
+            def copy_expert(self, sql, file):
+                copied["sql"], copied["data"] = sql, file.read()
+
+        @contextmanager
+        def cursor():
+            yield Cursor()
+
+        with mock.patch.object(connection, "cursor", cursor):
+            bulk_write._copy_chunk(
+                Product, ("name", "image", "description"), [("Album", "", None)]
+            )
+
+        self.assertIn('("name", "image", "description")', copied["sql"])
+        self.assertIn('FORCE_NOT_NULL ("name", "image")', copied["sql"])
+        self.assertEqual(copied["data"], "Album,,\r\n")
@@ -0,0 +1,93 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from digital_store.services import autocomplete
+from digital_store.services.prefix_index import PrefixIndex
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def test_add_rename_remove(self):
+        index = PrefixIndex.build([("product", 1, "Cooking book")])
+        index.add("product", 2, "Bookshelf")
+        index.add("product", 1, "Baking guide")
+
+        self.assertEqual([s.pk for s in index.search("book")], [2])
+        self.assertEqual([s.name for s in index.search("gui")], ["Baking guide"])
+
+        index.remove("product", 1)
+        index.remove("product", 1)
+        self.assertEqual(index.search("baking"), [])
+        self.assertEqual(len(index), 1)
+
+    def test_overlay_and_base_results_stay_in_key_order(self):
+        index = PrefixIndex.build([("product", 1, "Album a"), ("product", 3, "Album c")])
+        index.add("product", 2, "Album b")
+        index.add("product", 4, "Album c")
+        index.add("product", 2, "Album bb")
+
+        self.assertEqual(
+            [s.name for s in index.search("album")], ["Album a", "Album bb", "Album c", "Album c"]
+        )
+        self.assertEqual(len(index.search("album", limit=2)), 2)
+        self.assertEqual(len(index), 4)
+
+    def test_writes_leave_the_base_untouched(self):
+        index = PrefixIndex.build([("product", 1, "Cooking book"), ("product", 2, "Bookshelf")])
+        keys, refs, names = base = index._base
+        copies = (list(keys), list(refs), dict(names))
+
+        index.add("product", 3, "Book stand")
+        index.add("product", 1, "Baking guide")
+        index.remove("product", 2)
+
+        self.assertIs(index._base, base)
+        self.assertEqual(base, copies)
+        self.assertEqual(index.overlay_size, 3)
+
+
+def join_rebuild():
+    for thread in threading.enumerate():
+        if thread.name == "autocomplete-rebuild":
+            thread.join(5)
+
+
+class AutocompleteRebuildTests(SimpleTestCase):
+    def setUp(self):
+        autocomplete.reset_index()
+        self.addCleanup(autocomplete.reset_index)
+
+    def test_rebuild_runs_in_background_and_keeps_writes(self):
+        loading = threading.Event()
+        release = threading.Event()
+        names = [("product", 1, "Jazz pack")]
+
+        def load_names():
+            loading.set()
+            release.wait(5)
+            yield from names
+
+        with mock.patch.object(autocomplete, "_load_names", load_names):
+            # The first lookup starts the build and does not wait for it.
+            self.assertEqual(autocomplete.suggest("jazz"), [])
+            self.assertTrue(loading.wait(5))
+            autocomplete.index_object("product", 2, "Jazz loops")
+            release.set()
+            join_rebuild()
+
+            self.assertEqual(
+                [s.name for s in autocomplete.suggest("jazz")], ["Jazz loops", "Jazz pack"]
+            )
+
+            # A stale index keeps serving while its replacement loads.
+            loading.clear()
+            release.clear()
+            names += [("product", 2, "Jazz loops"), ("product", 3, "Jazz drums")]
+            with self.settings(AUTOCOMPLETE_REBUILD_SECONDS=0):
+                self.assertEqual(len(autocomplete.suggest("jazz")), 2)
+            self.assertTrue(loading.wait(5))
+            release.set()
+            join_rebuild()
+
+            self.assertEqual(len(autocomplete.suggest("jazz")), 3)
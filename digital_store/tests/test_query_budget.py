@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from digital_store.models import Order, OrderProduct, Product
+from digital_store.services.query_budget import (
+    QueryBudgetExceeded,
+    QueryRecorder,
+    analyze,
+    sql_shape,
+)
+from digital_store.views import OrderListView
+
+
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.customer = get_user_model().objects.create_user(username="customer", password="pass")
+        for i in range(3):
+            Product.objects.create(name=f"Product {i}", price=10, seller=self.seller)
+
+    def test_sql_shape_collapses_parameters(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"),
+            sql_shape("SELECT * FROM t WHERE id IN (%s) AND name = 'y' LIMIT 5"),
+        )
+
+    def test_repeated_query_reports_template_line(self):
+        template = Template(
+            "{% for product in products %}\n{{ product.seller.username }}{% endfor %}"
+        )
+        products = list(Product.objects.all())
+
+        with QueryRecorder() as recorder:
+            template.render(Context({"products": products}))
+
+        findings = analyze(recorder.records, repeat_threshold=3)
+
+        self.assertEqual(len(recorder), 3)
+        self.assertEqual([finding.kind for finding in findings], ["repeated"])
+        self.assertIn(":2 (product.seller.username)", findings[0].origin)
+
+    def test_untraced_recorder_finds_origins_of_suspect_queries_only(self):
+        template = Template(
+            "{% for product in products %}\n{{ product.seller.username }}{% endfor %}"
+        )
+        products = list(Product.objects.all())
+
+        with QueryRecorder(trace=False, repeat_threshold=3) as recorder:
+            template.render(Context({"products": products}))
+        findings = analyze(recorder.records, repeat_threshold=3)
+
+        self.assertEqual(
+            [record.origin is None for record in recorder.records], [True, True, False]
+        )
+        self.assertIn(":2 (product.seller.username)", findings[0].origin)
+
+        with QueryRecorder(trace=False, budget=1) as recorder:
+            Product.objects.count()
+            list(Order.objects.all())
+        findings = analyze(recorder.records, budget=1)
+
+        self.assertIsNone(recorder.records[0].origin)
+        self.assertIn("test_query_budget.py", findings[0].origin)
+
+    def test_budget_violation_raises_under_test_runner(self):
+        self.client.login(username="customer", password="pass")
+
+        with mock.patch.object(OrderListView, "query_budget", 1):
+            with self.assertRaisesMessage(QueryBudgetExceeded, "budget is 1"):
+                self.client.get(reverse("digital_store:order-list"))
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_budget_violation_is_logged_otherwise(self):
+        self.client.login(username="customer", password="pass")
+
+        with mock.patch.object(OrderListView, "query_budget", 1):
+            with self.assertLogs("digital_store.query_budget", "WARNING") as logs:
+                response = self.client.get(reverse("digital_store:order-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("digital_store:order-list", logs.output[0])
+
+    def test_order_list_does_not_repeat_queries_per_order(self):
+        self.client.login(username="customer", password="pass")
+        for _ in range(6):
+            order = Order.objects.create(customer=self.customer)
+            OrderProduct.objects.bulk_create(
+                [
+                    OrderProduct(order=order, product=product, unit_price=product.price)
+                    for product in Product.objects.all()
+                ]
+            )
+
+        response = self.client.get(reverse("digital_store:order-list"))
+
+        self.assertContains(response, "Product 2", count=6)
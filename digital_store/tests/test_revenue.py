@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from digital_store.models import Order, OrderProduct, Product
+from digital_store.services import revenue
+from digital_store.services.orders import snapshot_line_prices
+
+
+class RevenueTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.alice = User.objects.create_user(username="alice", role="SL")
+        self.bob = User.objects.create_user(username="bob", role="SL")
+        self.customer = User.objects.create_user(username="customer")
+        self.course = Product.objects.create(name="Course", price=Decimal("100"), seller=self.alice)
+        self.ebook = Product.objects.create(name="E-book", price=Decimal("15"), seller=self.bob)
+
+        order = Order.objects.create(customer=self.customer)
+        OrderProduct.objects.create(order=order, product=self.course, quantity=1)
+        OrderProduct.objects.create(order=order, product=self.ebook, quantity=4)
+
+        cancelled = Order.objects.create(
+            customer=self.customer, status=Order.StatusChoice.CANCELLED
+        )
+        OrderProduct.objects.create(order=cancelled, product=self.course, quantity=5)
+
+    def test_price_is_snapshotted_at_checkout(self):
+        Product.objects.filter(pk=self.course.pk).update(price=Decimal("999"))
+
+        line = OrderProduct.objects.get(product=self.course, order__status="PE")
+
+        self.assertEqual(line.unit_price, Decimal("100"))
+        self.assertEqual(line.line_total, Decimal("100"))
+        self.assertEqual(line.seller, self.alice)
+        self.assertEqual(revenue.total_revenue(), Decimal("160"))
+
+    def test_aggregates_skip_cancelled_orders_and_product_table(self):
+        with self.assertNumQueries(1) as context:
+            sellers = revenue.top_sellers()
+
+        self.assertNotIn("digital_store_product", context.captured_queries[0]["sql"])
+        self.assertEqual(
+            [(row["seller_id"], row["revenue"], row["units"]) for row in sellers],
+            [(self.alice.pk, Decimal("100"), 1), (self.bob.pk, Decimal("60"), 4)],
+        )
+        self.assertEqual(
+            [row["product_id"] for row in revenue.top_products(limit=1)],
+            [self.course.pk],
+        )
+
+    def test_snapshot_line_prices_backfills_in_batches(self):
+        OrderProduct.objects.update(unit_price=0, seller=None)
+
+        snapshot_line_prices(OrderProduct.objects.all(), batch_size=1)
+
+        self.assertEqual(
+            sorted(OrderProduct.objects.values_list("unit_price", "seller_id")),
+            sorted(
+                [
+                    (Decimal("15"), self.bob.pk),
+                    (Decimal("100"), self.alice.pk),
+                    (Decimal("100"), self.alice.pk),
+                ]
+            ),
+        )
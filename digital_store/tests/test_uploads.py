@@ -0,0 +1,206 @@
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from digital_store.models import AssetUpload, Product
+from digital_store.services.downloads import downloadable_asset
+from digital_store.services.permissions import add_to_seller_group
+from digital_store.services.uploads import cleanup_stale_uploads
+from digital_store.storage import private_storage
+
+
+CONTENT = bytes(range(256)) * 4 + b"tail"
+
+
+class UploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(
+            PRIVATE_MEDIA_ROOT=self.media_root, ASSET_UPLOAD_CHUNK_SIZE=256
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        with self.captureOnCommitCallbacks(execute=True):
+            add_to_seller_group(self.seller.pk)
+        self.product = Product.objects.create(name="Album", price=10, seller=self.seller)
+        self.client.force_login(self.seller)
+
+    def start(self, size=len(CONTENT)):
+        response = self.client.post(
+            reverse("api-v1:upload-list"),
+            {"product": self.product.pk, "filename": "../album.zip", "size": size},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def put_chunk(self, upload_id, index, data=None):
+        if data is None:
+            data = CONTENT[index * 256:(index + 1) * 256]
+        return self.client.put(
+            reverse("api-v1:upload-chunk", args=[upload_id, index]),
+            data,
+            content_type="application/octet-stream",
+        )
+
+    def complete(self, upload_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("api-v1:upload-complete", args=[upload_id]))
+
+    def upload(self):
+        upload = self.start()
+        for index in range(upload["chunk_count"]):
+            self.put_chunk(upload["id"], index)
+        return upload
+
+    def test_chunks_in_any_order_complete_into_the_asset(self):
+        upload = self.start()
+        self.assertEqual(upload["chunk_count"], 5)
+        self.assertEqual(upload["missing_chunks"], [0, 1, 2, 3, 4])
+
+        for index in (4, 1, 3):
+            self.assertEqual(self.put_chunk(upload["id"], index).status_code, 201)
+
+        progress = self.client.get(reverse("api-v1:upload-detail", args=[upload["id"]])).json()
+        self.assertEqual(progress["missing_chunks"], [0, 2])
+        self.assertEqual(progress["received_bytes"], 256 * 2 + 4)
+
+        self.assertEqual(self.complete(upload["id"]).status_code, 409)
+
+        for index in (0, 2):
+            self.put_chunk(upload["id"], index)
+        response = self.complete(upload["id"])
+        self.assertEqual(response.status_code, 200)
+
+        self.product.refresh_from_db()
+        self.assertEqual(response.json()["asset"], self.product.asset.name)
+        self.assertTrue(self.product.asset.name.endswith("album.zip"))
+        with private_storage.open(self.product.asset.name) as file:
+            self.assertEqual(file.read(), CONTENT)
+        self.assertFalse(private_storage.exists(f"uploads/{upload['id']}.part"))
+        self.assertEqual(
+            downloadable_asset(self.product.pk, self.seller.pk), self.product.asset.name
+        )
+        self.assertEqual(self.complete(upload["id"]).status_code, 409)
+
+    def test_completion_never_replaces_a_file_that_took_the_name(self):
+        upload = self.upload()
+        taken = Product.asset.field.generate_filename(self.product, "album.zip")
+        private_storage.save(taken, ContentFile(b"another product's asset"))
+        get_available_name = private_storage.get_available_name
+        names = []
+
+        def racing_available_name(name, max_length=None):
+            # The first answer was free when checked and is taken by the
+            # time the file is put in place.
+            names.append(name)
+            return taken if len(names) == 1 else get_available_name(name, max_length)
+
+        with mock.patch.object(private_storage, "get_available_name", racing_available_name):
+            self.assertEqual(self.complete(upload["id"]).status_code, 200)
+
+        self.product.refresh_from_db()
+        self.assertNotEqual(self.product.asset.name, taken)
+        with private_storage.open(taken) as file:
+            self.assertEqual(file.read(), b"another product's asset")
+        with private_storage.open(self.product.asset.name) as file:
+            self.assertEqual(file.read(), CONTENT)
+        self.assertFalse(private_storage.exists(f"uploads/{upload['id']}.part"))
+
+    def test_resent_chunk_is_not_counted_twice(self):
+        upload = self.start()
+        self.assertEqual(self.put_chunk(upload["id"], 0).status_code, 201)
+
+        response = self.put_chunk(upload["id"], 0)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["received_bytes"], 256)
+
+    def test_chunk_must_have_its_exact_length(self):
+        upload = self.start()
+
+        self.assertEqual(self.put_chunk(upload["id"], 0, b"short").status_code, 400)
+        self.assertEqual(self.put_chunk(upload["id"], 4, CONTENT[:256]).status_code, 400)
+        self.assertEqual(self.put_chunk(upload["id"], 5, b"").status_code, 400)
+        self.assertEqual(AssetUpload.objects.get().received_bytes, 0)
+
+    def test_uploads_are_private_to_their_seller(self):
+        upload = self.start()
+        other = get_user_model().objects.create_user(username="other", role="SL")
+        with self.captureOnCommitCallbacks(execute=True):
+            add_to_seller_group(other.pk)
+        self.client.force_login(other)
+
+        self.assertEqual(self.put_chunk(upload["id"], 0).status_code, 404)
+        self.assertEqual(self.complete(upload["id"]).status_code, 404)
+        response = self.client.post(
+            reverse("api-v1:upload-list"),
+            {"product": self.product.pk, "filename": "album.zip", "size": 10},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_customers_cannot_upload(self):
+        self.client.force_login(get_user_model().objects.create_user(username="buyer"))
+        response = self.client.post(
+            reverse("api-v1:upload-list"),
+            {"product": self.product.pk, "filename": "album.zip", "size": 10},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_discard_and_stale_cleanup_remove_the_part_file(self):
+        discarded, stale, active = self.start(), self.start(), self.start()
+        for upload in (discarded, stale, active):
+            self.assertTrue(private_storage.exists(f"uploads/{upload['id']}.part"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                reverse("api-v1:upload-detail", args=[discarded["id"]])
+            )
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(private_storage.exists(f"uploads/{discarded['id']}.part"))
+
+        AssetUpload.objects.filter(pk=stale["id"]).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(cleanup_stale_uploads(timedelta(hours=24)), 1)
+
+        self.assertFalse(private_storage.exists(f"uploads/{stale['id']}.part"))
+        self.assertTrue(private_storage.exists(f"uploads/{active['id']}.part"))
+        self.assertEqual(
+            [str(pk) for pk in AssetUpload.objects.values_list("pk", flat=True)],
+            [active["id"]],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.delete()
+        self.assertFalse(AssetUpload.objects.exists())
+        self.assertFalse(private_storage.exists(f"uploads/{active['id']}.part"))
+
+    def test_stale_cleanup_sweeps_part_files_without_a_row(self):
+        kept = self.start()
+        orphan = private_storage.save(f"uploads/{uuid.uuid4()}.part", ContentFile(b"x"))
+        fresh = private_storage.save(f"uploads/{uuid.uuid4()}.part", ContentFile(b"x"))
+        two_days_ago = (timezone.now() - timedelta(days=2)).timestamp()
+        for name in (f"uploads/{kept['id']}.part", orphan):
+            os.utime(private_storage.path(name), (two_days_ago, two_days_ago))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(cleanup_stale_uploads(timedelta(hours=24)), 0)
+
+        self.assertFalse(private_storage.exists(orphan))
+        self.assertTrue(private_storage.exists(fresh))
+        self.assertTrue(private_storage.exists(f"uploads/{kept['id']}.part"))
@@ -1,13 +1,23 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from decimal import Decimal
 
-from digital_store.models import Category, Product, Order, Cart, CartProduct
+from digital_store.models import Category, Product, Order, OrderProduct, Cart, CartProduct
+from digital_store.services import autocomplete, store_stats
+from digital_store.services.cart import get_cart_summary
+from digital_store.services.facets import get_product_facets
+from digital_store.services.orders import refresh_order_totals
 
 
 class IndexViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_context_data(self):
         get_user_model().objects.create(username="user1", role="CU")
         get_user_model().objects.create(username="user2", role="SL")
@@ -19,6 +29,33 @@ class IndexViewTest(TestCase):
         self.assertEqual(response.context["seller_amount"], 1)
         self.assertEqual(response.context["product_amount"], 1)
 
+    def test_counters_follow_changes_without_aggregate_queries(self):
+        seller = get_user_model().objects.create(username="seller", role="SL")
+        product = Product.objects.create(name="Laptop", price=Decimal("95"), seller=seller)
+        self.client.get(reverse("digital_store:index"))
+        seller.role = "CS"
+        seller.save()
+        product.delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            get_user_model().objects.create(username="customer")
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("digital_store:index"))
+        with self.assertNumQueries(0):
+            self.client.get(reverse("digital_store:index"))
+
+        self.assertEqual(response.context["customer_amount"], 2)
+        self.assertEqual(response.context["seller_amount"], 0)
+        self.assertEqual(response.context["product_amount"], 0)
+
+    def test_reconcile_corrects_drift(self):
+        get_user_model().objects.bulk_create([get_user_model()(username="bulk", role="SL")])
+
+        drift = store_stats.reconcile()
+
+        self.assertEqual(drift, {"users": (0, 1), "sellers": (0, 1)})
+        self.assertEqual(store_stats.reconcile(), {})
+
 
 class CategoryViewsTests(TestCase):
     def setUp(self):
@@ -83,6 +120,278 @@ class ProductViewsTests(TestCase):
         self.assertContains(response, "product1")
         self.assertContains(response, "10")
 
+    def test_product_list_keyset_pagination(self):
+        for i in range(13):
+            Product.objects.create(name=f"bulk{i}", price=Decimal(i), seller=self.seller)
+        url = reverse("digital_store:product-list")
+
+        first_page = self.client.get(url, {"ordering": "price"})
+        page = first_page.context["page_obj"]
+        second_page = self.client.get(
+            url, {"ordering": "price", "cursor": page.next_cursor}
+        )
+        previous_page = self.client.get(
+            url,
+            {"ordering": "price", "cursor": second_page.context["page_obj"].previous_cursor},
+        )
+
+        self.assertEqual(len(page), 12)
+        self.assertFalse(page.has_previous())
+        self.assertEqual(
+            [product.name for product in second_page.context["product_list"]],
+            ["bulk11", "bulk12", "product2"],
+        )
+        self.assertFalse(second_page.context["page_obj"].has_next())
+        self.assertEqual(
+            list(previous_page.context["product_list"]),
+            list(first_page.context["product_list"]),
+        )
+
+    def test_product_card_cache_follows_category_changes(self):
+        cache.clear()
+        self.product1.category.add(self.category)
+        url = reverse("digital_store:product-list")
+        self.assertContains(self.client.get(url), "Test category")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = "Renamed category"
+            self.category.save()
+        self.assertContains(self.client.get(url), "Renamed category")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product1.category.clear()
+        detail = self.client.get(reverse("digital_store:product-detail", args=[self.product1.pk]))
+        self.assertContains(self.client.get(url), "No categories assigned", count=2)
+        self.assertContains(detail, "No categories assigned")
+
+    def test_product_list_invalid_cursor_falls_back_to_first_page(self):
+        response = self.client.get(
+            reverse("digital_store:product-list"), {"cursor": "garbage"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "product1")
+
+
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.product = Product.objects.create(name="Synth pack", price=Decimal("7"), seller=self.seller)
+        self.url = reverse("digital_store:product-detail", args=[self.product.pk])
+
+    def test_anonymous_hit_does_no_database_work(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertContains(response, "Synth pack")
+
+    def test_product_change_invalidates_cached_page(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.name = "Drum pack"
+            self.product.save()
+
+        self.assertContains(self.client.get(self.url), "Drum pack")
+
+    def test_cached_page_is_kept_until_the_change_commits(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.name = "Drum pack"
+            self.product.save()
+            # A request before the commit must not cache under a new stamp.
+            self.assertContains(self.client.get(self.url), "Synth pack")
+
+        self.assertContains(self.client.get(self.url), "Drum pack")
+
+    def test_query_string_order_is_normalized(self):
+        url = reverse("digital_store:product-list")
+        self.client.get(url, {"price_min": "1", "ordering": "price"})
+
+        with self.assertNumQueries(0):
+            self.client.get(f"{url}?ordering=price&price_min=1")
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.get(self.url)
+        self.client.force_login(self.seller)
+
+        response = self.client.get(self.url)
+
+        self.assertContains(response, "Add product to cart")
+
+    def test_pending_messages_cookie_bypasses_cache(self):
+        self.client.get(self.url)
+        self.client.cookies["messages"] = "pending"
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertTrue(queries.captured_queries)
+        self.assertContains(response, "Synth pack")
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.product = Product.objects.create(name="Synth pack", price=Decimal("7"), seller=self.seller)
+
+    def test_product_detail_revalidation_returns_not_modified(self):
+        url = reverse("digital_store:product-detail", args=[self.product.pk])
+        response = self.client.get(url)
+
+        with self.assertNumQueries(1):
+            revalidated = self.client.get(
+                url, {"utm_source": "cdn"}, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertTrue(response["Last-Modified"])
+
+    def test_list_validator_changes_with_catalog(self):
+        url = reverse("digital_store:product-list")
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.price = Decimal("8")
+            self.product.save()
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_unknown_product_is_still_not_found(self):
+        url = reverse("digital_store:product-detail", args=[self.product.pk + 100])
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class ProductSearchTests(TestCase):
+    def setUp(self):
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.guitar = Product.objects.create(
+            name="Guitar lessons",
+            description="Video course for beginners",
+            price=Decimal("10"),
+            seller=self.seller,
+        )
+        self.ebook = Product.objects.create(
+            name="Cooking ebook",
+            description="Recipes with guitar music playlists",
+            price=Decimal("5"),
+            seller=self.seller,
+        )
+
+    def search(self, query):
+        response = self.client.get(reverse("digital_store:product-list"), {"name": query})
+        return list(response.context["product_list"])
+
+    def test_search_matches_name_and_description_ranked(self):
+        self.assertEqual(self.search("guitar"), [self.guitar, self.ebook])
+
+    def test_search_matches_word_prefix(self):
+        self.assertEqual(self.search("cook"), [self.ebook])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        self.guitar.name = "Piano lessons"
+        self.guitar.save()
+        self.ebook.delete()
+
+        self.assertEqual(self.search("piano"), [self.guitar])
+        self.assertEqual(self.search("cooking"), [])
+
+
+class ProductFacetsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.music = Category.objects.create(name="Music", description="Tracks")
+        self.games = Category.objects.create(name="Games", description="Games")
+        for name, price, category in (
+            ("Album", "50", self.music),
+            ("Single", "150", self.music),
+            ("Shooter", "300", self.games),
+        ):
+            product = Product.objects.create(name=name, price=Decimal(price), seller=self.seller)
+            product.category.add(category)
+
+    def get_facets(self, **params):
+        response = self.client.get(reverse("digital_store:product-list"), params)
+        return response.context["facets"]
+
+    def test_category_counts_ignore_selected_category(self):
+        facets = self.get_facets(category=self.music.pk)
+
+        self.assertEqual(
+            [(item["name"], item["count"]) for item in facets["categories"]],
+            [("Games", 1), ("Music", 2)],
+        )
+        self.assertEqual(
+            [bucket["count"] for bucket in facets["price_histogram"]],
+            [1, 1, 0, 0, 0],
+        )
+
+    def test_facets_follow_price_filter(self):
+        facets = self.get_facets(price_min="100")
+
+        self.assertEqual(
+            [(item["name"], item["count"]) for item in facets["categories"]],
+            [("Games", 1), ("Music", 1)],
+        )
+
+    def test_facets_are_cached_until_catalog_changes(self):
+        get_product_facets(Product.objects.all(), params={})
+
+        with self.assertNumQueries(0):
+            get_product_facets(Product.objects.all(), params={})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(name="Extra", price=Decimal("10"), seller=self.seller)
+
+        with self.assertNumQueries(1):
+            facets = get_product_facets(Product.objects.all(), params={})
+        self.assertEqual(facets["price_histogram"][0]["count"], 2)
+
+
+@override_settings(AUTOCOMPLETE_BACKGROUND_BUILD=False)
+class AutocompleteViewTests(TestCase):
+    def setUp(self):
+        autocomplete.reset_index()
+        self.addCleanup(autocomplete.reset_index)
+        self.seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.category = Category.objects.create(name="Music", description="Tracks")
+        self.product = Product.objects.create(
+            name="Jazz music pack", price=Decimal("3"), seller=self.seller
+        )
+
+    def suggest(self, query):
+        response = self.client.get(reverse("digital_store:autocomplete"), {"q": query})
+        return [(item["type"], item["name"]) for item in response.json()["results"]]
+
+    def test_suggests_products_and_categories_by_word_prefix(self):
+        self.assertEqual(
+            self.suggest("mus"),
+            [("category", "Music"), ("product", "Jazz music pack")],
+        )
+
+    def test_index_is_refreshed_from_signals_without_queries(self):
+        self.suggest("jazz")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.name = "Blues pack"
+            self.product.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.delete()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest("blu"), [("product", "Blues pack")])
+            self.assertEqual(self.suggest("jazz"), [])
+            self.assertEqual(self.suggest("music"), [])
+
 
 class OrderViewsTest(TestCase):
     def setUp(self):
@@ -119,3 +428,75 @@ class OrderViewsTest(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Order")
+
+    def test_order_create_stores_totals(self):
+        self.client.post(reverse("digital_store:order-create"))
+
+        order = Order.objects.get(customer=self.user)
+        self.assertEqual(order.item_count, 2)
+        self.assertEqual(order.total, Decimal("900"))
+        self.assertFalse(self.cart.cart_items.exists())
+
+    def test_refresh_order_totals(self):
+        order = Order.objects.create(customer=self.user)
+        OrderProduct.objects.create(order=order, product=self.product1, quantity=3)
+        empty = Order.objects.create(customer=self.user, item_count=4, total=10)
+
+        refresh_order_totals(Order.objects.filter(customer=self.user))
+
+        order.refresh_from_db()
+        empty.refresh_from_db()
+        self.assertEqual((order.item_count, order.total), (1, Decimal("1500")))
+        self.assertEqual((empty.item_count, empty.total), (0, Decimal("0")))
+
+    def test_order_list_is_paginated_and_filtered(self):
+        Order.objects.bulk_create(
+            [Order(customer=self.user) for _ in range(25)]
+            + [Order(customer=self.user, status=Order.StatusChoice.COMPLETED)]
+        )
+        url = reverse("digital_store:order-list")
+
+        response = self.client.get(url)
+        self.assertEqual(len(response.context["order_list"]), 20)
+        next_page = self.client.get(url, {"cursor": response.context["page_obj"].next_cursor})
+        self.assertEqual(len(next_page.context["order_list"]), 6)
+
+        completed = self.client.get(url, {"status": Order.StatusChoice.COMPLETED})
+        self.assertEqual(len(completed.context["order_list"]), 1)
+
+
+class CartSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="customer")
+        seller = get_user_model().objects.create_user(username="seller", role="SL")
+        self.product = Product.objects.create(name="Track", price=Decimal("2.50"), seller=seller)
+        other = Product.objects.create(name="Album", price=Decimal("10"), seller=seller)
+        self.cart = Cart.objects.create(customer=self.user)
+        CartProduct.objects.create(cart=self.cart, product=self.product, quantity=2)
+        CartProduct.objects.create(cart=self.cart, product=other, quantity=1)
+        self.client.force_login(self.user)
+
+    def test_summary_is_one_aggregate_then_cached(self):
+        with self.assertNumQueries(1):
+            summary = get_cart_summary(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cart_summary(self.user.pk), summary)
+
+        self.assertEqual(summary, {"item_count": 3, "total": Decimal("15.00")})
+
+    def test_badge_follows_cart_changes(self):
+        response = self.client.get(reverse("digital_store:cart-list"))
+        self.assertContains(response, '<span class="badge bg-primary" id="cart-badge">3</span>')
+        self.assertEqual(response.context["total_price"], Decimal("15.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("digital_store:cart-add", args=[self.product.pk]),
+                {"action": "increase"},
+            )
+        self.assertEqual(get_cart_summary(self.user.pk)["item_count"], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("digital_store:order-create"))
+        self.assertEqual(get_cart_summary(self.user.pk)["item_count"], 0)
@@ -7,14 +7,19 @@ from digital_store.views import (
     CategoryUpdateView,
     CategoryDeleteView,
     ProductListView,
+    AutocompleteView,
     ProductDetailView,
     ProductCreateView,
     ProductUpdateView,
     ProductDeleteView,
+    CatalogExportView,
     CartView,
     CartAddView,
+    CartBatchView,
     OrderListView,
     OrderCreateView,
+    ProductDownloadView,
+    AssetDownloadView,
 )
 
 
@@ -39,6 +44,7 @@ urlpatterns = [
         name="category-delete"
     ),
     path("products/", ProductListView.as_view(), name="product-list"),
+    path("autocomplete/", AutocompleteView.as_view(), name="autocomplete"),
     path(
         "products/<int:pk>",
         ProductDetailView.as_view(),
@@ -59,6 +65,21 @@ urlpatterns = [
         ProductDeleteView.as_view(),
         name="product-delete"
     ),
+    path(
+        "products/export/",
+        CatalogExportView.as_view(),
+        name="catalog-export"
+    ),
+    path(
+        "products/<int:pk>/download/",
+        ProductDownloadView.as_view(),
+        name="product-download"
+    ),
+    path(
+        "downloads/<str:token>/",
+        AssetDownloadView.as_view(),
+        name="asset-download"
+    ),
     path("cart/", CartView.as_view(), name="cart-list"),
     path("cart/<int:pk>/add/", CartAddView.as_view(), name="cart-add"),
     path(
@@ -66,6 +87,7 @@ urlpatterns = [
         CartAddView.as_view(),
         name="cart-quantity-change"
     ),
+    path("cart/batch/", CartBatchView.as_view(), name="cart-batch"),
     path("orders/", OrderListView.as_view(), name="order-list"),
     path("orders/create/", OrderCreateView.as_view(), name="order-create"),
 ]
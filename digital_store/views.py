@@ -1,48 +1,84 @@
+import json
+import uuid
+
 from django.contrib.auth import get_user_model
-from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.http import HttpRequest
-from django.shortcuts import get_object_or_404, redirect
+from django.core import signing
+from django.core.exceptions import PermissionDenied
+from django.contrib.auth.mixins import (
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    UserPassesTestMixin,
+)
+from django.http import Http404, HttpRequest, JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect
 from django.views import generic
 from django.urls import reverse_lazy
 from django.contrib import messages
+from django.db import transaction
+from django.db.models import Prefetch
 from django_filters.views import FilterView
 
-from digital_store.filters import ProductFilter
+from digital_store.filters import OrderFilter, ProductFilter
 from digital_store.forms import ProductCreateForm, ProductCategorySearchForm
+from digital_store.mixins import (
+    AnonymousPageCacheMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+)
+from digital_store.services import autocomplete, cache_versions, store_stats
+from digital_store.services.cart import (
+    add_to_cart,
+    get_cart_summary,
+    reduce_in_cart,
+    remove_from_cart,
+    set_cart_quantities,
+    summarize_cart,
+)
+from digital_store.services.catalog_export import FORMATS, export_catalog
+from digital_store.services.checkout import checkout
+from digital_store.services.downloads import (
+    asset_filename,
+    downloadable_asset,
+    serve_asset,
+    sign_download,
+    unsign_download,
+)
+from digital_store.services.facets import get_product_facets
+from digital_store.services.permissions import SELLER_PERMISSIONS
+from digital_store.services.search import get_search_backend
 from digital_store.models import (
     Product,
     Category,
     Cart,
     Order,
-    CartProduct,
     OrderProduct
 )
 
 
 User = get_user_model()
-SELLER_PERMISSIONS = [
-    "category.can_add_category",
-    "category.can_edit_category",
-    "category.can_delete_category",
-    "product.can_add_product",
-    "product.can_edit_product",
-    "product.can_delete_product",
-]
 
 
-class IndexView(generic.TemplateView):
+class IndexView(AnonymousPageCacheMixin, generic.TemplateView):
+    query_budget = 6
     template_name = "digital_store/index.html"
+    page_cache_tags = (cache_versions.STORE_STATS,)
 
     def get_context_data(self, **kwargs):
         context = super(IndexView, self).get_context_data(**kwargs)
-        context["customer_amount"] = User.objects.count()
-        context["seller_amount"] = User.objects.filter(role="SL").count()
-        context["product_amount"] = Product.objects.count()
+        stats = store_stats.get_store_stats()
+        context["customer_amount"] = stats[store_stats.USERS]
+        context["seller_amount"] = stats[store_stats.SELLERS]
+        context["product_amount"] = stats[store_stats.PRODUCTS]
 
         return context
 
 
-class CategoryListView(generic.ListView):
+class CategoryListView(
+    AnonymousPageCacheMixin,
+    ConditionalGetMixin,
+    generic.ListView
+):
+    query_budget = 8
     model = Category
     paginate_by = 5
 
@@ -60,8 +96,8 @@ class CategoryListView(generic.ListView):
         form = ProductCategorySearchForm(self.request.GET)
 
         if form.is_valid():
-            return queryset.filter(
-                name__icontains=form.cleaned_data["name"]
+            return get_search_backend().search_categories(
+                queryset, form.cleaned_data["name"]
             )
 
         return queryset
@@ -72,6 +108,7 @@ class CategoryCreateView(
     PermissionRequiredMixin,
     generic.CreateView
 ):
+    query_budget = 6
     permission_required = SELLER_PERMISSIONS
     model = Category
     fields = ("name", "description",)
@@ -91,6 +128,7 @@ class CategoryUpdateView(
     PermissionRequiredMixin,
     generic.UpdateView
 ):
+    query_budget = 6
     permission_required = SELLER_PERMISSIONS
     model = Category
     fields = ("name", "description",)
@@ -110,6 +148,7 @@ class CategoryDeleteView(
     PermissionRequiredMixin,
     generic.DeleteView
 ):
+    query_budget = 12
     permission_required = SELLER_PERMISSIONS
     model = Category
     success_url = reverse_lazy("digital_store:category-list")
@@ -122,21 +161,55 @@ class CategoryDeleteView(
         return super().form_valid(form)
 
 
-class ProductListView(FilterView):
+class ProductListView(
+    AnonymousPageCacheMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    FilterView
+):
+    query_budget = 12
     model = Product
     paginate_by = 12
     filterset_class = ProductFilter
     template_name = "digital_store/product_list.html"
 
+    def get_default_ordering(self, queryset):
+        rank_field = get_search_backend().rank_field
+        if rank_field in queryset.query.annotations:
+            return (f"-{rank_field}",)
+
+        return self.default_ordering
+
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(ProductListView, self).get_context_data(**kwargs)
         name = self.request.GET.get("name")
         context["search_form"] = ProductCategorySearchForm(
             initial={"name": name}
         )
+        context["facets"] = self.get_facets()
+        context["category_version"] = cache_versions.get_version(
+            cache_versions.CATEGORY
+        )
 
         return context
 
+    def get_facets(self):
+        cleaned_data = getattr(self.filterset.form, "cleaned_data", {})
+        category = cleaned_data.get("category")
+        data = self.filterset.data.copy()
+        data.pop("category", None)
+
+        return get_product_facets(
+            ProductFilter(data, queryset=self.get_queryset()).qs,
+            params={
+                "name": self.request.GET.get("name", ""),
+                "price_min": cleaned_data.get("price_min"),
+                "price_max": cleaned_data.get("price_max"),
+                "category": category.pk if category else None,
+            },
+            selected_category=category.pk if category else None,
+        )
+
     def get_queryset(self):
         queryset = Product.objects.select_related(
             "seller"
@@ -144,22 +217,80 @@ class ProductListView(FilterView):
         form = ProductCategorySearchForm(self.request.GET)
 
         if form.is_valid():
-            return queryset.filter(
-                name__icontains=form.cleaned_data["name"]
+            return get_search_backend().search(
+                queryset, form.cleaned_data["name"]
             )
 
         return queryset
 
 
-class ProductDetailView(generic.DetailView):
+class AutocompleteView(generic.View):
+    query_budget = 2
+    max_limit = 10
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        query = request.GET.get("q", "")[:255]
+
+        try:
+            limit = min(int(request.GET.get("limit", self.max_limit)), self.max_limit)
+        except ValueError:
+            limit = self.max_limit
+
+        suggestions = autocomplete.suggest(query, limit=limit) if query else []
+
+        return JsonResponse(
+            {
+                "results": [
+                    {
+                        "type": suggestion.kind,
+                        "id": suggestion.pk,
+                        "name": suggestion.name,
+                    }
+                    for suggestion in suggestions
+                ]
+            }
+        )
+
+
+class ProductDetailView(
+    AnonymousPageCacheMixin,
+    ConditionalGetMixin,
+    generic.DetailView
+):
+    query_budget = 8
     model = Product
 
+    def get_validators(self, request):
+        updated_at = Product.objects.filter(
+            pk=self.kwargs["pk"]
+        ).values_list("updated_at", flat=True).first()
+
+        if updated_at is None:
+            return None, None
+
+        category_version = cache_versions.get_version(cache_versions.CATEGORY)
+        etag = f'W/"product-{self.kwargs["pk"]}-{updated_at.timestamp()}-{category_version}"'
+
+        return etag, updated_at
+
+    def get_queryset(self):
+        return Product.objects.select_related("seller")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["category_version"] = cache_versions.get_version(
+            cache_versions.CATEGORY
+        )
+
+        return context
+
 
 class ProductCreateView(
     LoginRequiredMixin,
     PermissionRequiredMixin,
     generic.CreateView
 ):
+    query_budget = 8
     permission_required = SELLER_PERMISSIONS
     model = Product
     form_class = ProductCreateForm
@@ -177,6 +308,7 @@ class ProductUpdateView(
     PermissionRequiredMixin,
     generic.UpdateView
 ):
+    query_budget = 8
     permission_required = SELLER_PERMISSIONS
     model = Product
     form_class = ProductCreateForm
@@ -194,12 +326,36 @@ class ProductDeleteView(
     PermissionRequiredMixin,
     generic.DeleteView
 ):
+    query_budget = 12
     permission_required = SELLER_PERMISSIONS
     model = Product
     success_url = reverse_lazy("digital_store:product-list")
 
 
+class CatalogExportView(LoginRequiredMixin, UserPassesTestMixin, generic.View):
+    query_budget = 6
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        export_format = request.GET.get("format", "csv")
+        if export_format not in FORMATS:
+            export_format = "csv"
+
+        response = StreamingHttpResponse(
+            export_catalog(export_format),
+            content_type=FORMATS[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="catalog.{export_format}"'
+        )
+
+        return response
+
+
 class CartView(LoginRequiredMixin, generic.TemplateView):
+    query_budget = 6
     template_name = "digital_store/cart_view.html"
 
     def get_context_data(self, **kwargs):
@@ -208,9 +364,8 @@ class CartView(LoginRequiredMixin, generic.TemplateView):
 
         cart_items = cart.cart_items.select_related("product")
 
-        context["total_price"] = sum(
-            item.product.price * item.quantity for item in cart_items
-        )
+        context["total_price"] = get_cart_summary(self.request.user.pk)["total"]
+        context["idempotency_key"] = uuid.uuid4().hex
 
         context["cart_items"] = cart_items
 
@@ -218,54 +373,125 @@ class CartView(LoginRequiredMixin, generic.TemplateView):
 
 
 class CartAddView(LoginRequiredMixin, generic.View):
-    def post(self, request: HttpRequest, pk: int, *args, **kwargs):
-        product = get_object_or_404(Product, id=pk)
-        cart, created = Cart.objects.get_or_create(customer=self.request.user)
-        cart_product, created = CartProduct.objects.get_or_create(
-            cart=cart,
-            product=product
-        )
+    query_budget = 6
 
+    def post(self, request: HttpRequest, pk: int, *args, **kwargs):
         action = self.request.POST.get("action")
-
-        if action == "increase":
-            cart_product.quantity += 1
-            cart_product.save()
-        elif action == "reduce":
-            if cart_product.quantity > 1:
-                cart_product.quantity -= 1
-                cart_product.save()
-            else:
-                cart_product.delete()
-        elif action == "delete":
-            cart_product.delete()
+        user_id = self.request.user.pk
+
+        # Each action is a single statement, so concurrent clicks on the
+        # same line cannot overwrite each other's quantity.
+        with transaction.atomic():
+            if action == "reduce":
+                reduce_in_cart(user_id, pk)
+            elif action == "delete":
+                remove_from_cart(user_id, pk)
+            elif not add_to_cart(user_id, pk, increment=action == "increase"):
+                raise Http404("No product found matching the query")
 
         return redirect("digital_store:cart-list")
 
 
-class OrderListView(LoginRequiredMixin, generic.ListView):
+class CartBatchView(LoginRequiredMixin, generic.View):
+    """
+    Set several cart quantities at once for AJAX clients. Expects
+    {"changes": [{"product": <id>, "quantity": <n>}, ...]}, where a zero
+    quantity removes the line, and answers with the new cart summary.
+    """
+
+    query_budget = 10
+    raise_exception = True
+    max_changes = 100
+
+    def post(self, request: HttpRequest, *args, **kwargs):
+        try:
+            changes = json.loads(request.body)["changes"]
+            quantities = {
+                int(change["product"]): int(change["quantity"])
+                for change in changes
+            }
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({"error": "Malformed changes"}, status=400)
+
+        if len(quantities) > self.max_changes:
+            return JsonResponse(
+                {"error": f"At most {self.max_changes} changes per request"},
+                status=400,
+            )
+
+        with transaction.atomic():
+            unknown = set_cart_quantities(request.user.pk, quantities)
+            summary = summarize_cart(request.user.pk)
+
+        return JsonResponse(
+            {
+                "item_count": summary["item_count"],
+                "total": f"{summary['total']:.2f}",
+                "unknown_products": unknown,
+            }
+        )
+
+
+class OrderListView(LoginRequiredMixin, KeysetPaginationMixin, FilterView):
+    query_budget = 6
     model = Order
+    paginate_by = 20
+    filterset_class = OrderFilter
+    template_name = "digital_store/order_list.html"
+    default_ordering = ("-order_date",)
 
     def get_queryset(self):
-        return Order.objects.filter(customer=self.request.user)
+        # Served by the (customer, -order_date, -id) index.
+        return Order.objects.filter(customer=self.request.user).prefetch_related(
+            Prefetch(
+                "order_items",
+                queryset=OrderProduct.objects.select_related("product"),
+            )
+        )
+
+
+class ProductDownloadView(LoginRequiredMixin, generic.View):
+    query_budget = 4
+
+    def get(self, request: HttpRequest, pk: int, *args, **kwargs):
+        name = downloadable_asset(pk, request.user.pk)
+        if name is None:
+            raise Http404("No file you can download")
+
+        return redirect(
+            "digital_store:asset-download", token=sign_download(pk, request.user.pk, name)
+        )
+
+
+class AssetDownloadView(generic.View):
+    """
+    Serves a file from a signed, expiring link without touching the
+    database, so download managers can resume it with Range requests
+    and no session.
+    """
+
+    query_budget = 2
+
+    def get(self, request: HttpRequest, token: str, *args, **kwargs):
+        try:
+            claims = unsign_download(token)
+        except signing.BadSignature:
+            raise PermissionDenied("The download link is invalid or has expired")
+
+        try:
+            return serve_asset(request, claims["f"], asset_filename(claims["f"]))
+        except FileNotFoundError:
+            raise Http404("The file is no longer available")
 
 
 class OrderCreateView(LoginRequiredMixin, generic.View):
+    query_budget = 11
+    idempotency_header = "HTTP_IDEMPOTENCY_KEY"
+
     def post(self, request: HttpRequest, *args, **kwargs):
-        cart = Cart.objects.get(customer=self.request.user)
-
-        if cart.cart_items.exists():
-            order = Order.objects.create(customer=self.request.user)
-            order_products = [
-                OrderProduct(
-                    product=item.product,
-                    quantity=item.quantity,
-                    order=order,
-                )
-                for item in cart.cart_items.all()
-            ]
-            OrderProduct.objects.bulk_create(order_products)
-
-        CartProduct.objects.filter(cart__customer=self.request.user).delete()
+        key = request.POST.get("idempotency_key") or request.META.get(
+            self.idempotency_header
+        )
+        checkout(request.user.pk, idempotency_key=(key or "")[:64] or None)
 
         return redirect("digital_store:order-list")